@@ -1,21 +1,115 @@
 """Main script, uses other modules to generate sentences."""
-from flask import Flask
+import os
+from flask import Flask, abort, jsonify, render_template, request
+
+from model_reloader import ModelReloader
+from model_registry import ModelRegistry
 
 
 app = Flask(__name__)
 
-# TODO: Initialize your histogram, hash table, or markov chain here.
-# Any code placed here will run only once, when the server starts.
+# Corpus to serve: a histogram snapshot saved by histogram_io or a text file.
+# Falls back to the sample text when no corpus has been added yet.
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+if "CORPUS_PATH" in os.environ:
+    CORPUS_PATHS = [os.environ["CORPUS_PATH"]]
+else:
+    CORPUS_PATHS = [os.path.join(DATA_DIR, name) for name in ("corpus.hist", "corpus.txt", "sample.txt")]
+
+# Any code placed here will run only once, when the server starts. Importing
+# this module only builds the model; serving entry points call start_reloader()
+# (or set CORPUS_RELOAD=1, for servers like gunicorn that import app directly).
+reloader = ModelReloader(CORPUS_PATHS, interval=float(os.environ.get("CORPUS_RELOAD_INTERVAL", 5)))
+
+
+def start_reloader():
+    """Rebuild the model in the background when the corpus file changes
+    (checked every CORPUS_RELOAD_INTERVAL seconds, 0 to disable) or on SIGHUP."""
+    if reloader.interval > 0:
+        reloader.start()
+    reloader.install_signal_handler()
+
+
+if os.environ.get("CORPUS_RELOAD") == "1":
+    start_reloader()
+
+# Further corpora served at /<name>, loaded on first request. Only the most
+# recently used models are kept while they fit in MODEL_MEMORY_MB megabytes,
+# counting the indexes and caches each builds on demand as well as its histogram.
+CORPORA_DIR = os.environ.get("CORPORA_DIR", os.path.join(DATA_DIR, "corpora"))
+MODEL_MEMORY_BUDGET = int(os.environ.get("MODEL_MEMORY_MB", 512)) * 1024 * 1024
+registry = ModelRegistry(CORPORA_DIR, MODEL_MEMORY_BUDGET)
+
+# Set PROFILE_DIR to profile requests sent with an "X-Profile: 1" header
+# (cProfile stats) or "X-Profile: collapsed" (stacks for flame graphs).
+# Leave unset in production, where clients could send the header.
+if os.environ.get("PROFILE_DIR"):
+    from profiling import ProfilerMiddleware
+    app.wsgi_app = ProfilerMiddleware(app.wsgi_app, os.environ["PROFILE_DIR"])
+
+# Largest number of completions one request may ask for
+MAX_COMPLETIONS = 50
 
 
 @app.route("/")
 def home():
     """Route that returns a web page containing the generated text."""
-    return "<p>TODO: Return a word here!</p>"
+    num_words = request.args.get("words", 10, type=int)
+    sentence = reloader.model.sentence(max(1, min(num_words, 100)))
+    return render_template("index.html", sentence=sentence)
+
+
+@app.route("/autocomplete")
+def autocomplete():
+    """Route that returns the most frequent words starting with a prefix as
+    JSON, like /autocomplete?prefix=th&k=5."""
+    prefix = request.args.get("prefix", "").lower()
+    k = max(1, min(request.args.get("k", 10, type=int), MAX_COMPLETIONS))
+    completions = reloader.model.complete(prefix, k)
+    return jsonify(prefix=prefix,
+                   completions=[{"word": word, "count": count} for word, count in completions])
+
+
+@app.route("/word")
+def word():
+    """Route that returns one word sampled by frequency as JSON, optionally
+    constrained like /word?first_letter=b&length=6."""
+    constraints = {}
+    if "first_letter" in request.args:
+        constraints["first_letter"] = request.args["first_letter"][:1].lower()
+    if "length" in request.args:
+        length = request.args.get("length", type=int)
+        if length is None:
+            return jsonify(error="length must be an integer", length=request.args["length"]), 400
+        constraints["length"] = length
+    try:
+        sampled = reloader.model.constrained.sample(**constraints)
+    except KeyError:
+        return jsonify(error="No words match", constraints=constraints), 404
+    return jsonify(word=sampled)
+
+
+@app.route("/status")
+def status():
+    """Route that returns the served model's source, size and reload history as JSON."""
+    return jsonify(**reloader.status(), corpora=registry.stats())
+
+
+@app.route("/<corpus>")
+def corpus_home(corpus):
+    """Route that returns a web page with text generated from the named corpus."""
+    try:
+        corpus_model = registry.get(corpus)
+    except (KeyError, ValueError):
+        abort(404)
+    num_words = request.args.get("words", 10, type=int)
+    sentence = corpus_model.sentence(max(1, min(num_words, 100)))
+    return render_template("index.html", sentence=sentence)
 
 
 if __name__ == "__main__":
     """To run the Flask server, execute `python app.py` in your terminal.
        To learn more about Flask's DEBUG mode, visit
        https://flask.palletsprojects.com/en/2.0.x/server/#in-code"""
+    start_reloader()
     app.run(debug=True)
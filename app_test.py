@@ -0,0 +1,34 @@
+#!python
+
+from app import app, reloader
+import os
+import unittest
+
+
+class AppTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app.test_client()
+
+    @unittest.skipIf(os.environ.get('CORPUS_RELOAD') == '1', 'reloading was asked for')
+    def test_import_does_not_start_reloader(self):
+        assert reloader.model is not None
+        assert reloader._thread is None
+
+    def test_word(self):
+        response = self.client.get('/word')
+        assert response.status_code == 200
+        assert response.get_json()['word']
+
+    def test_word_invalid_length(self):
+        response = self.client.get('/word?length=abc')
+        assert response.status_code == 400
+        assert response.get_json()['length'] == 'abc'
+
+    def test_word_no_match(self):
+        response = self.client.get('/word?length=999')
+        assert response.status_code == 404
+
+
+if __name__ == '__main__':
+    unittest.main()
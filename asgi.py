@@ -0,0 +1,192 @@
+"""ASGI serving mode for the Flask app.
+
+Serve with any ASGI server, for example `uvicorn asgi:app` or
+`python -m cli serve --asgi`. The event loop holds idle and keep-alive
+connections almost for free, while the same Flask routes and model run on a
+bounded pool of threads. The threads share one interpreter lock, so this
+does not make CPU-bound routes faster; what it gives is:
+
+- Concurrency for requests that wait on I/O, such as a corpus being loaded.
+- Back-pressure: at most ASGI_THREADS requests run at once, and at most
+  ASGI_MAX_PENDING more wait for a thread. Requests beyond that get 503
+  right away, so a burst cannot queue without limit.
+- Timeouts: a request that has not finished after ASGI_TIMEOUT seconds
+  gets 504.
+"""
+import os
+import sys
+import asyncio
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+
+from app import app as flask_app, start_reloader
+
+THREADS = int(os.environ.get("ASGI_THREADS", min(32, (os.cpu_count() or 1) + 4)))
+MAX_PENDING = int(os.environ.get("ASGI_MAX_PENDING", 64))
+TIMEOUT = float(os.environ.get("ASGI_TIMEOUT", 30))
+
+
+def build_environ(scope, body):
+    """
+    Build a WSGI environ dict for an ASGI HTTP request scope and its body.
+    """
+    server_name, server_port = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server_name,
+        "SERVER_PORT": str(server_port),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": (scope.get("client") or ("", 0))[0],
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin-1").upper().replace("-", "_")
+        value = value.decode("latin-1")
+        if name == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+            continue
+        if name == "CONTENT_LENGTH":
+            continue  # Already set from the body that was read
+        key = f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def call_wsgi(wsgi_app, environ):
+    """
+    Run a WSGI app to completion in the calling thread.
+    :return: Tuple of (status code, list of (name, value) byte header pairs, body bytes).
+    """
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response["status"] = int(status.split(" ", 1)[0])
+        response["headers"] = [(name.lower().encode("latin-1"), value.encode("latin-1"))
+                               for name, value in headers]
+
+    result = wsgi_app(environ, start_response)
+    try:
+        body = b"".join(result)
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+    return response["status"], response["headers"], body
+
+
+class AsgiApp(object):
+    """
+    ASGI application that runs a WSGI app on a bounded thread pool, with
+    back-pressure and a per-request timeout.
+    """
+
+    def __init__(self, wsgi_app, threads=THREADS, max_pending=MAX_PENDING, timeout=TIMEOUT, on_startup=None):
+        """
+        :param on_startup: Function called when the server sends the lifespan startup event, if any.
+        """
+        self.wsgi_app = wsgi_app
+        self.on_startup = on_startup
+        self.threads = threads
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.executor = None
+        self.in_flight = 0  # Requests running or waiting for a thread
+        self.rejected = 0  # Requests turned away with 503
+        self.timed_out = 0  # Requests answered with 504
+
+    def _start(self):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="asgi")
+
+    def _shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+        else:
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._start()
+                if self.on_startup is not None:
+                    self.on_startup()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self._shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope, receive, send):
+        if self.in_flight >= self.threads + self.max_pending:
+            # Shed load now, before reading the body, rather than queue without limit
+            self.rejected += 1
+            await self._send_error(send, 503, b"Server busy, try again shortly.", [(b"retry-after", b"1")])
+            return
+
+        # Hold a slot while the body arrives, so slow uploads count toward the limit
+        self.in_flight += 1
+        try:
+            body = []
+            more_body = True
+            while more_body:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    self.in_flight -= 1
+                    return
+                body.append(message.get("body", b""))
+                more_body = message.get("more_body", False)
+            self._start()
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, call_wsgi, self.wsgi_app,
+                                          build_environ(scope, b"".join(body)))
+        except BaseException:
+            self.in_flight -= 1
+            raise
+        # The thread cannot be interrupted, so its slot is only freed when it
+        # actually finishes, even if the client already got a 504
+        future.add_done_callback(self._finished)
+        try:
+            status, headers, content = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            await self._send_error(send, 504, b"Request timed out.")
+            return
+        except Exception as error:
+            print(f"Error handling {scope['path']}: {error!r}", file=sys.stderr)
+            await self._send_error(send, 500, b"Internal server error.")
+            return
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": content})
+
+    def _finished(self, future):
+        self.in_flight -= 1
+        if not future.cancelled():
+            future.exception()  # Mark any error as retrieved; it was already reported
+
+    @staticmethod
+    async def _send_error(send, status, message, headers=()):
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"text/plain; charset=utf-8"),
+                                (b"content-length", str(len(message)).encode("latin-1"))] + list(headers)})
+        await send({"type": "http.response.body", "body": message})
+
+
+# Same routes and model as WSGI serving, reloading the model once the server starts
+app = AsgiApp(flask_app, on_startup=start_reloader)
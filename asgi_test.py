@@ -0,0 +1,156 @@
+#!python
+
+from asgi import AsgiApp, build_environ
+from app import app as flask_app
+import asyncio
+import threading
+import unittest
+
+
+def request(asgi_app, path, query_string=b''):
+    """Send one GET request through an ASGI app and return (status, headers, body)."""
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': query_string,
+             'headers': [(b'host', b'localhost')], 'server': ('localhost', 8000)}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    async def run():
+        await asgi_app(scope, receive, send)
+
+    return scope, receive, send, messages, run
+
+
+def get(asgi_app, path, query_string=b''):
+    _, _, _, messages, run = request(asgi_app, path, query_string)
+    asyncio.run(run())
+    return messages[0]['status'], dict(messages[0]['headers']), messages[1]['body']
+
+
+def slow_app(release):
+    """WSGI app that waits until release is set before responding."""
+    def wsgi_app(environ, start_response):
+        release.wait(5)
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [b'done']
+    return wsgi_app
+
+
+class AsgiAppTest(unittest.TestCase):
+
+    def test_build_environ(self):
+        scope = {'type': 'http', 'method': 'GET', 'path': '/autocomplete', 'query_string': b'prefix=a',
+                 'headers': [(b'x-test', b'1'), (b'x-test', b'2'), (b'content-type', b'text/plain')]}
+        environ = build_environ(scope, b'')
+        assert environ['PATH_INFO'] == '/autocomplete'
+        assert environ['QUERY_STRING'] == 'prefix=a'
+        assert environ['HTTP_X_TEST'] == '1,2'
+        assert environ['CONTENT_TYPE'] == 'text/plain'
+
+    def test_serves_flask_routes(self):
+        asgi_app = AsgiApp(flask_app, threads=2)
+        status, headers, body = get(asgi_app, '/')
+        assert status == 200
+        assert b'<blockquote>' in body
+        status, headers, body = get(asgi_app, '/autocomplete', b'prefix=co')
+        assert status == 200
+        assert headers[b'content-type'] == b'application/json'
+        status, _, _ = get(asgi_app, '/missing')
+        assert status == 404
+
+    def test_lifespan(self):
+        started = []
+        asgi_app = AsgiApp(slow_app(threading.Event()), threads=1, on_startup=lambda: started.append(True))
+        events = iter([{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}])
+        sent = []
+
+        async def receive():
+            return next(events)
+
+        async def send(message):
+            sent.append(message['type'])
+
+        asyncio.run(asgi_app({'type': 'lifespan'}, receive, send))
+        assert started == [True]
+        assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+        assert asgi_app.executor is None
+
+    def test_timeout(self):
+        release = threading.Event()
+        asgi_app = AsgiApp(slow_app(release), threads=1, timeout=0.05)
+        status, _, _ = get(asgi_app, '/')
+        release.set()
+        assert status == 504
+        assert asgi_app.timed_out == 1
+
+    def test_back_pressure(self):
+        release = threading.Event()
+        asgi_app = AsgiApp(slow_app(release), threads=1, max_pending=1)
+        results = []
+
+        async def run_all():
+            runs = []
+            for _ in range(3):
+                _, _, _, messages, run = request(asgi_app, '/')
+                results.append(messages)
+                runs.append(asyncio.ensure_future(run()))
+            # Let every request start, then let the slow ones finish
+            await asyncio.sleep(0.05)
+            release.set()
+            await asyncio.gather(*runs)
+
+        asyncio.run(run_all())
+        statuses = sorted(messages[0]['status'] for messages in results)
+        # One running plus one waiting are accepted; the third is shed
+        assert statuses == [200, 200, 503]
+        assert asgi_app.rejected == 1
+        assert asgi_app.in_flight == 0
+
+
+    def test_rejects_before_reading_body(self):
+        release = threading.Event()
+        asgi_app = AsgiApp(slow_app(release), threads=1, max_pending=0)
+        received = []
+
+        async def run_both():
+            _, _, _, first, run_first = request(asgi_app, '/')
+            running = asyncio.ensure_future(run_first())
+            await asyncio.sleep(0.05)
+            scope, _, _, second, _ = request(asgi_app, '/')
+
+            async def receive():
+                received.append(True)
+                return {'type': 'http.request', 'body': b'x' * 1024, 'more_body': False}
+
+            async def send(message):
+                second.append(message)
+
+            await asgi_app(scope, receive, send)
+            release.set()
+            await running
+            return first, second
+
+        first, second = asyncio.run(run_both())
+        assert first[0]['status'] == 200
+        assert second[0]['status'] == 503
+        assert received == []  # Turned away without buffering its body
+        assert asgi_app.in_flight == 0
+
+    def test_disconnect_while_reading_body(self):
+        asgi_app = AsgiApp(slow_app(threading.Event()), threads=1, max_pending=0)
+        scope, _, send, messages, _ = request(asgi_app, '/')
+
+        async def receive():
+            return {'type': 'http.disconnect'}
+
+        asyncio.run(asgi_app(scope, receive, send))
+        assert messages == []
+        assert asgi_app.in_flight == 0
+
+
+if __name__ == '__main__':
+    unittest.main()
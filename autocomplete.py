@@ -0,0 +1,115 @@
+#!python
+
+from __future__ import division, print_function  # Python 2 and 3 compatibility
+import heapq
+from array import array
+from bisect import bisect_left
+
+# Sorts after every character that can appear in a word
+MAX_CHAR = '\U0010ffff'
+
+
+class AutocompleteIndex(object):
+    """AutocompleteIndex returns the most frequent words that start with a
+    given prefix.
+
+    Words are kept in sorted order, so all words with a prefix form one
+    contiguous range found by binary search. A segment tree over the counts
+    answers "which entry in this range is most frequent" in O(log n), so the
+    top k words of a range are found in O(k log n) however many thousands of
+    words share a short prefix."""
+
+    def __init__(self, histogram):
+        """Initialize this index from (word, count) entries in any order."""
+        entries = sorted(histogram)
+        self.words = [word for word, _ in entries]
+        self.counts = [count for _, count in entries]
+        # Segment tree of entry indexes: tree[1] is the index of the largest
+        # count overall, and the children of tree[i] are tree[2i], tree[2i+1]
+        self.size = 1
+        while self.size < len(self.words):
+            self.size *= 2
+        self.tree = array('l', [-1]) * (2 * self.size)
+        for i in range(len(self.words)):
+            self.tree[self.size + i] = i
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = self._better(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def __len__(self):
+        """Return the number of words in this index."""
+        return len(self.words)
+
+    def _better(self, i, j):
+        """Return whichever entry index has the larger count, preferring the
+        earlier word on ties; -1 stands for no entry."""
+        if i < 0:
+            return j
+        if j < 0:
+            return i
+        if self.counts[i] == self.counts[j]:
+            return min(i, j)
+        return j if self.counts[j] > self.counts[i] else i
+
+    def _range_max(self, lo, hi):
+        """Return the index of the most frequent entry in [lo, hi), or -1 if
+        the range is empty. Running time: O(log n)."""
+        best = -1
+        lo += self.size
+        hi += self.size
+        while lo < hi:
+            if lo & 1:
+                best = self._better(best, self.tree[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                best = self._better(best, self.tree[hi])
+            lo //= 2
+            hi //= 2
+        return best
+
+    def prefix_range(self, prefix):
+        """Return (lo, hi) such that words[lo:hi] are all the words starting
+        with given prefix. Running time: O(log n) by binary search."""
+        lo = bisect_left(self.words, prefix)
+        hi = bisect_left(self.words, prefix + MAX_CHAR, lo)
+        return lo, hi
+
+    def complete(self, prefix, k=10):
+        """Return a list of up to k (word, count) entries for the most frequent
+        words starting with given prefix, from most to least frequent.
+        Running time: O(log n + k log n) by repeatedly splitting the range
+        around its most frequent entry."""
+        lo, hi = self.prefix_range(prefix)
+        results = []
+        heap = []
+
+        def push(lo, hi):
+            best = self._range_max(lo, hi)
+            if best >= 0:
+                heapq.heappush(heap, (-self.counts[best], best, lo, hi))
+
+        push(lo, hi)
+        while heap and len(results) < k:
+            _, best, lo, hi = heapq.heappop(heap)
+            results.append((self.words[best], self.counts[best]))
+            push(lo, best)
+            push(best + 1, hi)
+        return results
+
+
+def main():
+    import sys
+    arguments = sys.argv[1:]  # Exclude script name in first argument
+    if len(arguments) < 2:
+        print('Usage: python autocomplete.py <file_path> <prefix> [k]')
+        sys.exit(1)
+    from word_frequency_analysis import list_based_histogram
+    with open(arguments[0], 'r', encoding='utf-8') as file:
+        index = AutocompleteIndex(list_based_histogram(file.read()))
+    k = int(arguments[2]) if len(arguments) > 2 else 10
+    for word, count in index.complete(arguments[1], k):
+        print('{}: {}'.format(word, count))
+
+
+if __name__ == '__main__':
+    main()
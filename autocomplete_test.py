@@ -0,0 +1,59 @@
+#!python
+
+from autocomplete import AutocompleteIndex
+import random
+import unittest
+
+
+class AutocompleteIndexTest(unittest.TestCase):
+
+    histogram = [('the', 50), ('then', 5), ('there', 20), ('they', 30), ('this', 10),
+                 ('fish', 4), ('fishing', 2), ('a', 40)]
+
+    def test_prefix_range(self):
+        index = AutocompleteIndex(self.histogram)
+        lo, hi = index.prefix_range('th')
+        assert index.words[lo:hi] == ['the', 'then', 'there', 'they', 'this']
+        lo, hi = index.prefix_range('zebra')
+        assert lo == hi
+
+    def test_complete(self):
+        index = AutocompleteIndex(self.histogram)
+        assert index.complete('th', 3) == [('the', 50), ('they', 30), ('there', 20)]
+        assert index.complete('fish') == [('fish', 4), ('fishing', 2)]
+        assert index.complete('x') == []
+        # Empty prefix matches every word
+        assert index.complete('', 2) == [('the', 50), ('a', 40)]
+
+    def test_ties_broken_by_word_order(self):
+        words = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
+        index = AutocompleteIndex([(word, 1) for word in words])
+        assert index._better(5, 2) == 2
+        assert index._better(2, 5) == 2
+        assert index._better(-1, 3) == 3
+        # Range [2, 7) combines a node from its right end before one from
+        # its left end, so the earlier word must still win the tie
+        assert index._range_max(2, 7) == 2
+        assert index._range_max(3, 8) == 3
+        assert index.complete('', 8) == [(word, 1) for word in words]
+
+    def test_empty_index(self):
+        index = AutocompleteIndex([])
+        assert len(index) == 0
+        assert index.complete('a') == []
+
+    def test_matches_sorting_every_match(self):
+        rng = random.Random(3)
+        letters = 'abc'
+        words = set(''.join(rng.choice(letters) for _ in range(rng.randint(1, 6)))
+                    for _ in range(500))
+        histogram = [(word, rng.randint(1, 1000)) for word in words]
+        index = AutocompleteIndex(histogram)
+        for prefix in ['', 'a', 'ab', 'cab', 'bbb']:
+            matches = sorted((entry for entry in histogram if entry[0].startswith(prefix)),
+                             key=lambda entry: (-entry[1], entry[0]))
+            assert index.complete(prefix, 7) == matches[:7]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""Single entry point for every tool in this project.
+
+Run `python -m cli <command> [arguments]`. Each command's module is only
+imported once that command is chosen, so short jobs never pay for importing
+heavy dependencies (Flask, BeautifulSoup) that they do not use.
+"""
+import os
+import sys
+import argparse
+import importlib
+
+# Map of command name to (module, function, description). Modules are
+# imported lazily by name when their command runs.
+COMMANDS = {
+    "histogram": ("word_frequency_analysis", "main", "Count word frequencies in a text file."),
+    "sample": ("stochastic_sampling", "main", "Sample words from a text file by frequency."),
+    "words": ("dictionary_words", "main", "Pick random words from the system dictionary."),
+    "rearrange": ("rearrange", "main", "Shuffle words or the lines of a file."),
+    "generate": ("generation", "main", "Generate many sentences in parallel."),
+    "footprint": ("footprint", "main", "Report memory used by each data structure."),
+    "serve": ("cli", "serve", "Run the web app."),
+    "loadtest": ("loadtest", "main", "Measure web app throughput and latency under load."),
+    "startup-check": ("cli", "startup_check", "Fail if cold startup exceeds a time budget."),
+}
+
+# Default budget for total import time of a cold start, in milliseconds
+STARTUP_BUDGET_MS = 100
+
+
+def serve(argv=None):
+    """Run the Flask app with its development server, or under an ASGI server."""
+    parser = argparse.ArgumentParser(prog="cli serve", description="Run the web app.")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to listen on.")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 5000)), help="Port to listen on.")
+    parser.add_argument("--debug", action="store_true", help="Enable Flask's debug mode.")
+    parser.add_argument("--asgi", action="store_true",
+                        help="Serve with uvicorn, running requests on a bounded thread pool (see asgi.py).")
+    args = parser.parse_args(argv)
+
+    if args.asgi:
+        try:
+            import uvicorn
+        except ImportError:
+            print("Error: ASGI serving needs uvicorn (pip install uvicorn).")
+            sys.exit(1)
+        uvicorn.run("asgi:app", host=args.host, port=args.port, log_level="debug" if args.debug else "info")
+        return
+
+    from app import app, start_reloader
+    start_reloader()
+    app.run(host=args.host, port=args.port, debug=args.debug)
+
+
+def measure_startup(argv):
+    """
+    Run this CLI with the given arguments in a fresh interpreter under -X importtime.
+    :param argv: Arguments to pass to the CLI, such as ["histogram", "--help"].
+    :return: Tuple of (total import time in milliseconds, set of imported module names).
+    """
+    import subprocess
+
+    command = [sys.executable, "-X", "importtime", "-m", "cli"] + list(argv)
+    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), universal_newlines=True)
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        # Lines look like "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header line
+        total_us += int(fields[0])
+        modules.add(fields[2].strip())
+    return total_us / 1000, modules
+
+
+def startup_check(argv=None):
+    """Measure cold startup of a CLI command and exit with an error if its
+    total import time is over budget."""
+    parser = argparse.ArgumentParser(prog="cli startup-check",
+                                     description="Fail if cold startup exceeds a time budget.")
+    parser.add_argument("--budget-ms", type=float,
+                        default=float(os.environ.get("STARTUP_BUDGET_MS", STARTUP_BUDGET_MS)),
+                        help="Maximum total import time in milliseconds.")
+    parser.add_argument("--runs", type=int, default=3, help="Number of runs; the fastest counts.")
+    parser.add_argument("command", nargs=argparse.REMAINDER,
+                        help="CLI arguments to measure (default: --help).")
+    args = parser.parse_args(argv)
+
+    command = args.command or ["--help"]
+    elapsed, modules = min((measure_startup(command) for _ in range(args.runs)), key=lambda run: run[0])
+    print(f"Startup of 'cli {' '.join(command)}': {elapsed:.1f} ms imports "
+          f"({len(modules)} modules), budget {args.budget_ms:.1f} ms")
+    if elapsed > args.budget_ms:
+        sys.exit(1)
+
+
+def print_usage():
+    print("Usage: python -m cli <command> [arguments]\n")
+    print("Commands:")
+    for name, (_, _, description) in COMMANDS.items():
+        print(f"  {name:<15}{description}")
+    print("\nRun 'python -m cli <command> --help' for a command's arguments.")
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv or argv[0] in ("-h", "--help"):
+        print_usage()
+        return
+    name = argv[0]
+    if name not in COMMANDS:
+        print(f"Error: Unknown command '{name}'.\n")
+        print_usage()
+        sys.exit(2)
+    module_name, function_name, _ = COMMANDS[name]
+    if module_name == "cli":
+        function = globals()[function_name]
+    else:
+        function = getattr(importlib.import_module(module_name), function_name)
+    return function(argv[1:])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+#!python
+
+from cli import STARTUP_BUDGET_MS, measure_startup
+import os
+import unittest
+
+# Modules that short CLI jobs should never import at startup
+HEAVY_MODULES = ('bs4', 'flask', 'werkzeug', 'jinja2')
+
+
+class StartupTest(unittest.TestCase):
+
+    budget_ms = float(os.environ.get('STARTUP_BUDGET_MS', STARTUP_BUDGET_MS))
+
+    def assert_fast_startup(self, argv):
+        # Fastest of a few runs, so one slow run on a busy machine is ignored
+        elapsed, modules = min((measure_startup(argv) for _ in range(3)), key=lambda run: run[0])
+        for module in HEAVY_MODULES:
+            assert module not in modules, '{} imported by {}'.format(module, argv)
+        assert elapsed <= self.budget_ms, '{} took {:.1f} ms'.format(argv, elapsed)
+
+    def test_help(self):
+        self.assert_fast_startup(['--help'])
+
+    def test_histogram(self):
+        self.assert_fast_startup(['histogram', '--help'])
+
+    def test_sample(self):
+        self.assert_fast_startup(['sample'])
+
+    def test_serve_help(self):
+        self.assert_fast_startup(['serve', '--help'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+#!python
+"""Complexity regression tests: time each operation at several input sizes
+and check how the time grows when the size doubles, so an accidental O(n^2)
+build or O(n) lookup fails a test instead of slipping through.
+
+Each measurement is the median of several runs, and each run repeats a
+lookup many times, so one slow run on a busy machine does not fail a test.
+Tests check the average (geometric mean) growth per doubling across every
+size, which is steadier than any single ratio: linear work should grow about
+2x per doubling and constant or logarithmic work about 1x, with cache effects
+on larger inputs adding a little to both.
+Set SKIP_COMPLEXITY_TESTS=1 to skip these on very noisy machines."""
+
+from dictogram import Dictogram
+from hashtable import HashTable
+from linkedlist import LinkedList
+from listogram import Listogram
+from skiplist import SkipList
+from word_frequency_analysis import tuple_frequency
+import gc
+import os
+import random
+import time
+import unittest
+
+SIZES = [2500, 5000, 10000, 20000, 40000]  # Each double the one before
+RUNS = 5  # Runs per size; the median is used
+LOOKUPS = 2000  # Lookups timed per run for per-operation measurements
+LINEAR_BOUND = 2.5  # Largest allowed growth per doubling for O(n) work (O(n^2) gives 4)
+CONSTANT_BOUND = 1.5  # Largest allowed growth per doubling for O(1) or O(log n) work (O(n) gives 2)
+
+
+def make_words(n, seed=0):
+    """Return a list of n words drawn from about n / 4 distinct types."""
+    rng = random.Random(seed)
+    return ['w{}'.format(rng.randrange(max(1, n // 4))) for _ in range(n)]
+
+
+def median_time(setup, operation):
+    """Return the median time in seconds of operation(setup()) over RUNS runs,
+    timing only the operation and with garbage collection paused."""
+    times = []
+    for _ in range(RUNS):
+        data = setup()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            operation(data)
+            times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    times.sort()
+    return times[len(times) // 2]
+
+
+def growth_ratios(setup, operation, sizes=SIZES):
+    """Return the ratio of median times between each size and the one before."""
+    times = [median_time(lambda: setup(n), operation) for n in sizes]
+    return [later / max(earlier, 1e-9) for earlier, later in zip(times, times[1:])]
+
+
+def lookups(lookup):
+    """Return an operation calling lookup(structure, key) for LOOKUPS keys."""
+    def operation(data):
+        structure, keys = data
+        for key in keys:
+            lookup(structure, key)
+    return operation
+
+
+def lookup_setup(build):
+    """Return a setup building a structure of size n with build(words), plus
+    LOOKUPS keys to look up in it."""
+    def setup(n):
+        words = make_words(n)
+        rng = random.Random(n)
+        return build(words), [rng.choice(words) for _ in range(LOOKUPS)]
+    return setup
+
+
+@unittest.skipIf(os.environ.get('SKIP_COMPLEXITY_TESTS'), 'SKIP_COMPLEXITY_TESTS is set')
+class ComplexityTest(unittest.TestCase):
+
+    def assertGrowth(self, ratios, bound):
+        product = 1.0
+        for ratio in ratios:
+            product *= ratio
+        average = product ** (1 / len(ratios))
+        assert average < bound, 'time grew {:.2f}x per doubling of n (bound {}): {}'.format(
+            average, bound, ', '.join('{:.2f}x'.format(ratio) for ratio in ratios))
+
+    def test_dictogram(self):
+        self.assertGrowth(growth_ratios(make_words, Dictogram), LINEAR_BOUND)
+        self.assertGrowth(growth_ratios(lookup_setup(Dictogram), lookups(Dictogram.frequency)),
+                          CONSTANT_BOUND)
+
+    def test_listogram(self):
+        def add_all(words):
+            histogram = Listogram()
+            for word in words:
+                histogram.add_count(word)
+            return histogram
+
+        self.assertGrowth(growth_ratios(make_words, Listogram), LINEAR_BOUND)
+        self.assertGrowth(growth_ratios(make_words, add_all), LINEAR_BOUND)
+        self.assertGrowth(growth_ratios(lookup_setup(add_all), lookups(Listogram.frequency)),
+                          CONSTANT_BOUND)
+
+    def test_hashtable(self):
+        def build(words):
+            table = HashTable()
+            for word in words:
+                table.set(word, 1)
+            return table
+
+        self.assertGrowth(growth_ratios(make_words, build), LINEAR_BOUND)
+        self.assertGrowth(growth_ratios(lookup_setup(build), lookups(HashTable.get)),
+                          CONSTANT_BOUND)
+
+    def test_linkedlist(self):
+        def prepend_all(words):
+            linked_list = LinkedList()
+            for word in words:
+                linked_list.prepend(word)
+
+        self.assertGrowth(growth_ratios(make_words, LinkedList), LINEAR_BOUND)
+        self.assertGrowth(growth_ratios(make_words, prepend_all), LINEAR_BOUND)
+
+    def test_tuple_frequency(self):
+        def build(words):
+            return sorted(Dictogram(words).items())
+
+        self.assertGrowth(growth_ratios(lookup_setup(build),
+                                        lookups(lambda histogram, word: tuple_frequency(word, histogram))),
+                          CONSTANT_BOUND)
+
+    def test_skiplist(self):
+        def build(words):
+            return SkipList(((word, 1) for word in words), rng=random.Random(0))
+
+        self.assertGrowth(growth_ratios(lookup_setup(build), lookups(SkipList.get)), CONSTANT_BOUND)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import threading
+from typing import Callable, Dict, Hashable, Iterable, Tuple
+
+from weighting import SamplingTable, WeightTransform, histogram_entries
+
+# Classifiers available on every sampler: each maps a word to its class
+DEFAULT_CLASSIFIERS = {
+    "first_letter": lambda word: word[:1],
+    "length": len,
+}
+
+
+class ConstrainedSampler(object):
+    """
+    Weighted sampling restricted to a class of words, like words starting with
+    "b" or words with 6 letters, as fast as unconstrained sampling.
+
+    For each classifier (or combination of classifiers) that is used, one pass
+    over the histogram builds a separate sampling table for every class. Those
+    tables are cached, so each constrained draw is a single O(log n) binary
+    search instead of rejecting draws until one fits, which takes longer the
+    rarer the class is.
+    """
+
+    def __init__(self, histogram, transforms: Iterable[WeightTransform] = ()):
+        """
+        :param histogram: Dictogram, or list of (word, count) tuples.
+        :param transforms: Weight transforms to apply to every table.
+        """
+        self.histogram = histogram
+        self.transforms = tuple(transforms)
+        self.classifiers: Dict[str, Callable[[str], Hashable]] = dict(DEFAULT_CLASSIFIERS)
+        # Map of classifier names to a map of class to its sampling table
+        self.tables: Dict[Tuple[str, ...], Dict[Hashable, SamplingTable]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, classifier: Callable[[str], Hashable]) -> None:
+        """
+        Add a classifier, a function mapping each word to a hashable class. A
+        predicate works too, giving classes True and False.
+        """
+        with self._lock:
+            self.classifiers[name] = classifier
+            # Forget tables built with a previous classifier of the same name
+            for names in [names for names in self.tables if name in names]:
+                del self.tables[names]
+
+    def _build(self, names: Tuple[str, ...]) -> Dict[Hashable, SamplingTable]:
+        """
+        Build the sampling tables for every class of the given classifiers in one pass.
+        """
+        classifiers = [self.classifiers[name] for name in names]
+        words: Dict[Hashable, list] = {}
+        cumulative: Dict[Hashable, list] = {}
+        for word, count in histogram_entries(self.histogram):
+            weight = count
+            for transform in self.transforms:
+                weight = transform(word, weight)
+            if weight <= 0:
+                continue
+            key = tuple(classifier(word) for classifier in classifiers)
+            if key not in words:
+                words[key] = []
+                cumulative[key] = []
+            class_totals = cumulative[key]
+            words[key].append(word)
+            class_totals.append((class_totals[-1] if class_totals else 0) + weight)
+        return {key: SamplingTable(words[key], cumulative[key]) for key in words}
+
+    def class_tables(self, *names: str) -> Dict[Hashable, SamplingTable]:
+        """
+        Return a map of each class (a tuple with one value per classifier) to its
+        sampling table, building the tables on first use.
+        """
+        names = tuple(sorted(names))
+        tables = self.tables.get(names)
+        if tables is None:
+            with self._lock:
+                for name in names:
+                    if name not in self.classifiers:
+                        raise KeyError(f"Unknown classifier: {name}")
+                tables = self.tables.get(names)
+                if tables is None:
+                    tables = self.tables[names] = self._build(names)
+        return tables
+
+    def table(self, **constraints: Hashable) -> SamplingTable:
+        """
+        Return the sampling table of words matching every constraint, given as
+        classifier name=class, like table(first_letter="b", length=6).
+        Raises KeyError if no word matches.
+        """
+        names = tuple(sorted(constraints))
+        key = tuple(constraints[name] for name in names)
+        table = self.class_tables(*names).get(key)
+        if table is None:
+            raise KeyError(f"No words match: {constraints}")
+        return table
+
+    def sample(self, rng=None, **constraints: Hashable) -> str:
+        """
+        Return a word matching every constraint, sampled in proportion to its weight.
+        :param rng: Optional random.Random instance to draw from instead of the global generator.
+        """
+        return self.table(**constraints).sample(rng)
@@ -0,0 +1,50 @@
+#!python
+
+from constrained_sampling import ConstrainedSampler
+from weighting import stopword_suppression
+import random
+import unittest
+
+
+class ConstrainedSamplerTest(unittest.TestCase):
+
+    histogram = [('banana', 5), ('berry', 1), ('bean', 2), ('apple', 10),
+                 ('cherry', 3), ('fig', 4), ('kiwi', 1)]
+
+    def test_first_letter(self):
+        sampler = ConstrainedSampler(self.histogram)
+        rng = random.Random(1)
+        samples = [sampler.sample(rng, first_letter='b') for _ in range(2000)]
+        assert set(samples) == {'banana', 'berry', 'bean'}
+        # Words should be drawn in proportion to count within the class
+        assert 1100 <= samples.count('banana') <= 1400
+
+    def test_length_and_combined(self):
+        sampler = ConstrainedSampler(self.histogram)
+        assert sampler.sample(length=3) == 'fig'
+        assert sampler.sample(first_letter='b', length=4) == 'bean'
+        with self.assertRaises(KeyError):
+            sampler.sample(first_letter='z')
+        with self.assertRaises(KeyError):
+            sampler.sample(rhymes_with='orange')
+
+    def test_tables_built_once(self):
+        sampler = ConstrainedSampler(self.histogram)
+        tables = sampler.class_tables('first_letter')
+        assert sampler.class_tables('first_letter') is tables
+        assert sorted(tables) == [('a',), ('b',), ('c',), ('f',), ('k',)]
+        assert tables[('b',)].total == 8
+
+    def test_registered_predicate(self):
+        sampler = ConstrainedSampler(self.histogram)
+        sampler.register('double_letter', lambda word: any(a == b for a, b in zip(word, word[1:])))
+        samples = {sampler.sample(double_letter=True) for _ in range(200)}
+        assert samples == {'berry', 'apple', 'cherry'}
+
+    def test_transforms(self):
+        sampler = ConstrainedSampler(self.histogram, [stopword_suppression(['banana', 'bean'])])
+        assert sampler.sample(first_letter='b') == 'berry'
+
+
+if __name__ == '__main__':
+    unittest.main()
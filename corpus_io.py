@@ -0,0 +1,92 @@
+"""Reading corpora that may be compressed.
+
+Corpora can be plain text or compressed with gzip, bzip2 or xz. The format
+is detected from the file's first bytes, not its name, and compressed files
+are decompressed as they are read, in large blocks, so a corpus never has to
+be decompressed to disk and memory use does not grow with file size.
+"""
+import io
+from typing import Iterator, Optional
+
+# Bytes read and decoded at a time
+BLOCK_SIZE = 1 << 20
+
+# Magic bytes at the start of each compressed format
+COMPRESSION_MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz",
+}
+
+# Characters a block may end at without splitting a word
+WHITESPACE = " \n\t\r\f\v"
+# Most blocks of text without whitespace kept together before cutting anyway
+MAX_TAIL_BLOCKS = 4
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """
+    Return the compression format of a file ("gzip", "bz2" or "xz") from its
+    first bytes, or None for a file that is not compressed.
+    """
+    with open(path, "rb") as file:
+        start = file.read(max(len(magic) for magic in COMPRESSION_MAGIC))
+    for magic, compression in COMPRESSION_MAGIC.items():
+        if start.startswith(magic):
+            return compression
+    return None
+
+
+def open_binary(path: str, block_size: int = BLOCK_SIZE) -> io.BufferedIOBase:
+    """
+    Open a file for reading its bytes, decompressing them if it is compressed.
+    """
+    compression = detect_compression(path)
+    # Decompression modules are imported only when needed, to keep startup fast
+    if compression == "gzip":
+        import gzip
+        stream = gzip.open(path, "rb")
+    elif compression == "bz2":
+        import bz2
+        stream = bz2.open(path, "rb")
+    elif compression == "xz":
+        import lzma
+        stream = lzma.open(path, "rb")
+    else:
+        return open(path, "rb", buffering=block_size)
+    return io.BufferedReader(stream, buffer_size=block_size)
+
+
+def open_text(path: str, encoding: str = "utf-8", errors: str = "strict",
+              block_size: int = BLOCK_SIZE) -> io.TextIOWrapper:
+    """
+    Open a plain or compressed text file for reading text, like open(path, "r").
+    """
+    return io.TextIOWrapper(open_binary(path, block_size), encoding=encoding, errors=errors)
+
+
+def iter_text_blocks(path: str, block_size: int = BLOCK_SIZE, encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Generate the text of a plain or compressed file in blocks of about
+    block_size characters, each ending at whitespace, so tokenizing each block
+    separately finds the same words as tokenizing the whole text. Text with no
+    whitespace for MAX_TAIL_BLOCKS blocks is cut anyway, splitting that run of
+    characters but keeping memory use bounded.
+    """
+    with open_text(path, encoding, block_size=block_size) as file:
+        tail = ""
+        while True:
+            block = file.read(block_size)
+            if not block:
+                break
+            block = tail + block
+            cut = max(block.rfind(character) for character in WHITESPACE)
+            if cut < 0:
+                if len(block) < MAX_TAIL_BLOCKS * block_size:
+                    tail = block  # No whitespace yet; keep reading until a word ends
+                    continue
+                cut = len(block) - 1
+            tail = block[cut + 1:]
+            yield block[:cut + 1]
+        if tail:
+            yield tail
@@ -0,0 +1,87 @@
+#!python
+
+from corpus_io import MAX_TAIL_BLOCKS, detect_compression, iter_text_blocks, open_text
+from dictionary_words import sample_words
+from stochastic_sampling import read_text_blocks
+from word_frequency_analysis import list_based_histogram, main, tokenize
+import bz2
+import gzip
+import lzma
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+OPENERS = {None: open, 'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}
+
+
+class CorpusIOTest(unittest.TestCase):
+
+    text = 'One fish, two fish.\nRed fish — blue fish!\n' * 50 + 'café naïve'
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, compression, text=None):
+        path = os.path.join(self.temp_dir, 'corpus-{}'.format(compression))
+        with OPENERS[compression](path, 'wb') as file:
+            file.write((self.text if text is None else text).encode('utf-8'))
+        return path
+
+    def test_detect_and_read(self):
+        for compression in OPENERS:
+            path = self.write(compression)
+            assert detect_compression(path) == compression
+            with open_text(path) as file:
+                assert file.read() == self.text
+
+    def test_blocks_end_at_whitespace(self):
+        path = self.write('gzip')
+        blocks = list(iter_text_blocks(path, block_size=16))
+        assert len(blocks) > 10
+        assert ''.join(blocks) == self.text
+        assert all(block[-1].isspace() for block in blocks[:-1])
+        words = [word for block in blocks for word in tokenize(block)]
+        assert words == tokenize(self.text)
+
+    def test_long_word_spans_blocks(self):
+        path = self.write('xz', 'a' * 100 + ' end')
+        assert list(iter_text_blocks(path, block_size=32)) == ['a' * 100 + ' ', 'end']
+
+    def test_text_without_whitespace_is_cut(self):
+        text = ''.join(chr(ord('a') + i % 26) for i in range(10000))
+        path = self.write('gzip', text)
+        blocks = list(iter_text_blocks(path, block_size=16))
+        assert ''.join(blocks) == text
+        assert len(blocks) > 100
+        assert max(len(block) for block in blocks) <= (MAX_TAIL_BLOCKS + 1) * 16
+
+    def test_word_frequency_main(self):
+        output = os.path.join(self.temp_dir, 'histogram.tsv')
+        for compression in OPENERS:
+            main([self.write(compression), '-f', 'tsv', '-o', output])
+            with open(output, encoding='utf-8') as file:
+                lines = file.read().splitlines()
+            expected = ['{}\t{}'.format(word, count) for word, count in list_based_histogram(self.text)]
+            assert sorted(lines) == sorted(expected)
+
+    def test_html_read_whole(self):
+        html = '<p class="intro">one fish</p>\n' * 10
+        path = self.write('bz2', html)
+        assert list(read_text_blocks(path)) == [html]
+        path = self.write('gzip')
+        assert ''.join(read_text_blocks(path)) == self.text
+
+    def test_sample_words(self):
+        path = self.write('gzip', '\n'.join('word{}'.format(i) for i in range(100)))
+        sample = sample_words(path, 5, random.Random(0))
+        assert len(sample) == 5
+        assert all(word.startswith('word') for word in sample)
+
+
+if __name__ == '__main__':
+    unittest.main()
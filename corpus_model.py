@@ -0,0 +1,130 @@
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+from histogram_io import is_histogram_file, load_histogram
+from lrucache import LRUCache
+from weighting import SamplingTableCache
+from word_frequency_analysis import list_based_histogram
+
+# Number of (prefix, k) autocomplete results each model keeps cached
+COMPLETION_CACHE_SIZE = 4096
+
+
+class CorpusModel(object):
+    """
+    Everything the web app serves for one corpus: a sampling table over its
+    word histogram and a lazily built autocomplete index.
+    """
+
+    def __init__(self, histogram: Iterable[Tuple[str, int]], source: Optional[str] = None):
+        """
+        :param histogram: Iterable of (word, count) tuples.
+        :param source: Path the histogram was built from, for display.
+        """
+        self.source = source
+        self.histogram = list(histogram)
+        self.tables = SamplingTableCache(self.histogram)
+        self.tokens = self.tables.table().total
+        self.types = len(self.histogram)
+        self._autocomplete = None
+        self._autocomplete_lock = threading.Lock()
+        self._constrained = None
+        self._constrained_lock = threading.Lock()
+        self.completions = LRUCache(COMPLETION_CACHE_SIZE)
+
+    @classmethod
+    def from_file(cls, path: str) -> "CorpusModel":
+        """
+        Build a model from a text file, or from a histogram snapshot saved by histogram_io.
+        """
+        if is_histogram_file(path):
+            return cls(load_histogram(path), path)
+        with open(path, "r", encoding="utf-8") as file:
+            return cls(list_based_histogram(file.read()), path)
+
+    def sample_word(self, rng=None, transforms: Tuple = ()) -> str:
+        """
+        Return a word sampled by frequency, adjusted by the given tuple of weight transforms, in O(log n) time.
+        """
+        return self.tables.table(*transforms).sample(rng)
+
+    def sentence(self, num_words: int = 10, rng=None, transforms: Tuple = ()) -> str:
+        """
+        Return a sentence of num_words words sampled by frequency, adjusted by the given tuple of weight transforms.
+        """
+        if not self.histogram:
+            return ""
+        table = self.tables.table(*transforms)
+        words = [table.sample(rng) for _ in range(num_words)]
+        return " ".join(words).capitalize() + "."
+
+    @property
+    def autocomplete(self):
+        """
+        Autocomplete index over this model's words, built on first use.
+        """
+        if self._autocomplete is None:
+            with self._autocomplete_lock:
+                if self._autocomplete is None:
+                    from autocomplete import AutocompleteIndex
+                    self._autocomplete = AutocompleteIndex(self.histogram)
+        return self._autocomplete
+
+    @property
+    def constrained(self):
+        """
+        Constrained sampler over this model's words, whose per-class tables are built on first use.
+        """
+        if self._constrained is None:
+            with self._constrained_lock:
+                if self._constrained is None:
+                    from constrained_sampling import ConstrainedSampler
+                    self._constrained = ConstrainedSampler(self.histogram)
+        return self._constrained
+
+    def revision(self) -> Tuple[int, bool, int, int]:
+        """
+        Return a value that changes whenever this model builds one of its lazy
+        structures, or its completion cache doubles in size, so whoever is
+        accounting for its memory knows to measure its footprint again.
+        """
+        constrained = self._constrained
+        return (len(self.tables.tables), self._autocomplete is not None,
+                len(constrained.tables) if constrained is not None else -1,
+                len(self.completions).bit_length())
+
+    def footprint(self) -> dict:
+        """
+        Return a dict of this model's deep size in bytes: the histogram list and
+        its tuples (container), words (keys), counts (values), and the sampling
+        tables, autocomplete index, constrained tables and cached completions
+        built so far (nodes), with their total.
+        """
+        from footprint import breakdown, deep_sizeof, shallow_sizeof
+        seen = set()
+        container = shallow_sizeof(self.histogram, seen)
+        container += sum(shallow_sizeof(entry, seen) for entry in self.histogram)
+        keys = sum(deep_sizeof(word, seen) for word, _ in self.histogram)
+        values = sum(deep_sizeof(count, seen) for _, count in self.histogram)
+        tables = list(self.tables.tables.values())
+        if self._constrained is not None:
+            tables += [table for class_tables in list(self._constrained.tables.values())
+                       for table in list(class_tables.values())]
+        nodes = sum(deep_sizeof(table.words, seen) + deep_sizeof(table.cumulative, seen) for table in tables)
+        if self._autocomplete is not None:
+            index = self._autocomplete
+            nodes += deep_sizeof(index.words, seen) + deep_sizeof(index.counts, seen) + deep_sizeof(index.tree, seen)
+        nodes += self.completions.footprint(seen)["total"]
+        return breakdown(container, keys, values, nodes)
+
+    def complete(self, prefix: str, k: int = 10) -> List[Tuple[str, int]]:
+        """
+        Return the k most frequent words starting with prefix, caching results per prefix.
+        """
+        key = (prefix, k)
+        try:
+            return self.completions.get(key)
+        except KeyError:
+            results = self.autocomplete.complete(prefix, k)
+            self.completions.put(key, results)
+            return results
@@ -1,37 +1,43 @@
 import sys
 import random
+from corpus_io import open_text
 
 # Path to the Unix dictionary file
 WORDS_FILE_PATH = "/usr/share/dict/words"
 
 
-def sample_words(file_path, num_words):
+def sample_words(file_path, num_words, rng=None):
     """
     Efficiently selects a sample of random words from the file without loading all words into memory.
+    The file may be plain text or compressed with gzip, bz2 or xz.
+    Draws from the given random.Random instance, if any, instead of the global generator.
     """
+    rng = rng or random
     sample = []
-    with open(file_path, "r", encoding="utf-8") as file:
+    with open_text(file_path) as file:
         for i, line in enumerate(file, start=1):
             word = line.strip()
             if len(sample) < num_words:
                 sample.append(word)
             else:
                 # Reservoir sampling: replace with decreasing probability
-                j = random.randint(0, i - 1)
+                j = rng.randint(0, i - 1)
                 if j < num_words:
                     sample[j] = word
     return sample
 
 
-def main():
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
     # Verify correct number of arguments
-    if len(sys.argv) != 2:
+    if len(argv) != 1:
         print("Usage: python3 dictionary_words.py <number_of_words>")
         sys.exit(1)
 
     # Parse the number of words
     try:
-        num_words = int(sys.argv[1])
+        num_words = int(argv[0])
         if num_words <= 0:
             raise ValueError
     except ValueError:
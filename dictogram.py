@@ -1,7 +1,11 @@
 #!python
 
 from __future__ import division, print_function  # Python 2 and 3 compatibility
+import heapq
 import random
+from operator import itemgetter
+from histogram_io import load_histogram, save_histogram
+from footprint import breakdown, deep_sizeof, shallow_sizeof
 
 
 class Dictogram(dict):
@@ -31,10 +35,12 @@ class Dictogram(dict):
         """Return frequency count of given word, or 0 if word is not found."""
         return self.get(word, 0)  # Use dict.get() for efficiency
 
-    def sample(self):
+    def sample(self, rng=None):
         """Return a word from this histogram, randomly sampled by weighting
-        each word's probability of being chosen by its observed frequency."""
-        dart = random.uniform(0, self.tokens)  # Random float in range [0, total tokens)
+        each word's probability of being chosen by its observed frequency.
+        Draws from the given random.Random instance, if any, instead of the
+        random module's shared global generator."""
+        dart = (rng or random).uniform(0, self.tokens)  # Random float in range [0, total tokens)
         cumulative = 0
 
         for word, count in self.items():
@@ -42,6 +48,40 @@ class Dictogram(dict):
             if dart < cumulative:
                 return word  # Return word where dart falls in cumulative sum
 
+    def most_common(self, k=None):
+        """Return a list of the k most frequent (word, count) entries, ordered
+        from most to least frequent, or all entries if k is None.
+        Running time: O(n log k) for n word types because a heap of at most
+        k entries is maintained while scanning, instead of sorting all n."""
+        if k is None:
+            return sorted(self.items(), key=itemgetter(1), reverse=True)
+        return heapq.nlargest(k, self.items(), key=itemgetter(1))
+
+    def footprint(self):
+        """Return a dict of this histogram's deep size in bytes, broken down
+        into the dict's own hash table (container), words (keys) and counts
+        (values), with their total."""
+        seen = set()
+        container = shallow_sizeof(self, seen)
+        keys = sum(deep_sizeof(word, seen) for word in self)
+        values = sum(deep_sizeof(count, seen) for count in self.values())
+        return breakdown(container, keys, values)
+
+    def save(self, path):
+        """Save this histogram's words and counts to a compact binary file."""
+        save_histogram(path, self.items())
+
+    @classmethod
+    def load(cls, path):
+        """Return a new histogram with the words and counts saved at the given
+        path, without re-reading or re-counting the original text."""
+        entries = load_histogram(path)
+        histogram = cls()
+        histogram.update(entries)
+        histogram.types = len(entries)
+        histogram.tokens = sum(count for _, count in entries)
+        return histogram
+
 
 def print_histogram(word_list):
     print()
@@ -83,6 +83,35 @@ class DictogramTest(unittest.TestCase):
             histogram.add_count(word)
         assert histogram.types == 5
 
+    def test_most_common(self):
+        histogram = Dictogram(self.fish_words)
+        # Most frequent entries should come first, limited to k entries
+        assert histogram.most_common(1) == [('fish', 4)]
+        top_three = histogram.most_common(3)
+        assert len(top_three) == 3
+        assert top_three[0] == ('fish', 4)
+        assert all(count == 1 for _, count in top_three[1:])
+        # Without k, all entries should be returned in order of frequency
+        all_entries = histogram.most_common()
+        assert len(all_entries) == 5
+        assert all_entries[0] == ('fish', 4)
+        self.assertCountEqual(all_entries, self.fish_list)
+        # Asking for more entries than exist should return all of them
+        assert len(histogram.most_common(10)) == 5
+
+    def test_footprint(self):
+        histogram = Dictogram(self.fish_words)
+        footprint = histogram.footprint()
+        # Every part should be measured and add up to the total
+        assert footprint['container'] > 0
+        assert footprint['keys'] > 0
+        assert footprint['values'] > 0
+        assert footprint['total'] == sum(footprint[part] for part in
+                                         ('container', 'keys', 'values', 'nodes'))
+        # More words should take more memory
+        histogram.add_count('food')
+        assert histogram.footprint()['keys'] > footprint['keys']
+
     def test_sample(self):
         histogram = Dictogram(self.fish_words)
         # Create a list of 10,000 word samples from histogram
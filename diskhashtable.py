@@ -0,0 +1,433 @@
+#!python
+"""Persistent hash table stored on disk, for tables larger than memory.
+
+An index file holds fixed-size pages, memory-mapped so reopening a table reads
+nothing up front and the operating system caches only the pages in use:
+
+    page 0:  magic b'DHTB' | version u8 | padding | page size u32
+             | number of buckets u32 | number of pages u32 | log generation u32
+             | number of entries u64 | bytes of dead records in the log u64
+    page 1 + b, for each bucket b, then overflow pages as buckets fill:
+             next overflow page u32 (0 for none) | number of slots used u16
+             | padding | slots of (64-bit stable hash of key, log offset u64)
+
+Keys and values live in an append-only log file next to the index, named
+path + '.log' for generation 0 and path + '.log.<generation>' after each
+compaction:
+
+    record:  key length u32 | data length u32 | stable key bytes
+             | data: pickle of (key, value)
+
+A lookup hashes the key, scans the slots of its bucket page (and overflow
+pages, if the bucket has more entries than fit in one page) for the hash,
+and reads the one log record it points to. Setting a key appends a new record
+and points its slot at it, so replaced and deleted records stay in the log
+as garbage until compact() rewrites the log with only live records.
+
+compact() writes the new log and a new copy of the index pointing into it,
+under the next generation, and syncs both before renaming the new index over
+the old one. That rename is the commit: a crash before it leaves the old
+index and its log untouched, and a crash after it leaves the new ones. Files
+left over from either side are removed the next time the table is opened.
+
+All integers are little-endian. Keys must be supported by stable_hash: str,
+bytes, numbers, None or tuples of those.
+"""
+
+import os
+import mmap
+import pickle
+import shutil
+import struct
+from array import array
+from hashtable import stable_hash, stable_key_bytes
+
+MAGIC = b'DHTB'
+VERSION = 1
+PAGE_SIZE = 4096
+HEADER = struct.Struct('<4sB3xIIIIQQ')
+PAGE_HEADER = struct.Struct('<IH2x')
+SLOT = struct.Struct('<QQ')
+RECORD_HEADER = struct.Struct('<II')
+
+
+class DiskHashTableError(ValueError):
+    """Raised when a file is not a valid disk hash table index."""
+
+
+class DiskHashTable(object):
+    """Hash table with the same get, set, contains and delete API as
+    HashTable, whose buckets are pages of a memory-mapped index file and
+    whose keys and values are in an append-only log file.
+
+    The number of buckets is fixed when the table is created; buckets that
+    outgrow one page chain to overflow pages. Choose num_buckets around the
+    expected number of entries divided by 200 so most buckets fit in one page."""
+
+    def __init__(self, path, num_buckets=1024, page_size=PAGE_SIZE):
+        """Open the table stored at path (index) and its log file, creating
+        it with num_buckets buckets of page_size bytes if it does not exist.
+        An existing table keeps the bucket count and page size it was created
+        with. Raises DiskHashTableError if path is not a table index or its
+        log file is missing."""
+        self.path = path
+        exists = os.path.exists(path)
+        self._index = open(path, 'r+b' if exists else 'w+b')
+        self._log = None
+        self.mmap = None
+        if not exists:
+            self._create(num_buckets, page_size)
+        elif os.path.getsize(path) < HEADER.size:
+            self.close()
+            raise DiskHashTableError('Not a disk hash table: {}'.format(path))
+        self.mmap = mmap.mmap(self._index.fileno(), 0)
+        (magic, version, self.page_size, self.num_buckets, self.num_pages, self.generation,
+         self.size, self.garbage) = HEADER.unpack_from(self.mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise DiskHashTableError('Not a disk hash table: {}'.format(path))
+        self.log_path = self._log_path(self.generation)
+        if not exists:
+            self._log = open(self.log_path, 'w+b')
+        elif os.path.exists(self.log_path):
+            self._log = open(self.log_path, 'r+b')
+            self._remove_leftovers()
+        else:
+            self.close()
+            raise DiskHashTableError('Log file missing: {}'.format(self.log_path))
+        self.slots_per_page = (self.page_size - PAGE_HEADER.size) // SLOT.size
+        self._log.seek(0, os.SEEK_END)
+        self.log_end = self._log.tell()
+
+    def _log_path(self, generation):
+        """Return the path of the log file of the given generation."""
+        if generation == 0:
+            return self.path + '.log'
+        return '{}.log.{}'.format(self.path, generation)
+
+    def _remove_leftovers(self):
+        """Remove the files of a compaction interrupted by a crash: the new
+        index and log if it had not committed, or the old log if it had."""
+        leftovers = [self.path + '.compact', self._log_path(self.generation + 1)]
+        if self.generation > 0:
+            leftovers.append(self._log_path(self.generation - 1))
+        for leftover in leftovers:
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+    def _create(self, num_buckets, page_size):
+        """Write the header and an empty page for each bucket to a new index."""
+        if num_buckets < 1:
+            raise ValueError('Number of buckets must be positive: {}'.format(num_buckets))
+        if page_size < HEADER.size or page_size < PAGE_HEADER.size + SLOT.size:
+            raise ValueError('Page size too small: {}'.format(page_size))
+        num_pages = 1 + num_buckets
+        header = HEADER.pack(MAGIC, VERSION, page_size, num_buckets, num_pages, 0, 0, 0)
+        self._index.write(header)
+        self._index.truncate(num_pages * page_size)  # New pages read as zeros: empty
+        self._index.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        """Return a string representation of this hash table."""
+        return 'DiskHashTable({!r}, {} entries)'.format(self.path, self.size)
+
+    def __len__(self):
+        return self.length()
+
+    def __iter__(self):
+        return self.keys()
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def __getitem__(self, key):
+        return self.get(key)
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        self.delete(key)
+
+    def _write_header(self, index=None, generation=None, garbage=None):
+        """Update the counts in the header page of this table's index, or of
+        the given memory-mapped index with the given generation and garbage."""
+        HEADER.pack_into(self.mmap if index is None else index, 0, MAGIC, VERSION, self.page_size,
+                         self.num_buckets, self.num_pages,
+                         self.generation if generation is None else generation, self.size,
+                         self.garbage if garbage is None else garbage)
+
+    def _page_offset(self, page):
+        return page * self.page_size
+
+    def _pages(self, key_hash):
+        """Generate (page offset, next page, slots used) for each page in the
+        chain of the bucket where a key with the given hash is stored."""
+        page = 1 + key_hash % self.num_buckets
+        while page:
+            offset = self._page_offset(page)
+            next_page, used = PAGE_HEADER.unpack_from(self.mmap, offset)
+            yield offset, next_page, used
+            page = next_page
+
+    def _read_record(self, log_offset):
+        """Return (stable key bytes, pickled data) of the log record at given offset."""
+        self._log.seek(log_offset)
+        key_length, data_length = RECORD_HEADER.unpack(self._log.read(RECORD_HEADER.size))
+        record = self._log.read(key_length + data_length)
+        return record[:key_length], record[key_length:]
+
+    def _append_record(self, key_bytes, data):
+        """Append a record to the log and return its offset."""
+        offset = self.log_end
+        self._log.seek(offset)
+        self._log.write(RECORD_HEADER.pack(len(key_bytes), len(data)) + key_bytes + data)
+        self.log_end = offset + RECORD_HEADER.size + len(key_bytes) + len(data)
+        return offset
+
+    @staticmethod
+    def _record_size(key_bytes, data):
+        return RECORD_HEADER.size + len(key_bytes) + len(data)
+
+    def _find_slot(self, key):
+        """Return (slot offset, log offset, pickled data) for the given key,
+        or None if the key is not found."""
+        key_bytes = stable_key_bytes(key)
+        key_hash = stable_hash(key)
+        for page_offset, _, used in self._pages(key_hash):
+            slot_offset = page_offset + PAGE_HEADER.size
+            for _ in range(used):
+                slot_hash, log_offset = SLOT.unpack_from(self.mmap, slot_offset)
+                if slot_hash == key_hash:
+                    record_key, data = self._read_record(log_offset)
+                    if record_key == key_bytes:
+                        return slot_offset, log_offset, data
+                slot_offset += SLOT.size
+        return None
+
+    def length(self):
+        """Return the number of key-value entries in this hash table.
+        Running time: O(1) because the count is kept in the header."""
+        return self.size
+
+    def contains(self, key):
+        """Return True if this hash table contains the given key, or False.
+        Running time: O(1) on average, reading the key's bucket page and one
+        log record."""
+        return self._find_slot(key) is not None
+
+    def get(self, key):
+        """Return the value associated with the given key, or raise KeyError.
+        Running time: O(1) on average, reading the key's bucket page and one
+        log record."""
+        found = self._find_slot(key)
+        if found is None:
+            raise KeyError('Key not found: {}'.format(key))
+        return pickle.loads(found[2])[1]
+
+    def set(self, key, value):
+        """Insert or update the given key with its associated value by
+        appending it to the log. Running time: O(1) on average."""
+        key_bytes = stable_key_bytes(key)
+        key_hash = stable_hash(key)
+        data = pickle.dumps((key, value), protocol=pickle.HIGHEST_PROTOCOL)
+        found = self._find_slot(key)
+        log_offset = self._append_record(key_bytes, data)
+        if found is not None:
+            # Point the existing slot at the new record; the old one is garbage
+            slot_offset, old_offset, old_data = found
+            SLOT.pack_into(self.mmap, slot_offset, key_hash, log_offset)
+            self.garbage += self._record_size(key_bytes, old_data)
+        else:
+            self._insert_slot(key_hash, log_offset)
+            self.size += 1
+        self._write_header()
+
+    def _insert_slot(self, key_hash, log_offset):
+        """Add a slot to the first page in the key's bucket chain with room,
+        chaining a new overflow page if every page is full."""
+        last_offset = None
+        for page_offset, _, used in self._pages(key_hash):
+            if used < self.slots_per_page:
+                SLOT.pack_into(self.mmap, page_offset + PAGE_HEADER.size + used * SLOT.size,
+                               key_hash, log_offset)
+                PAGE_HEADER.pack_into(self.mmap, page_offset,
+                                      PAGE_HEADER.unpack_from(self.mmap, page_offset)[0], used + 1)
+                return
+            last_offset = page_offset
+        new_page = self._allocate_page()
+        new_offset = self._page_offset(new_page)
+        SLOT.pack_into(self.mmap, new_offset + PAGE_HEADER.size, key_hash, log_offset)
+        PAGE_HEADER.pack_into(self.mmap, new_offset, 0, 1)
+        PAGE_HEADER.pack_into(self.mmap, last_offset, new_page, self.slots_per_page)
+
+    def _allocate_page(self):
+        """Return the number of a new empty page, growing the index file by
+        a quarter (at least 16 pages) when it is full."""
+        capacity = len(self.mmap) // self.page_size
+        if self.num_pages >= capacity:
+            self.mmap.flush()
+            self.mmap.close()
+            self._index.truncate((capacity + max(16, capacity // 4)) * self.page_size)
+            self.mmap = mmap.mmap(self._index.fileno(), 0)
+        page = self.num_pages
+        self.num_pages += 1
+        return page
+
+    def delete(self, key):
+        """Delete the given key from this hash table, or raise KeyError.
+        Its log record becomes garbage. Running time: O(1) on average."""
+        key_bytes = stable_key_bytes(key)
+        key_hash = stable_hash(key)
+        for page_offset, next_page, used in self._pages(key_hash):
+            slot_offset = page_offset + PAGE_HEADER.size
+            for _ in range(used):
+                slot_hash, log_offset = SLOT.unpack_from(self.mmap, slot_offset)
+                if slot_hash == key_hash:
+                    record_key, data = self._read_record(log_offset)
+                    if record_key == key_bytes:
+                        # Move the page's last slot into this one
+                        last_offset = page_offset + PAGE_HEADER.size + (used - 1) * SLOT.size
+                        self.mmap[slot_offset:slot_offset + SLOT.size] = \
+                            self.mmap[last_offset:last_offset + SLOT.size]
+                        PAGE_HEADER.pack_into(self.mmap, page_offset, next_page, used - 1)
+                        self.size -= 1
+                        self.garbage += self._record_size(record_key, data)
+                        self._write_header()
+                        return
+                slot_offset += SLOT.size
+        raise KeyError('Key not found: {}'.format(key))
+
+    def _slots(self):
+        """Generate (slot offset, log offset) for every entry, bucket by bucket."""
+        for bucket in range(self.num_buckets):
+            page = 1 + bucket
+            while page:
+                page_offset = self._page_offset(page)
+                page, used = PAGE_HEADER.unpack_from(self.mmap, page_offset)
+                for i in range(used):
+                    slot_offset = page_offset + PAGE_HEADER.size + i * SLOT.size
+                    yield slot_offset, SLOT.unpack_from(self.mmap, slot_offset)[1]
+
+    def items(self):
+        """Generate every (key, value) pair, reading one record at a time.
+        Running time: O(n + b) for n entries and b buckets."""
+        for _, log_offset in self._slots():
+            yield pickle.loads(self._read_record(log_offset)[1])
+
+    def keys(self):
+        """Generate every key in this hash table."""
+        for key, _ in self.items():
+            yield key
+
+    def values(self):
+        """Generate every value in this hash table."""
+        for _, value in self.items():
+            yield value
+
+    def compact(self):
+        """Rewrite the log with only the live records, reclaiming the space
+        of replaced and deleted values, and return the bytes reclaimed.
+        Safe against crashes: the table is either as it was before or fully
+        compacted (see the module docstring). Running time: O(n + b) for n
+        entries and b buckets, holding one 8-byte offset per entry in memory."""
+        self.flush()
+        generation = self.generation + 1
+        new_log_path = self._log_path(generation)
+        new_offsets = array('Q')
+        with open(new_log_path, 'wb') as new_log:
+            for _, log_offset in self._slots():
+                key_bytes, data = self._read_record(log_offset)
+                new_offsets.append(new_log.tell())
+                new_log.write(RECORD_HEADER.pack(len(key_bytes), len(data)) + key_bytes + data)
+            new_log.flush()
+            os.fsync(new_log.fileno())
+            new_end = new_log.tell()
+        # Copy the index, pointing every slot at its record's new offset
+        new_index_path = self.path + '.compact'
+        with open(new_index_path, 'w+b') as new_index:
+            self._index.seek(0)
+            shutil.copyfileobj(self._index, new_index)
+            new_index.flush()
+            with mmap.mmap(new_index.fileno(), 0) as new_map:
+                for (slot_offset, _), new_offset in zip(self._slots(), new_offsets):
+                    key_hash = SLOT.unpack_from(self.mmap, slot_offset)[0]
+                    SLOT.pack_into(new_map, slot_offset, key_hash, new_offset)
+                self._write_header(new_map, generation, 0)
+                new_map.flush()
+            os.fsync(new_index.fileno())
+        # Commit by renaming the new index into place, then switch to it
+        self.mmap.close()
+        self._index.close()
+        os.replace(new_index_path, self.path)
+        _fsync_directory(self.path)
+        self._index = open(self.path, 'r+b')
+        self.mmap = mmap.mmap(self._index.fileno(), 0)
+        old_log, old_log_path = self._log, self.log_path
+        self._log = open(new_log_path, 'r+b')
+        self.log_path = new_log_path
+        self.generation = generation
+        reclaimed = self.log_end - new_end
+        self.log_end = new_end
+        self.garbage = 0
+        old_log.close()
+        os.remove(old_log_path)
+        return reclaimed
+
+    def stats(self):
+        """Return a dict describing this table like HashTable.stats, plus the
+        number of overflow pages and the bytes of garbage in the log."""
+        chain_lengths = {}
+        for bucket in range(self.num_buckets):
+            chain = sum(used for _, _, used in self._pages(bucket))
+            chain_lengths[chain] = chain_lengths.get(chain, 0) + 1
+        return {
+            'size': self.size,
+            'buckets': self.num_buckets,
+            'load_factor': self.size / self.num_buckets,
+            'chain_lengths': dict(sorted(chain_lengths.items())),
+            'max_chain': max(chain_lengths),
+            'empty_ratio': chain_lengths.get(0, 0) / self.num_buckets,
+            'overflow_pages': self.num_pages - 1 - self.num_buckets,
+            'log_bytes': self.log_end,
+            'garbage_bytes': self.garbage,
+        }
+
+    def flush(self):
+        """Write every change so far to disk."""
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self.mmap.flush()
+
+    def close(self):
+        """Flush and close this table's files."""
+        if self._index.closed:
+            return
+        if self.mmap is not None and not self.mmap.closed:
+            if self._log is not None:
+                self.flush()
+            self.mmap.close()
+        self._index.close()
+        if self._log is not None:
+            self._log.close()
+
+
+def _fsync_directory(path):
+    """Make a rename of the file at path durable by syncing its directory,
+    where the operating system allows opening directories."""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,158 @@
+#!python
+
+from diskhashtable import DiskHashTable, DiskHashTableError
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+
+class DiskHashTableTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'table.dht')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_set_get_contains_delete(self):
+        with DiskHashTable(self.path, num_buckets=4) as ht:
+            ht.set('I', 1)
+            ht.set('V', 5)
+            ht.set(('of', 'the'), [10, 20])
+            assert ht.get('I') == 1
+            assert ht[('of', 'the')] == [10, 20]
+            assert ht.contains('V') is True
+            assert 'X' not in ht
+            assert len(ht) == 3
+            ht.set('V', 4)  # Update value
+            assert ht.get('V') == 4
+            assert len(ht) == 3
+            ht.delete('I')
+            assert 'I' not in ht
+            assert len(ht) == 2
+            with self.assertRaises(KeyError):
+                ht.get('I')
+            with self.assertRaises(KeyError):
+                ht.delete('I')
+            assert sorted(ht.keys(), key=str) == [('of', 'the'), 'V']
+
+    def test_reopen(self):
+        with DiskHashTable(self.path, num_buckets=8) as ht:
+            for i in range(100):
+                ht.set('word{}'.format(i), i)
+            ht.delete('word7')
+        with DiskHashTable(self.path, num_buckets=2) as ht:
+            assert ht.num_buckets == 8  # Kept from when it was created
+            assert len(ht) == 99
+            assert ht.get('word42') == 42
+            assert 'word7' not in ht
+            assert dict(ht.items()) == {'word{}'.format(i): i for i in range(100) if i != 7}
+
+    def test_overflow_pages(self):
+        # 128 byte pages hold 7 slots, so 1 bucket needs overflow pages
+        with DiskHashTable(self.path, num_buckets=1, page_size=128) as ht:
+            for i in range(50):
+                ht.set(i, i * i)
+            stats = ht.stats()
+            assert stats['overflow_pages'] == 7
+            assert stats['max_chain'] == 50
+            assert all(ht.get(i) == i * i for i in range(50))
+            for i in range(0, 50, 2):
+                ht.delete(i)
+            assert len(ht) == 25
+            assert all((i in ht) == (i % 2 == 1) for i in range(50))
+            ht.set(100, 'reuses a freed slot')
+            assert ht.stats()['overflow_pages'] == 7
+        with DiskHashTable(self.path) as ht:
+            assert sorted(ht.keys()) == list(range(1, 50, 2)) + [100]
+
+    def test_compact(self):
+        with DiskHashTable(self.path, num_buckets=4) as ht:
+            for i in range(20):
+                ht.set(i, 'first')
+            for i in range(20):
+                ht.set(i, 'second')
+            for i in range(10):
+                ht.delete(i)
+            before = ht.stats()
+            assert before['garbage_bytes'] > 0
+            reclaimed = ht.compact()
+            after = ht.stats()
+            assert reclaimed == before['garbage_bytes']
+            assert after['garbage_bytes'] == 0
+            assert after['log_bytes'] == before['log_bytes'] - reclaimed
+            assert all(ht.get(i) == 'second' for i in range(10, 20))
+            ht.set(0, 'after compact')
+        with DiskHashTable(self.path) as ht:
+            assert len(ht) == 11
+            assert ht.get(0) == 'after compact'
+            assert ht.get(15) == 'second'
+
+    def fill_with_garbage(self, ht):
+        for i in range(20):
+            ht.set(i, 'first')
+        for i in range(20):
+            ht.set(i, 'second')
+        for i in range(10):
+            ht.delete(i)
+
+    def test_compact_reopen(self):
+        with DiskHashTable(self.path, num_buckets=4) as ht:
+            self.fill_with_garbage(ht)
+            ht.compact()
+            ht.compact()  # Each compaction moves to a new log generation
+            assert ht.generation == 2
+        assert sorted(os.listdir(self.temp_dir)) == ['table.dht', 'table.dht.log.2']
+        with DiskHashTable(self.path) as ht:
+            assert dict(ht.items()) == {i: 'second' for i in range(10, 20)}
+            assert ht.stats()['garbage_bytes'] == 0
+
+    def test_crash_before_compact_commits(self):
+        with DiskHashTable(self.path, num_buckets=4) as ht:
+            self.fill_with_garbage(ht)
+            garbage = ht.stats()['garbage_bytes']
+            # Crash just before the new index is renamed into place
+            with mock.patch('os.replace', side_effect=OSError('crash')):
+                with self.assertRaises(OSError):
+                    ht.compact()
+        with DiskHashTable(self.path) as ht:
+            assert ht.generation == 0
+            assert dict(ht.items()) == {i: 'second' for i in range(10, 20)}
+            assert ht.stats()['garbage_bytes'] == garbage
+        # The new index and log that were never committed are removed
+        assert sorted(os.listdir(self.temp_dir)) == ['table.dht', 'table.dht.log']
+
+    def test_crash_after_compact_commits(self):
+        with DiskHashTable(self.path, num_buckets=4) as ht:
+            self.fill_with_garbage(ht)
+            # Crash just after the new index is renamed into place
+            with mock.patch('os.remove', side_effect=OSError('crash')):
+                with self.assertRaises(OSError):
+                    ht.compact()
+        with DiskHashTable(self.path) as ht:
+            assert ht.generation == 1
+            assert dict(ht.items()) == {i: 'second' for i in range(10, 20)}
+            assert ht.stats()['garbage_bytes'] == 0
+        # The old log is removed
+        assert sorted(os.listdir(self.temp_dir)) == ['table.dht', 'table.dht.log.1']
+
+    def test_missing_log(self):
+        with DiskHashTable(self.path) as ht:
+            ht.set('I', 1)
+        os.remove(self.path + '.log')
+        with self.assertRaises(DiskHashTableError):
+            DiskHashTable(self.path)
+        assert not os.path.exists(self.path + '.log')
+
+    def test_invalid_file(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'not a table' * 100)
+        with self.assertRaises(DiskHashTableError):
+            DiskHashTable(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+"""Memory footprint instrumentation for this project's data structures.
+
+Each data structure's footprint() method reports its deep size in bytes,
+split into the container itself, its keys, its values and per-node (or
+per-entry) overhead. Running this module builds each structure from a corpus
+under tracemalloc and reports peak and steady-state memory per token and per
+word type, for sizing production machines.
+"""
+import sys
+import argparse
+import tracemalloc
+
+# Parts every footprint() breakdown reports, in display order
+PARTS = ("container", "keys", "values", "nodes")
+
+
+def _slot_names(cls):
+    """Return the names of the slots declared by a class and all its bases."""
+    names = []
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        for slot in (slots,) if isinstance(slots, str) else slots:
+            if slot not in ("__dict__", "__weakref__"):
+                names.append(slot)
+    return names
+
+
+def deep_sizeof(obj, seen):
+    """
+    Return the size in bytes of an object and everything it references that is
+    not already in seen, adding each object counted to seen. Walks references
+    with an explicit stack, so long chains like linked list nodes do not hit
+    the recursion limit.
+    :param seen: Set of ids of objects already counted, shared across calls so
+        objects referenced from several places (like interned words) count once.
+    """
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        if hasattr(obj, "__dict__"):
+            stack.append(vars(obj))
+        for slot in _slot_names(type(obj)):
+            if hasattr(obj, slot):
+                stack.append(getattr(obj, slot))
+    return size
+
+
+def shallow_sizeof(obj, seen):
+    """
+    Return the size in bytes of an object and its attribute dict, but not of
+    the attributes' values, if not already in seen.
+    """
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(vars(obj))
+    return size
+
+
+def breakdown(container=0, keys=0, values=0, nodes=0):
+    """Return a footprint breakdown dict with its total."""
+    parts = {"container": container, "keys": keys, "values": values, "nodes": nodes}
+    parts["total"] = sum(parts.values())
+    return parts
+
+
+def format_bytes(size):
+    """Return a size in bytes as a short human-readable string."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+
+
+def _builders():
+    """Return a map of structure name to a function that builds it from a word list."""
+    from dictogram import Dictogram
+    from hashtable import HashTable
+    from linkedlist import LinkedList
+    from listogram import Listogram
+
+    def build_hashtable(words):
+        table = HashTable()
+        for word in words:
+            table.set(word, table.get(word) + 1 if table.contains(word) else 1)
+        return table
+
+    return {
+        "Dictogram": Dictogram,
+        "Listogram": Listogram,
+        "HashTable": build_hashtable,
+        "LinkedList": LinkedList,
+    }
+
+
+def measure(build, words):
+    """
+    Build a structure from words while tracing allocations.
+    :return: Tuple of (structure, peak bytes during build, bytes still held after build).
+    """
+    tracemalloc.start()
+    try:
+        structure = build(words)
+        steady, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return structure, peak, steady
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report memory used by each data structure built from a corpus.")
+    parser.add_argument("file", help="Path to the corpus text file.")
+    parser.add_argument("-s", "--structures", nargs="+", help="Structures to measure (default: all).")
+    parser.add_argument("-l", "--limit", type=int, help="Only use the first N tokens of the corpus.")
+    args = parser.parse_args(argv)
+
+    with open(args.file, "r", encoding="utf-8") as file:
+        words = file.read().lower().split()
+    if args.limit is not None:
+        words = words[:args.limit]
+    tokens = len(words)
+    types = len(set(words))
+    print(f"{tokens} tokens, {types} types")
+
+    builders = _builders()
+    for name in args.structures or builders:
+        structure, peak, steady = measure(builders[name], words)
+        parts = structure.footprint()
+        print(f"\n{name}:")
+        print(f"  peak while building: {format_bytes(peak)} "
+              f"({peak / max(tokens, 1):.1f} B/token, {peak / max(types, 1):.1f} B/type)")
+        print(f"  steady state:        {format_bytes(steady)} "
+              f"({steady / max(tokens, 1):.1f} B/token, {steady / max(types, 1):.1f} B/type)")
+        print("  footprint(): " + ", ".join(f"{part} {format_bytes(parts[part])}" for part in PARTS)
+              + f", total {format_bytes(parts['total'])}")
+
+
+if __name__ == "__main__":
+    main()
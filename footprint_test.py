@@ -0,0 +1,36 @@
+#!python
+
+from footprint import deep_sizeof, shallow_sizeof
+from linkedlist import DoublyNode, LinkedList, Node
+import sys
+import unittest
+
+
+class FootprintTest(unittest.TestCase):
+
+    def test_long_linked_list(self):
+        ll = LinkedList(range(10000, 20000))
+        # Deep sizing follows 10,000 next links without recursing on each one
+        size = deep_sizeof(ll, set())
+        assert size >= 10000 * (sys.getsizeof(ll.head) + sys.getsizeof(10000))
+
+    def test_inherited_slots(self):
+        payload = ['x' * 1000]
+        node = DoublyNode(payload)
+        node.next = Node('next')
+        size = deep_sizeof(node, set())
+        # Slots declared on Node (data, next) count as well as DoublyNode's prev
+        assert size >= sys.getsizeof(node) + deep_sizeof(payload, set()) + sys.getsizeof(node.next)
+
+    def test_seen_counts_objects_once(self):
+        word = 'shared' * 10
+        first, second = [word], [word]
+        seen = set()
+        size = deep_sizeof(first, seen)
+        assert deep_sizeof(second, seen) == size - sys.getsizeof(word)
+        assert deep_sizeof(word, seen) == 0
+        assert shallow_sizeof(word, seen) == 0
+
+
+if __name__ == '__main__':
+    unittest.main()
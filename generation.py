@@ -0,0 +1,97 @@
+import hashlib
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# Number of sentences generated from each derived random stream. Work is split
+# into chunks of this fixed size, never by worker count, so output only
+# depends on the master seed.
+CHUNK_SIZE = 256
+
+# Histogram shared by every chunk a worker process generates
+_worker_histogram = None
+
+
+def derive_seed(master_seed, stream_index):
+    """
+    Derive an independent seed for one random stream from a master seed.
+    :param master_seed: Seed for the whole run (any value with a stable str()).
+    :param stream_index: Index of the stream, such as the chunk number.
+    :return: 64-bit integer seed that is the same on every run and platform.
+    """
+    digest = hashlib.sha256(f"{master_seed}:{stream_index}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def generate_sentence(histogram, num_words, rng):
+    """
+    Generate a sentence of words sampled from a histogram.
+    :param histogram: Any histogram with a sample(rng) method, like Dictogram or Listogram.
+    :param rng: random.Random instance to draw every word from.
+    """
+    return " ".join(histogram.sample(rng) for _ in range(num_words))
+
+
+def _init_worker(histogram):
+    """Store the histogram once per worker process instead of once per chunk."""
+    global _worker_histogram
+    _worker_histogram = histogram
+
+
+def _chunk_sentences(histogram, master_seed, chunk_index, num_sentences, num_words):
+    """Generate one chunk of sentences from its own derived random stream."""
+    rng = random.Random(derive_seed(master_seed, chunk_index))
+    return [generate_sentence(histogram, num_words, rng) for _ in range(num_sentences)]
+
+
+def _generate_chunk(args):
+    """Generate one chunk of sentences in a worker process, from the histogram its initializer stored."""
+    return _chunk_sentences(_worker_histogram, *args)
+
+
+def generate_sentences(histogram, num_sentences, num_words, seed=None, workers=1, chunk_size=CHUNK_SIZE):
+    """
+    Generate many sentences in parallel across a pool of worker processes.
+    Each chunk of chunk_size sentences draws from its own random stream derived
+    from the master seed and the chunk number, so the same seed always gives
+    the same sentences in the same order, whatever the number of workers.
+    :param histogram: Picklable histogram with a sample(rng) method.
+    :param seed: Master seed; a random one is chosen if None.
+    :param workers: Number of worker processes; 1 generates in this process.
+    :return: List of num_sentences sentences.
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+    chunks = []
+    for chunk_index, start in enumerate(range(0, num_sentences, chunk_size)):
+        chunks.append((seed, chunk_index, min(chunk_size, num_sentences - start), num_words))
+
+    if workers == 1:
+        # Pass the histogram directly, so this process keeps no reference to it afterwards
+        return [sentence for chunk in chunks for sentence in _chunk_sentences(histogram, *chunk)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(histogram,)) as executor:
+        # map returns chunks in submission order, regardless of finish order
+        results = executor.map(_generate_chunk, chunks)
+        return [sentence for chunk in results for sentence in chunk]
+
+
+def main(argv=None):
+    from dictogram import Dictogram
+
+    parser = argparse.ArgumentParser(description="Generate many sentences from a text file in parallel.")
+    parser.add_argument("file", help="Path to the input text file.")
+    parser.add_argument("-n", "--sentences", type=int, default=10, help="Number of sentences.")
+    parser.add_argument("-w", "--words", type=int, default=8, help="Words per sentence.")
+    parser.add_argument("--seed", help="Master seed for reproducible output.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes.")
+    args = parser.parse_args(argv)
+
+    with open(args.file, "r", encoding="utf-8") as file:
+        histogram = Dictogram(file.read().lower().split())
+    for sentence in generate_sentences(histogram, args.sentences, args.words, args.seed, args.workers):
+        print(sentence)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,121 @@
 #!python
 
+import hashlib
+import threading
+from collections.abc import ItemsView, KeysView, ValuesView
+from contextlib import contextmanager
+from footprint import breakdown, deep_sizeof, shallow_sizeof
 from linkedlist import LinkedList
 
 
+def stable_key_bytes(key):
+    """Return bytes that identify the given key, the same in every process.
+    Equal numbers like 1, 1.0 and True give the same bytes, as they must for
+    equal keys to share a bucket."""
+    if isinstance(key, str):
+        return b's' + key.encode('utf-8', 'surrogatepass')
+    if isinstance(key, (bytes, bytearray)):
+        return b'b' + bytes(key)
+    if isinstance(key, float) and key.is_integer():
+        key = int(key)
+    if isinstance(key, int):
+        return b'i' + str(int(key)).encode('ascii')
+    if isinstance(key, float):
+        return b'f' + repr(key).encode('ascii')
+    if key is None:
+        return b'n'
+    if isinstance(key, tuple):
+        parts = [stable_key_bytes(item) for item in key]
+        return b't' + b''.join(len(part).to_bytes(4, 'little') + part for part in parts)
+    raise TypeError('Key type has no stable hash: {}'.format(type(key).__name__))
+
+
+def stable_hash(key):
+    """Return a 64-bit hash of the given key that, unlike hash() of strings,
+    is the same in every process, so bucket layout can be persisted and
+    reproduced. Works for str, bytes, int, float, None and tuples of those.
+    Running time: O(k) for a key of k bytes, slower than hash() by a
+    constant factor."""
+    digest = hashlib.blake2b(stable_key_bytes(key), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class _HashTableView(object):
+    """Mixin for live views over a hash table's entries, which iterate its
+    buckets lazily instead of building a list of every entry up front."""
+
+    def __init__(self, table):
+        """Initialize this view over the given hash table."""
+        self._mapping = table
+
+    def __len__(self):
+        """Return the number of entries in the hash table in O(1) time."""
+        return self._mapping.length()
+
+    def __eq__(self, other):
+        """Compare equal to a list or tuple holding the same entries in the
+        same (bucket) order, like the lists these views replace."""
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return super(_HashTableView, self).__eq__(other)
+
+    def __ne__(self, other):
+        """Return the opposite of __eq__."""
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __repr__(self):
+        """Return a string representation of this view."""
+        return '{}({!r})'.format(type(self).__name__, list(self))
+
+    def _entries(self):
+        """Generate each key-value entry by walking each bucket's nodes."""
+        for bucket in self._mapping.buckets:
+            for entry in bucket:
+                yield entry
+
+
+class HashTableKeysView(_HashTableView, KeysView):
+    """Live, set-like view of the keys in a hash table."""
+
+    def __iter__(self):
+        for key, _ in self._entries():
+            yield key
+
+
+class HashTableValuesView(_HashTableView, ValuesView):
+    """Live view of the values in a hash table."""
+
+    def __iter__(self):
+        for _, value in self._entries():
+            yield value
+
+    def __contains__(self, value):
+        return any(v is value or v == value for v in self)
+
+
+class HashTableItemsView(_HashTableView, ItemsView):
+    """Live, set-like view of the key-value pairs in a hash table."""
+
+    def __iter__(self):
+        return self._entries()
+
+
 class HashTable(object):
 
-    def __init__(self, init_size=8):
-        """Initialize this hash table with the given initial size."""
+    def __init__(self, init_size=8, max_load_factor=0.75, hash_function=hash):
+        """Initialize this hash table with the given initial size. The number
+        of buckets doubles whenever there are more than max_load_factor
+        entries per bucket, so average bucket length stays constant. Keys are
+        placed in buckets by hash_function, such as stable_hash for a layout
+        that is the same in every process."""
         # Create a new list (used as fixed-size array) of empty linked lists
         self.buckets = []
         for i in range(init_size):
             self.buckets.append(LinkedList())
+        self.size = 0  # Count of key-value entries, kept up to date by set and delete
+        self.max_load_factor = max_load_factor
+        self.hash_function = hash_function
 
     def __str__(self):
         """Return a formatted string representation of this hash table."""
@@ -21,75 +126,307 @@ class HashTable(object):
 
     def __repr__(self):
         """Return a string representation of this hash table."""
-        return 'HashTable({!r})'.format(self.items())
+        return 'HashTable({!r})'.format(list(self.items()))
+
+    def __len__(self):
+        """Return the number of key-value entries in this hash table."""
+        return self.length()
+
+    def __iter__(self):
+        """Iterate over the keys in this hash table lazily."""
+        return iter(self.keys())
+
+    def __contains__(self, key):
+        """Return True if this hash table contains the given key, or False."""
+        return self.contains(key)
+
+    def __getitem__(self, key):
+        """Return the value associated with the given key, or raise KeyError."""
+        return self.get(key)
+
+    def __setitem__(self, key, value):
+        """Insert or update the given key with its associated value."""
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        """Delete the given key from this hash table, or raise KeyError."""
+        self.delete(key)
 
     def _bucket_index(self, key):
         """Return the bucket index where the given key would be stored."""
         # Calculate the given key's hash code and transform into bucket index
-        return hash(key) % len(self.buckets)
+        return self.hash_function(key) % len(self.buckets)
 
-    def keys(self):
-        """Return a list of all keys in this hash table.
-        TODO: Running time: O(???) Why and under what conditions?"""
-        # Collect all keys in each bucket
-        all_keys = []
+    def _count_entries(self, key, delta):
+        """Adjust the count of entries after inserting or deleting given key."""
+        self.size += delta
+
+    def footprint(self):
+        """Return a dict of this hash table's deep size in bytes, broken down
+        into the table and its bucket array (container), keys, values, and
+        per-entry overhead of bucket lists, nodes and entry tuples (nodes),
+        with their total. Running time: O(n + b) for n entries, b buckets."""
+        seen = set()
+        container = shallow_sizeof(self, seen) + shallow_sizeof(self.buckets, seen)
+        keys = values = nodes = 0
         for bucket in self.buckets:
-            for key, value in bucket.items():
-                all_keys.append(key)
-        return all_keys
+            nodes += shallow_sizeof(bucket, seen)
+            node = bucket.head
+            while node is not None:
+                nodes += shallow_sizeof(node, seen) + shallow_sizeof(node.data, seen)
+                keys += deep_sizeof(node.data[0], seen)
+                values += deep_sizeof(node.data[1], seen)
+                node = node.next
+        return breakdown(container, keys, values, nodes)
+
+    def load_factor(self):
+        """Return the average number of entries per bucket."""
+        return self.length() / len(self.buckets)
+
+    def stats(self):
+        """Return a dict describing how evenly entries are spread across
+        buckets: number of entries and buckets, load factor, a histogram of
+        chain lengths (chain length to number of buckets), the longest chain
+        and the fraction of buckets that are empty. Running time: O(n + b)
+        for n entries and b buckets."""
+        chain_lengths = {}
+        for bucket in self.buckets:
+            chain = 0
+            node = bucket.head
+            while node is not None:
+                chain += 1
+                node = node.next
+            chain_lengths[chain] = chain_lengths.get(chain, 0) + 1
+        return {
+            'size': self.length(),
+            'buckets': len(self.buckets),
+            'load_factor': self.load_factor(),
+            'chain_lengths': dict(sorted(chain_lengths.items())),
+            'max_chain': max(chain_lengths),
+            'empty_ratio': chain_lengths.get(0, 0) / len(self.buckets),
+        }
+
+    def _resize_if_needed(self):
+        """Double the number of buckets if the load factor is too high."""
+        if self.max_load_factor is not None and self.load_factor() > self.max_load_factor:
+            self._resize(2 * len(self.buckets))
+
+    def _resize(self, new_size):
+        """Move every entry into a new list of new_size buckets.
+        Running time: O(n + b) for n entries and b buckets, but amortized
+        O(1) per set because the number of buckets doubles each time."""
+        old_buckets = self.buckets
+        self.buckets = [LinkedList() for _ in range(new_size)]
+        for bucket in old_buckets:
+            for key, value in bucket:
+                self.buckets[self._bucket_index(key)].append((key, value))
+
+    def keys(self):
+        """Return a live view of all keys in this hash table.
+        Running time: O(1) to create the view. Iterating it takes O(n + b)
+        for n entries and b buckets, but only as far as the caller goes."""
+        return HashTableKeysView(self)
 
     def values(self):
-        """Return a list of all values in this hash table.
-        TODO: Running time: O(???) Why and under what conditions?"""
-        # TODO: Loop through all buckets
-        # TODO: Collect all values in each bucket
+        """Return a live view of all values in this hash table.
+        Running time: O(1) to create the view. Iterating it takes O(n + b)
+        for n entries and b buckets, but only as far as the caller goes."""
+        return HashTableValuesView(self)
 
     def items(self):
-        """Return a list of all items (key-value pairs) in this hash table.
-        TODO: Running time: O(???) Why and under what conditions?"""
-        # Collect all pairs of key-value entries in each bucket
-        all_items = []
-        for bucket in self.buckets:
-            all_items.extend(bucket.items())
-        return all_items
+        """Return a live view of all items (key-value pairs) in this hash table.
+        Running time: O(1) to create the view. Iterating it takes O(n + b)
+        for n entries and b buckets, but only as far as the caller goes."""
+        return HashTableItemsView(self)
 
     def length(self):
-        """Return the number of key-value entries by traversing its buckets.
-        TODO: Running time: O(???) Why and under what conditions?"""
-        # TODO: Loop through all buckets
-        # TODO: Count number of key-value entries in each bucket
+        """Return the number of key-value entries in this hash table.
+        Running time: O(1) because set and delete keep a running count, so
+        no buckets need to be traversed."""
+        return self.size
+
+    def _find_entry(self, bucket, key):
+        """Return the key-value entry for the given key in the given bucket,
+        or None if the key is not found."""
+        return bucket.find(lambda entry: entry[0] == key)
 
     def contains(self, key):
         """Return True if this hash table contains the given key, or False.
-        TODO: Running time: O(???) Why and under what conditions?"""
-        # TODO: Find bucket where given key belongs
-        # TODO: Check if key-value entry exists in bucket
+        Running time: O(1) on average when entries are spread evenly across
+        buckets, O(n) in the worst case when all keys share one bucket."""
+        bucket = self.buckets[self._bucket_index(key)]
+        return self._find_entry(bucket, key) is not None
 
     def get(self, key):
         """Return the value associated with the given key, or raise KeyError.
-        TODO: Running time: O(???) Why and under what conditions?"""
-        # TODO: Find bucket where given key belongs
-        # TODO: Check if key-value entry exists in bucket
-        # TODO: If found, return value associated with given key
-        # TODO: Otherwise, raise error to tell user get failed
-        # Hint: raise KeyError('Key not found: {}'.format(key))
+        Running time: O(1) on average, O(n) in the worst case, because only
+        the entries in the key's bucket are checked."""
+        bucket = self.buckets[self._bucket_index(key)]
+        entry = self._find_entry(bucket, key)
+        if entry is None:
+            raise KeyError('Key not found: {}'.format(key))
+        return entry[1]
 
     def set(self, key, value):
         """Insert or update the given key with its associated value.
-        TODO: Running time: O(???) Why and under what conditions?"""
-        # TODO: Find bucket where given key belongs
-        # TODO: Check if key-value entry exists in bucket
-        # TODO: If found, update value associated with given key
-        # TODO: Otherwise, insert given key-value entry into bucket
+        Running time: O(1) on average, O(n) in the worst case, because only
+        the entries in the key's bucket are checked before inserting."""
+        bucket = self.buckets[self._bucket_index(key)]
+        entry = self._find_entry(bucket, key)
+        if entry is not None:
+            # Update value by replacing the existing entry in place
+            bucket.replace(entry, (key, value))
+        else:
+            bucket.append((key, value))
+            self._count_entries(key, 1)
+            self._resize_if_needed()
 
     def delete(self, key):
         """Delete the given key from this hash table, or raise KeyError.
-        TODO: Running time: O(???) Why and under what conditions?"""
-        # TODO: Find bucket where given key belongs
-        # TODO: Check if key-value entry exists in bucket
-        # TODO: If found, delete entry associated with given key
-        # TODO: Otherwise, raise error to tell user delete failed
-        # Hint: raise KeyError('Key not found: {}'.format(key))
+        Running time: O(1) on average, O(n) in the worst case, because only
+        the entries in the key's bucket are checked."""
+        bucket = self.buckets[self._bucket_index(key)]
+        entry = self._find_entry(bucket, key)
+        if entry is None:
+            raise KeyError('Key not found: {}'.format(key))
+        bucket.delete(entry)
+        self._count_entries(key, -1)
+
+
+class ConcurrentHashTable(HashTable):
+    """Thread-safe hash table that guards its buckets with striped locks.
+
+    Each lock covers every bucket whose index is congruent to it modulo the
+    number of stripes, so operations on keys in different stripes run in
+    parallel and reads never wait on a table-wide lock. Methods that look at
+    the whole table (keys, values, items, length) briefly hold every stripe
+    lock to return a consistent snapshot."""
+
+    def __init__(self, init_size=8, stripes=None, max_load_factor=0.75, hash_function=hash):
+        """Initialize this hash table with the given initial size and number
+        of lock stripes (defaults to one lock per bucket)."""
+        super(ConcurrentHashTable, self).__init__(init_size, max_load_factor, hash_function)
+        if stripes is None:
+            stripes = init_size
+        self.locks = [threading.Lock() for _ in range(max(1, min(stripes, init_size)))]
+        # Entry count per stripe, each only changed under its stripe's lock
+        self.stripe_sizes = [0] * len(self.locks)
+
+    def __repr__(self):
+        """Return a string representation of this hash table."""
+        return 'ConcurrentHashTable({!r})'.format(self.items())
+
+    def __iter__(self):
+        """Iterate over a snapshot of the keys in this hash table."""
+        return iter(self.keys())
+
+    def _stripe(self, key):
+        """Return the stripe number of the bucket where given key is stored."""
+        return self._bucket_index(key) % len(self.locks)
+
+    @contextmanager
+    def _stripe_lock(self, key):
+        """Hold the lock guarding the bucket where the given key is stored."""
+        while True:
+            num_buckets = len(self.buckets)
+            lock = self.locks[self._stripe(key)]
+            with lock:
+                # Retry if the table was resized while waiting for the lock,
+                # since the key may now belong to another stripe
+                if len(self.buckets) == num_buckets:
+                    yield
+                    return
+
+    def _resize_if_needed(self):
+        """Skip resizing while a stripe lock is held; callers grow the table
+        with _grow_if_needed after releasing it."""
+
+    def _grow_if_needed(self):
+        """Double the number of buckets while holding every stripe lock, if
+        the load factor is too high."""
+        if self.max_load_factor is None or self.load_factor() <= self.max_load_factor:
+            return
+        with self._all_locks():
+            super(ConcurrentHashTable, self)._resize_if_needed()
+
+    def _count_entries(self, key, delta):
+        """Adjust the count of entries in the stripe of given key, whose lock
+        is held by the caller."""
+        self.stripe_sizes[self._stripe(key)] += delta
+
+    @contextmanager
+    def _all_locks(self):
+        """Hold every stripe lock, always acquired in the same order."""
+        for lock in self.locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self.locks):
+                lock.release()
+
+    def keys(self):
+        """Return a snapshot list of all keys in this hash table."""
+        with self._all_locks():
+            return list(super(ConcurrentHashTable, self).keys())
+
+    def values(self):
+        """Return a snapshot list of all values in this hash table."""
+        with self._all_locks():
+            return list(super(ConcurrentHashTable, self).values())
+
+    def items(self):
+        """Return a snapshot list of all key-value pairs in this hash table."""
+        with self._all_locks():
+            return list(super(ConcurrentHashTable, self).items())
+
+    def stats(self):
+        """Return bucket distribution stats for a snapshot of this hash table."""
+        with self._all_locks():
+            return super(ConcurrentHashTable, self).stats()
+
+    def length(self):
+        """Return the number of key-value entries in this hash table.
+        Running time: O(s) for s stripes, without taking any locks."""
+        return sum(self.stripe_sizes)
+
+    def contains(self, key):
+        """Return True if this hash table contains the given key, or False."""
+        with self._stripe_lock(key):
+            return super(ConcurrentHashTable, self).contains(key)
+
+    def get(self, key):
+        """Return the value associated with the given key, or raise KeyError."""
+        with self._stripe_lock(key):
+            return super(ConcurrentHashTable, self).get(key)
+
+    def set(self, key, value):
+        """Insert or update the given key with its associated value."""
+        with self._stripe_lock(key):
+            super(ConcurrentHashTable, self).set(key, value)
+        self._grow_if_needed()
+
+    def delete(self, key):
+        """Delete the given key from this hash table, or raise KeyError."""
+        with self._stripe_lock(key):
+            super(ConcurrentHashTable, self).delete(key)
+
+    def update(self, key, function, default=None):
+        """Atomically set the given key to function(current value), using
+        default as the current value if the key is not found, and return the
+        new value. Use this instead of get then set to avoid lost updates."""
+        with self._stripe_lock(key):
+            bucket = self.buckets[self._bucket_index(key)]
+            entry = self._find_entry(bucket, key)
+            value = function(default if entry is None else entry[1])
+            if entry is not None:
+                bucket.replace(entry, (key, value))
+            else:
+                bucket.append((key, value))
+                self._count_entries(key, 1)
+        self._grow_if_needed()
+        return value
+
 
 def test_hash_table():
     ht = HashTable()
@@ -110,7 +447,7 @@ def test_hash_table():
     print('length: {}'.format(ht.length()))
 
     # Enable this after implementing delete method
-    delete_implemented = False
+    delete_implemented = True
     if delete_implemented:
         print('\nTesting delete:')
         for key in ['I', 'V', 'X']:
@@ -1,6 +1,10 @@
 #!python
 
-from hashtable import HashTable
+from hashtable import HashTable, ConcurrentHashTable, stable_hash
+import os
+import subprocess
+import sys
+import threading
 import unittest
 # Python 2 and 3 compatibility: unittest module renamed this assertion method
 if not hasattr(unittest.TestCase, 'assertCountEqual'):
@@ -103,6 +107,174 @@ class HashTableTest(unittest.TestCase):
         with self.assertRaises(KeyError):
             ht.delete('A')  # Key does not exist
 
+    def test_resize(self):
+        ht = HashTable(4)
+        for i in range(100):
+            ht.set(i, i * i)
+        # Buckets should grow to keep the load factor bounded
+        assert len(ht.buckets) > 4
+        assert ht.load_factor() <= ht.max_load_factor
+        assert ht.length() == 100
+        assert all(ht.get(i) == i * i for i in range(100))
+
+    def test_stable_hash(self):
+        keys = ['I', 'fish', '', b'bytes', 42, -7, 2.5, None, ('a', 1)]
+        hashes = [stable_hash(key) for key in keys]
+        assert len(set(hashes)) == len(keys)
+        assert all(0 <= h < 2 ** 64 for h in hashes)
+        # Equal keys must hash equally
+        assert stable_hash(1) == stable_hash(1.0) == stable_hash(True)
+        with self.assertRaises(TypeError):
+            stable_hash(['unhashable'])
+        # Hashes should not change between processes with different seeds
+        code = 'from hashtable import stable_hash; print(stable_hash("fish"), hash("fish"))'
+        outputs = []
+        for seed in ['1', '2']:
+            env = dict(os.environ, PYTHONHASHSEED=seed)
+            output = subprocess.check_output([sys.executable, '-c', code], env=env,
+                                             cwd=os.path.dirname(os.path.abspath(__file__)))
+            outputs.append(output.split())
+        assert outputs[0][0] == outputs[1][0] == str(stable_hash('fish')).encode()
+        assert outputs[0][1] != outputs[1][1]
+
+    def test_hash_function(self):
+        ht = HashTable(8, hash_function=stable_hash)
+        for i, word in enumerate(['one', 'fish', 'two', 'red', 'blue']):
+            ht.set(word, i)
+        assert ht.get('red') == 3
+        assert ht._bucket_index('red') == stable_hash('red') % len(ht.buckets)
+        # A constant hash puts every key in one chain, which stats reveal
+        ht = HashTable(8, max_load_factor=None, hash_function=lambda key: 0)
+        for i in range(10):
+            ht.set(i, i)
+        assert all(ht.get(i) == i for i in range(10))
+        stats = ht.stats()
+        assert stats['max_chain'] == 10
+        assert stats['chain_lengths'] == {0: 7, 10: 1}
+        assert stats['empty_ratio'] == 7 / 8
+
+    def test_stats(self):
+        ht = HashTable(4)
+        assert ht.stats() == {'size': 0, 'buckets': 4, 'load_factor': 0.0,
+                              'chain_lengths': {0: 4}, 'max_chain': 0, 'empty_ratio': 1.0}
+        for i in range(6):
+            ht.set(i, i)
+        stats = ht.stats()
+        assert stats['size'] == 6
+        assert stats['buckets'] == 8
+        assert stats['load_factor'] == 6 / 8
+        assert sum(stats['chain_lengths'].values()) == 8
+        assert sum(length * count for length, count in stats['chain_lengths'].items()) == 6
+
+    def test_footprint(self):
+        ht = HashTable()
+        empty = ht.footprint()
+        assert empty['keys'] == empty['values'] == 0
+        ht.set('I', 1)
+        ht.set('V', 5)
+        footprint = ht.footprint()
+        assert footprint['keys'] > 0
+        assert footprint['nodes'] > empty['nodes']
+        assert footprint['total'] == sum(footprint[part] for part in
+                                         ('container', 'keys', 'values', 'nodes'))
+
+    def test_views_are_live_and_lazy(self):
+        ht = HashTable()
+        keys, values, items = ht.keys(), ht.values(), ht.items()
+        assert len(keys) == 0
+        ht.set('I', 1)
+        ht.set('V', 5)
+        # Views should reflect entries set after they were created
+        assert len(keys) == 2 and len(values) == 2 and len(items) == 2
+        assert 'V' in keys and 'A' not in keys
+        assert 5 in values and 10 not in values
+        assert ('I', 1) in items and ('I', 5) not in items
+        self.assertCountEqual(keys, ['I', 'V'])
+        # Iterating should not require visiting every entry first
+        first_key = next(iter(keys))
+        assert first_key in ('I', 'V')
+        assert keys == set(['I', 'V'])
+
+    def test_dunder_methods(self):
+        ht = HashTable()
+        ht['I'] = 1
+        ht['V'] = 5
+        assert len(ht) == 2
+        assert ht['V'] == 5
+        assert 'I' in ht and 'X' not in ht
+        self.assertCountEqual(list(ht), ['I', 'V'])
+        del ht['I']
+        assert len(ht) == 1
+        with self.assertRaises(KeyError):
+            ht['I']
+        with self.assertRaises(KeyError):
+            del ht['I']
+        assert len(ht) == 1  # Failed delete should not change the count
+
+
+class ConcurrentHashTableTest(unittest.TestCase):
+
+    def test_set_get_and_delete(self):
+        ht = ConcurrentHashTable(4, stripes=2)
+        assert len(ht.locks) == 2
+        ht.set('I', 1)
+        ht.set('V', 5)
+        ht.set('X', 10)
+        assert ht.get('V') == 5
+        assert ht.contains('X') is True
+        assert ht.length() == 3
+        self.assertCountEqual(ht.items(), [('I', 1), ('V', 5), ('X', 10)])
+        ht.delete('V')
+        assert ht.contains('V') is False
+        with self.assertRaises(KeyError):
+            ht.get('V')
+
+    def test_hash_function_and_stats(self):
+        ht = ConcurrentHashTable(4, stripes=2, hash_function=stable_hash)
+        for i in range(20):
+            ht.set(str(i), i)
+        assert all(ht.get(str(i)) == i for i in range(20))
+        stats = ht.stats()
+        assert stats['size'] == 20
+        assert stats['buckets'] == len(ht.buckets)
+
+    def test_update_from_many_threads(self):
+        ht = ConcurrentHashTable(16)
+        words = ['one', 'fish', 'two', 'fish', 'red', 'fish', 'blue', 'fish']
+
+        def count_words():
+            for _ in range(200):
+                for word in words:
+                    ht.update(word, lambda count: count + 1, 0)
+
+        threads = [threading.Thread(target=count_words) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # No increments should be lost to races between threads
+        assert ht.get('fish') == 4 * 200 * 8
+        assert ht.get('one') == 200 * 8
+        assert ht.length() == 5
+
+    def test_snapshot_during_writes(self):
+        ht = ConcurrentHashTable(8)
+        done = threading.Event()
+
+        def write_keys():
+            for i in range(2000):
+                ht.set(i, i)
+            done.set()
+
+        writer = threading.Thread(target=write_keys)
+        writer.start()
+        while not done.is_set():
+            # Every snapshot should be internally consistent
+            for key, value in ht.items():
+                assert key == value
+        writer.join()
+        assert ht.length() == 2000
+
 
 if __name__ == '__main__':
     unittest.main()
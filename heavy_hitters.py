@@ -0,0 +1,125 @@
+#!python
+
+from __future__ import division, print_function  # Python 2 and 3 compatibility
+import heapq
+from operator import itemgetter
+
+
+class SpaceSaving(object):
+    """SpaceSaving finds the most frequent words of an unbounded stream while
+    monitoring at most `capacity` words, so memory stays fixed no matter how
+    large the vocabulary of the stream grows.
+
+    Error bounds, for a stream of N total tokens:
+    - A word's estimated count is never below its true count, and is at most
+      its true count plus its recorded error, which is at most N / capacity.
+    - Every word whose true count is greater than N / capacity is monitored,
+      so it is guaranteed to appear in the results of most_common().
+    """
+
+    def __init__(self, capacity, word_list=None):
+        """Initialize this summary to monitor up to capacity distinct words
+        and count given words, if any."""
+        if capacity < 1:
+            raise ValueError('Capacity must be positive: {}'.format(capacity))
+        self.capacity = capacity
+        self.tokens = 0  # Total count of all word tokens seen in the stream
+        self.counts = {}  # Estimated count of each monitored word
+        self.errors = {}  # Maximum overestimation of each monitored count
+        # Min-heap of (count, order, word) entries used to find the monitored
+        # word with the smallest count; entries whose count is out of date
+        # are skipped lazily and cleared out when the heap grows too large
+        self._heap = []
+        self._order = 0
+        if word_list is not None:
+            for word in word_list:
+                self.add_count(word)
+
+    def __len__(self):
+        """Return the number of words currently monitored."""
+        return len(self.counts)
+
+    def __contains__(self, word):
+        """Return boolean indicating if given word is currently monitored."""
+        return word in self.counts
+
+    def _push(self, word, count):
+        """Record the current count of given word in the min-heap."""
+        self._order += 1
+        heapq.heappush(self._heap, (count, self._order, word))
+        if len(self._heap) > 4 * self.capacity:
+            # Rebuild from current counts to drop out of date entries
+            self._heap = [(c, i, w) for i, (w, c) in enumerate(self.counts.items())]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self):
+        """Remove and return the monitored (word, count) with the smallest count."""
+        while True:
+            count, _, word = heapq.heappop(self._heap)
+            if self.counts.get(word) == count:
+                return word, count
+
+    def add_count(self, word, count=1):
+        """Increase frequency count of given word by given count amount.
+        Running time: O(log capacity) amortized because only the heap of
+        monitored words is updated, regardless of the stream's vocabulary."""
+        self.tokens += count
+        if word in self.counts:
+            self.counts[word] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[word] = count
+            self.errors[word] = 0
+        else:
+            # Replace the least frequent word, which inherits its count as
+            # the new word's possible overestimation
+            evicted, min_count = self._pop_min()
+            del self.counts[evicted]
+            del self.errors[evicted]
+            self.counts[word] = min_count + count
+            self.errors[word] = min_count
+        self._push(word, self.counts[word])
+
+    def frequency(self, word):
+        """Return estimated frequency count of given word, or 0 if the word is
+        not monitored. The estimate never undercounts a monitored word."""
+        return self.counts.get(word, 0)
+
+    def error(self, word):
+        """Return the maximum amount the estimate for given word can exceed
+        its true count, or the global bound N / capacity if not monitored."""
+        if word in self.errors:
+            return self.errors[word]
+        return self.tokens / self.capacity
+
+    def guaranteed(self, word):
+        """Return the count the given word is guaranteed to have reached."""
+        return self.counts.get(word, 0) - self.errors.get(word, 0)
+
+    def most_common(self, k=None):
+        """Return a list of the k words with the largest estimated counts as
+        (word, count) entries, ordered from most to least frequent."""
+        if k is None:
+            return sorted(self.counts.items(), key=itemgetter(1), reverse=True)
+        return heapq.nlargest(k, self.counts.items(), key=itemgetter(1))
+
+
+def main():
+    import sys
+    arguments = sys.argv[1:]  # Exclude script name in first argument
+    if len(arguments) < 2:
+        print('Usage: python heavy_hitters.py <capacity> <file_path> [k]')
+        sys.exit(1)
+    capacity = int(arguments[0])
+    k = int(arguments[2]) if len(arguments) > 2 else 10
+    summary = SpaceSaving(capacity)
+    with open(arguments[1], 'r', encoding='utf-8') as file:
+        for line in file:
+            for word in line.lower().split():
+                summary.add_count(word)
+    print('{} tokens, {} words monitored'.format(summary.tokens, len(summary)))
+    for word, count in summary.most_common(k):
+        print('{}: {} (+/- {})'.format(word, count, summary.error(word)))
+
+
+if __name__ == '__main__':
+    main()
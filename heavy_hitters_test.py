@@ -0,0 +1,57 @@
+#!python
+
+from heavy_hitters import SpaceSaving
+import unittest
+
+
+class SpaceSavingTest(unittest.TestCase):
+
+    fish_words = ['one', 'fish', 'two', 'fish', 'red', 'fish', 'blue', 'fish']
+
+    def test_exact_within_capacity(self):
+        summary = SpaceSaving(10, self.fish_words)
+        # With room for every word, counts should be exact
+        assert len(summary) == 5
+        assert summary.tokens == 8
+        assert summary.frequency('fish') == 4
+        assert summary.frequency('one') == 1
+        assert summary.frequency('food') == 0
+        assert summary.error('fish') == 0
+        assert summary.most_common(1) == [('fish', 4)]
+
+    def test_bounded_memory(self):
+        summary = SpaceSaving(3)
+        for i in range(1000):
+            summary.add_count('word{}'.format(i))
+        # No more than capacity words should be monitored
+        assert len(summary) == 3
+        assert summary.tokens == 1000
+        assert len(summary._heap) <= 4 * summary.capacity
+
+    def test_heavy_hitters_found(self):
+        summary = SpaceSaving(5)
+        true_counts = {}
+        # Stream with a few frequent words mixed into many rare ones
+        for i in range(2000):
+            for word in ('the', 'a') if i % 2 == 0 else ('the', 'rare{}'.format(i)):
+                summary.add_count(word)
+                true_counts[word] = true_counts.get(word, 0) + 1
+        bound = summary.tokens / summary.capacity
+        # Words more frequent than N / capacity must be monitored
+        for word, count in true_counts.items():
+            if count > bound:
+                assert word in summary
+        # Estimates never undercount and stay within their error bounds
+        for word, estimate in summary.most_common():
+            assert estimate >= true_counts[word]
+            assert estimate - true_counts[word] <= summary.error(word) <= bound
+            assert summary.guaranteed(word) <= true_counts[word]
+        assert [word for word, _ in summary.most_common(2)] == ['the', 'a']
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            SpaceSaving(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+#!python
+"""Compact binary save and load format for word histograms.
+
+A file holds a fixed header followed by a payload of three packed blocks:
+
+    header:  magic b'HSTG' | version u8 | count type u8 | reserved u16
+             | number of entries u64 | CRC-32 of payload u32
+    payload: byte length of each word (n x u32)
+             | every word's UTF-8 bytes, concatenated
+             | count of each word (n x i64, or n x f64 for weighted counts)
+
+All integers are little-endian. Loading is a single bulk read that unpacks
+the length and count blocks with the array module, so no text needs to be
+tokenized or counted again.
+"""
+
+import sys
+import zlib
+import struct
+from array import array
+from itertools import accumulate
+
+MAGIC = b'HSTG'
+VERSION = 1
+HEADER = struct.Struct('<4sBBHQI')
+# Array type codes for each count type stored in the header
+COUNT_TYPES = {0: 'q', 1: 'd'}
+
+
+class HistogramFormatError(ValueError):
+    """Raised when a file is not a valid saved histogram."""
+
+
+def _little_endian(values):
+    """Return the given array with its items in little-endian byte order."""
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def is_histogram_file(path):
+    """Return True if the file at the given path starts like a saved histogram."""
+    try:
+        with open(path, 'rb') as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def save_histogram(path, entries):
+    """Save the given (word, count) entries to a binary file at the given path,
+    keeping their order. Counts must be all integers or include floats."""
+    with open(path, 'wb') as file:
+        write_histogram(file, entries)
+
+
+def write_histogram(file, entries):
+    """Write the given (word, count) entries to an open binary file object."""
+    words = []
+    counts = []
+    for word, count in entries:
+        words.append(word.encode('utf-8'))
+        counts.append(count)
+    count_type = 1 if any(isinstance(count, float) for count in counts) else 0
+    lengths = _little_endian(array('I', map(len, words)))
+    counts = _little_endian(array(COUNT_TYPES[count_type], counts))
+    payload = [lengths.tobytes(), b''.join(words), counts.tobytes()]
+    checksum = 0
+    for block in payload:
+        checksum = zlib.crc32(block, checksum)
+    file.write(HEADER.pack(MAGIC, VERSION, count_type, 0, len(words), checksum))
+    for block in payload:
+        file.write(block)
+
+
+def load_histogram(path):
+    """Load and return the list of (word, count) entries saved at the given
+    path, or raise HistogramFormatError if the file is invalid or corrupt."""
+    with open(path, 'rb') as file:
+        data = file.read()
+    if len(data) < HEADER.size:
+        raise HistogramFormatError('File too short: {}'.format(path))
+    magic, version, count_type, _, num_entries, checksum = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise HistogramFormatError('Not a histogram file: {}'.format(path))
+    if version != VERSION:
+        raise HistogramFormatError('Unsupported version {}: {}'.format(version, path))
+    if count_type not in COUNT_TYPES:
+        raise HistogramFormatError('Unknown count type {}: {}'.format(count_type, path))
+    payload = memoryview(data)[HEADER.size:]
+    if zlib.crc32(payload) != checksum:
+        raise HistogramFormatError('Checksum mismatch: {}'.format(path))
+
+    lengths = array('I')
+    counts = array(COUNT_TYPES[count_type])
+    lengths_end = num_entries * lengths.itemsize
+    counts_size = num_entries * counts.itemsize
+    if lengths_end + counts_size > len(payload):
+        raise HistogramFormatError('Truncated file: {}'.format(path))
+    lengths.frombytes(payload[:lengths_end])
+    _little_endian(lengths)
+    blob_end = len(payload) - counts_size
+    counts.frombytes(payload[blob_end:])
+    _little_endian(counts)
+    blob = bytes(payload[lengths_end:blob_end])
+
+    ends = list(accumulate(lengths))
+    if (ends[-1] if ends else 0) != len(blob):
+        raise HistogramFormatError('Word lengths do not match: {}'.format(path))
+    starts = [0] + ends[:-1]
+    if blob.isascii():
+        # Byte offsets are also character offsets, so decode only once
+        text = blob.decode('ascii')
+        words = [text[start:end] for start, end in zip(starts, ends)]
+    else:
+        words = [blob[start:end].decode('utf-8') for start, end in zip(starts, ends)]
+    return list(zip(words, counts.tolist()))
@@ -0,0 +1,74 @@
+#!python
+
+from histogram_io import (HistogramFormatError, is_histogram_file,
+                          load_histogram, save_histogram)
+from dictogram import Dictogram
+from listogram import Listogram
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class HistogramIOTest(unittest.TestCase):
+
+    fish_words = ['one', 'fish', 'two', 'fish', 'red', 'fish', 'blue', 'fish']
+    fish_list = [('one', 1), ('fish', 4), ('two', 1), ('red', 1), ('blue', 1)]
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'histogram.hist')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip_keeps_order(self):
+        save_histogram(self.path, self.fish_list)
+        assert is_histogram_file(self.path)
+        assert load_histogram(self.path) == self.fish_list
+
+    def test_unicode_and_float_counts(self):
+        entries = [('café', 2.5), ('naïve', 1.0), ('', 3.0), ('日本', 0.5)]
+        save_histogram(self.path, entries)
+        assert load_histogram(self.path) == entries
+
+    def test_empty(self):
+        save_histogram(self.path, [])
+        assert load_histogram(self.path) == []
+
+    def test_dictogram_save_and_load(self):
+        histogram = Dictogram(self.fish_words)
+        histogram.save(self.path)
+        loaded = Dictogram.load(self.path)
+        assert isinstance(loaded, Dictogram)
+        assert loaded == histogram
+        assert loaded.types == 5
+        assert loaded.tokens == 8
+
+    def test_listogram_save_and_load(self):
+        histogram = Listogram(self.fish_words)
+        histogram.save(self.path)
+        loaded = Listogram.load(self.path)
+        assert isinstance(loaded, Listogram)
+        assert list(loaded) == self.fish_list
+        assert loaded.types == 5
+        assert loaded.tokens == 8
+
+    def test_corrupt_file(self):
+        save_histogram(self.path, self.fish_list)
+        with open(self.path, 'r+b') as file:
+            file.seek(-1, os.SEEK_END)
+            file.write(b'\xff')
+        with self.assertRaises(HistogramFormatError):
+            load_histogram(self.path)
+
+    def test_not_a_histogram(self):
+        with open(self.path, 'w') as file:
+            file.write('one fish two fish')
+        assert not is_histogram_file(self.path)
+        with self.assertRaises(HistogramFormatError):
+            load_histogram(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
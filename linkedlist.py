@@ -1,8 +1,12 @@
 #!python
 
+from footprint import breakdown, deep_sizeof, shallow_sizeof
+
 
 class Node(object):
 
+    __slots__ = ('data', 'next')  # No per-node attribute dict, to save memory
+
     def __init__(self, data):
         """Initialize this node with the given data."""
         self.data = data
@@ -15,6 +19,8 @@ class Node(object):
 
 class LinkedList:
 
+    __slots__ = ('head', 'tail')  # No per-list attribute dict, to save memory
+
     def __init__(self, items=None):
         """Initialize this linked list and append the given items, if any."""
         self.head = None  # First node
@@ -31,6 +37,13 @@ class LinkedList:
             ll_str += f'({item}) -> '
         return ll_str
 
+    def __iter__(self):
+        """Iterate over the items in this linked list lazily, from head to tail."""
+        node = self.head
+        while node is not None:
+            yield node.data
+            node = node.next
+
     def items(self):
         """Return a list (dynamic array) of all items in this linked list.
         Best and worst case running time: O(n) for n items in the list (length)
@@ -46,42 +59,209 @@ class LinkedList:
         # Now list contains items from all nodes
         return items  # O(1) time to return list
 
+    def footprint(self, seen=None):
+        """Return a dict of this linked list's deep size in bytes, broken down
+        into the list object (container), its items (values) and the node
+        objects linking them (nodes), with their total.
+        Running time: O(n) because every node is visited."""
+        seen = set() if seen is None else seen
+        container = shallow_sizeof(self, seen)
+        values = nodes = 0
+        node = self.head
+        while node is not None:
+            nodes += shallow_sizeof(node, seen)
+            values += deep_sizeof(node.data, seen)
+            node = node.next
+        return breakdown(container, 0, values, nodes)
+
     def is_empty(self):
         """Return a boolean indicating whether this linked list is empty."""
         return self.head is None
 
     def length(self):
         """Return the length of this linked list by traversing its nodes.
-        TODO: Running time: O(n) Why and under what conditions?"""
-        # TODO: Loop through all nodes and count one for each
+        Running time: O(n) for n items in the list because we always need to
+        loop through all n nodes to count each one."""
+        count = 0
+        node = self.head
+        # Loop through all nodes and count one for each
+        while node is not None:
+            count += 1
+            node = node.next
+        return count
 
     def append(self, item):
         """Insert the given item at the tail of this linked list.
-        TODO: Running time: O(???) Why and under what conditions?"""
-        # TODO: Create new node to hold given item
-        # TODO: If self.is_empty() == True set the head and the tail to the new node
-        # TODO: Else append node after tail
+        Running time: O(1) because the tail node is always known, so no
+        traversal is needed to find where the new node goes."""
+        node = Node(item)
+        if self.is_empty():
+            # New node is both the first and the last node
+            self.head = node
+        else:
+            # Link new node after the current tail
+            self.tail.next = node
+        self.tail = node
 
     def prepend(self, item):
         """Insert the given item at the head of this linked list.
-        TODO: Running time: O(???) Why and under what conditions?"""
-        # TODO: Create new node to hold given item
-        # TODO: Prepend node before head, if it exists
+        Running time: O(1) because the head node is always known, so no
+        traversal is needed to find where the new node goes."""
+        node = Node(item)
+        if self.is_empty():
+            # New node is both the first and the last node
+            self.tail = node
+        else:
+            # Link new node before the current head
+            node.next = self.head
+        self.head = node
 
     def find(self, matcher):
         """Return an item from this linked list if it is present.
-        TODO: Best case running time: O(???) Why and under what conditions?
-        TODO: Worst case running time: O(???) Why and under what conditions?"""
-        # TODO: Loop through all nodes to find item, if present return True otherwise False
+        Best case running time: O(1) if the item matching is near the head.
+        Worst case running time: O(n) if the matching item is near the tail
+        or no item matches, because we must check all n nodes."""
+        node = self.head
+        # Loop through all nodes to find an item that satisfies the matcher
+        while node is not None:
+            if matcher(node.data):
+                return node.data
+            node = node.next
+        return None
+
+    def delete(self, item):
+        """Delete the given item from this linked list, or raise ValueError.
+        Best case running time: O(1) if the item is the head node.
+        Worst case running time: O(n) if the item is near the tail or not
+        in the list, because we must traverse all n nodes to find it."""
+        previous = None
+        node = self.head
+        # Loop through all nodes to find one whose data matches given item
+        while node is not None:
+            if node.data == item:
+                # Update previous node (or head) to skip around matching node
+                if previous is None:
+                    self.head = node.next
+                else:
+                    previous.next = node.next
+                # Move tail back if the matching node was the last node
+                if node is self.tail:
+                    self.tail = previous
+                return
+            previous = node
+            node = node.next
+        raise ValueError('Item not found: {}'.format(item))
+
+    def replace(self, old_item, new_item):
+        """Replace the data of the first node matching old_item with new_item,
+        leaving this linked list unchanged if old_item is not found.
+        Running time: O(n) in the worst case for the same reason as find."""
+        node = self.head
+        while node is not None:
+            if node.data == old_item:
+                node.data = new_item
+                return
+            node = node.next
+
+
+class DoublyNode(Node):
+
+    __slots__ = ('prev',)
+
+    def __init__(self, data):
+        """Initialize this node with the given data and no previous node."""
+        super(DoublyNode, self).__init__(data)
+        self.prev = None
+
+    def __repr__(self):
+        """Return a string representation of this node."""
+        return f'DoublyNode({self.data})'
+
+
+class DoublyLinkedList(LinkedList):
+    """Linked list whose nodes also link to their previous node, so a known
+    node can be unlinked and the tail can be removed in O(1) time."""
+
+    __slots__ = ()
+
+    def append(self, item):
+        """Insert the given item at the tail of this linked list and return
+        its new node. Running time: O(1) because the tail node is known."""
+        node = DoublyNode(item)
+        if self.is_empty():
+            self.head = node
+        else:
+            node.prev = self.tail
+            self.tail.next = node
+        self.tail = node
+        return node
+
+    def prepend(self, item):
+        """Insert the given item at the head of this linked list and return
+        its new node. Running time: O(1) because the head node is known."""
+        node = DoublyNode(item)
+        if self.is_empty():
+            self.tail = node
+        else:
+            node.next = self.head
+            self.head.prev = node
+        self.head = node
+        return node
+
+    def unlink(self, node):
+        """Remove the given node, which must belong to this linked list.
+        Running time: O(1) because the node links to both of its neighbors,
+        so no traversal is needed to find the previous node."""
+        if node.prev is None:
+            self.head = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is None:
+            self.tail = node.prev
+        else:
+            node.next.prev = node.prev
+        node.prev = node.next = None
+
+    def move_to_head(self, node):
+        """Move the given node, which must belong to this linked list, to the
+        head. Running time: O(1) for the same reason as unlink."""
+        if node is self.head:
+            return
+        self.unlink(node)
+        node.next = self.head
+        self.head.prev = node
+        self.head = node
+
+    def pop_head(self):
+        """Remove and return the item at the head, or raise ValueError if this
+        linked list is empty. Running time: O(1)."""
+        if self.is_empty():
+            raise ValueError('List is empty')
+        node = self.head
+        self.unlink(node)
+        return node.data
+
+    def pop_tail(self):
+        """Remove and return the item at the tail, or raise ValueError if this
+        linked list is empty. Running time: O(1), unlike a singly linked list
+        which must traverse to find the node before the tail."""
+        if self.is_empty():
+            raise ValueError('List is empty')
+        node = self.tail
+        self.unlink(node)
+        return node.data
 
     def delete(self, item):
         """Delete the given item from this linked list, or raise ValueError.
-        TODO: Best case running time: O(???) Why and under what conditions?
-        TODO: Worst case running time: O(???) Why and under what conditions?"""
-        # TODO: Loop through all nodes to find one whose data matches given item
-        # TODO: Update previous node to skip around node with matching data
-        # TODO: Otherwise raise error to tell user that delete has failed
-        # Hint: raise ValueError('Item not found: {}'.format(item))
+        Best case running time: O(1) if the item is the head node.
+        Worst case running time: O(n) to find an item near the tail."""
+        node = self.head
+        while node is not None:
+            if node.data == item:
+                self.unlink(node)
+                return
+            node = node.next
+        raise ValueError('Item not found: {}'.format(item))
 
 
 def test_linked_list():
@@ -98,7 +278,7 @@ def test_linked_list():
     print('length: {}'.format(ll.length()))
 
     # Enable this after implementing delete method
-    delete_implemented = False
+    delete_implemented = True
     if delete_implemented:
         print('\nTesting delete:')
         for item in ['B', 'C', 'A']:
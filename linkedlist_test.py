@@ -1,6 +1,6 @@
 #!python
 
-from linkedlist import LinkedList, Node
+from linkedlist import DoublyLinkedList, LinkedList, Node
 import unittest
 
 
@@ -191,6 +191,16 @@ class LinkedListTest(unittest.TestCase):
         with self.assertRaises(ValueError):
             ll.delete('X')  # Item not found in list
 
+    def test_footprint(self):
+        ll = LinkedList()
+        assert ll.footprint()['nodes'] == 0
+        ll = LinkedList(['A', 'B', 'C'])
+        footprint = ll.footprint()
+        assert footprint['nodes'] > 0
+        assert footprint['values'] > 0
+        assert footprint['total'] == sum(footprint[part] for part in
+                                         ('container', 'keys', 'values', 'nodes'))
+
     def test_replace_with_item(self):
         ll = LinkedList(['A', 'B', 'C'])
         # for item in list
@@ -201,5 +211,48 @@ class LinkedListTest(unittest.TestCase):
         assert ll.head.data == 'D'
 
 
+class DoublyLinkedListTest(unittest.TestCase):
+
+    def test_append_and_prepend_link_both_ways(self):
+        ll = DoublyLinkedList(['B', 'C'])
+        node = ll.prepend('A')
+        assert node is ll.head
+        assert ll.items() == ['A', 'B', 'C']
+        assert ll.head.next.prev is ll.head
+        assert ll.tail.prev.data == 'B'
+
+    def test_unlink(self):
+        ll = DoublyLinkedList()
+        node_a = ll.append('A')
+        node_b = ll.append('B')
+        node_c = ll.append('C')
+        ll.unlink(node_b)
+        assert ll.items() == ['A', 'C']
+        ll.unlink(node_c)
+        assert ll.tail is node_a
+        ll.unlink(node_a)
+        assert ll.head is None
+        assert ll.tail is None
+
+    def test_pop_and_move(self):
+        ll = DoublyLinkedList(['A', 'B', 'C'])
+        ll.move_to_head(ll.tail)
+        assert ll.items() == ['C', 'A', 'B']
+        assert ll.pop_tail() == 'B'
+        assert ll.pop_head() == 'C'
+        assert ll.items() == ['A']
+        assert ll.pop_tail() == 'A'
+        with self.assertRaises(ValueError):
+            ll.pop_tail()
+
+    def test_delete(self):
+        ll = DoublyLinkedList(['A', 'B', 'C'])
+        ll.delete('B')
+        assert ll.items() == ['A', 'C']
+        assert ll.tail.prev is ll.head
+        with self.assertRaises(ValueError):
+            ll.delete('X')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,11 +1,46 @@
 #!python
 
 from __future__ import division, print_function  # Python 2 and 3 compatibility
+import heapq
 import random
+from collections import Counter
+from operator import itemgetter
+from histogram_io import load_histogram, save_histogram
+from footprint import breakdown, deep_sizeof, shallow_sizeof
+
+
+def _forgets_index(method):
+    """Wrap a list method that may move or replace entries so it also
+    discards the word index, which is rebuilt when next needed."""
+    def mutator(self, *args, **kwargs):
+        self._index = None
+        return method(self, *args, **kwargs)
+    mutator.__name__ = method.__name__
+    mutator.__doc__ = method.__doc__
+    return mutator
 
 
 class Listogram(list):
-    """Listogram is a histogram implemented as a subclass of the list type."""
+    """Listogram is a histogram implemented as a subclass of the list type.
+    Entries are (word, count) tuples in the order words were first seen, and
+    a dict maps each word to the position of its entry, so finding a word
+    takes O(1) time instead of a scan of every entry. Changing the list
+    directly, like with append, sort or del, discards the index, and the next
+    lookup rebuilds it in O(n) time."""
+
+    # List methods that can move or replace entries, so positions go stale
+    append = _forgets_index(list.append)
+    extend = _forgets_index(list.extend)
+    insert = _forgets_index(list.insert)
+    remove = _forgets_index(list.remove)
+    pop = _forgets_index(list.pop)
+    clear = _forgets_index(list.clear)
+    sort = _forgets_index(list.sort)
+    reverse = _forgets_index(list.reverse)
+    __setitem__ = _forgets_index(list.__setitem__)
+    __delitem__ = _forgets_index(list.__delitem__)
+    __iadd__ = _forgets_index(list.__iadd__)
+    __imul__ = _forgets_index(list.__imul__)
 
     def __init__(self, word_list=None):
         """Initialize this histogram as a new list and count given words."""
@@ -13,50 +48,83 @@ class Listogram(list):
         # Add properties to track useful word counts for this histogram
         self.types = 0  # Count of distinct word types in this histogram
         self.tokens = 0  # Total count of all word tokens in this histogram
+        self._index = {}  # Map of each word to the position of its entry
         # Count words in given list, if any
         if word_list is not None:
-            for word in word_list:
-                self.add_count(word)
+            # Counter counts in one native pass and keeps words in the order
+            # they were first seen, matching what add_count would build
+            self._extend_counts(Counter(word_list))
+
+    @classmethod
+    def from_counts(cls, pairs):
+        """Return a new histogram with the given (word, count) pairs, in order,
+        without replaying each token. Counts of repeated words are summed.
+        Running time: O(n) for n pairs."""
+        counts = {}
+        for word, count in pairs:
+            counts[word] = counts.get(word, 0) + count
+        histogram = cls()
+        histogram._extend_counts(counts)
+        return histogram
+
+    def _extend_counts(self, counts):
+        """Append the entries of a dict of words not yet in this histogram to
+        their counts, updating types and tokens directly."""
+        index = self._positions()
+        for position, word in enumerate(counts, len(self)):
+            index[word] = position
+        list.extend(self, counts.items())
+        self.types += len(counts)
+        self.tokens += sum(counts.values())
 
     def add_count(self, word, count=1):
-        """Increase frequency count of given word by given count amount."""
-        for i, (w, c) in enumerate(self):
-            if w == word:
-                self[i] = (w, c + count)  # Update count in tuple
-                self.tokens += count
-                return
+        """Increase frequency count of given word by given count amount.
+        Running time: O(1) on average because the word's entry is found by
+        its position in the index."""
+        index = self._positions()
+        i = index.get(word)
+        if i is not None:
+            list.__setitem__(self, i, (word, self[i][1] + count))  # Update count in tuple
+            self.tokens += count
+            return
         # If word is not found, add it as a tuple
-        self.append((word, count))
+        index[word] = len(self)
+        list.append(self, (word, count))
         self.types += 1
         self.tokens += count
 
     def frequency(self, word):
-        """Return frequency count of given word, or 0 if word is not found."""
-        for entry in self:
-            if entry[0] == word:
-                return entry[1]
-        return 0
+        """Return frequency count of given word, or 0 if word is not found.
+        Running time: O(1) on average."""
+        i = self._positions().get(word)
+        return self[i][1] if i is not None else 0
 
     def __contains__(self, word):
         """Return boolean indicating if given word is in this histogram."""
-        for entry in self:
-            if entry[0] == word:
-                return True
-        return False
+        return word in self._positions()
 
     def index_of(self, target):
         """Return the index of entry containing given target word if found in
         this histogram, or None if target word is not found."""
-        for index, entry in enumerate(self):
-            if entry[0] == target:
-                return index
-        return None
-
-    def sample(self):
+        return self._positions().get(target)
+
+    def _positions(self):
+        """Return the map of each word to the position of its entry,
+        rebuilding it if the list was changed directly since it was built."""
+        if self._index is None:
+            index = {}
+            for position, (word, _) in enumerate(self):
+                index.setdefault(word, position)
+            self._index = index
+        return self._index
+
+    def sample(self, rng=None):
         """Return a word from this histogram, randomly sampled by weighting
-        each word's probability of being chosen by its observed frequency."""
+        each word's probability of being chosen by its observed frequency.
+        Draws from the given random.Random instance, if any, instead of the
+        random module's shared global generator."""
         total = self.tokens
-        dart = random.uniform(0, total)  # Random number in range [0, total)
+        dart = (rng or random).uniform(0, total)  # Random number in range [0, total)
         cumulative = 0
 
         for word, count in self:
@@ -64,6 +132,41 @@ class Listogram(list):
             if dart < cumulative:
                 return word  # Return the word where dart falls in cumulative sum
 
+    def most_common(self, k=None):
+        """Return a list of the k most frequent (word, count) entries, ordered
+        from most to least frequent, or all entries if k is None.
+        Running time: O(n log k) for n word types because a heap of at most
+        k entries is maintained while scanning, instead of sorting all n."""
+        if k is None:
+            return sorted(self, key=itemgetter(1), reverse=True)
+        return heapq.nlargest(k, self, key=itemgetter(1))
+
+    def footprint(self):
+        """Return a dict of this histogram's deep size in bytes, broken down
+        into the list's own array and the word index (container), words
+        (keys), counts (values) and the (word, count) tuple of each entry
+        (nodes), with their total."""
+        seen = set()
+        index = self._positions()
+        container = shallow_sizeof(self, seen) + shallow_sizeof(index, seen)
+        container += sum(deep_sizeof(position, seen) for position in index.values())
+        keys = values = nodes = 0
+        for entry in self:
+            nodes += shallow_sizeof(entry, seen)
+            keys += deep_sizeof(entry[0], seen)
+            values += deep_sizeof(entry[1], seen)
+        return breakdown(container, keys, values, nodes)
+
+    def save(self, path):
+        """Save this histogram's words and counts to a compact binary file."""
+        save_histogram(path, self)
+
+    @classmethod
+    def load(cls, path):
+        """Return a new histogram with the words and counts saved at the given
+        path, without re-reading or re-counting the original text."""
+        return cls.from_counts(load_histogram(path))
+
 
 def print_histogram(word_list):
     print()
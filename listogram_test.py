@@ -86,6 +86,85 @@ class ListogramTest(unittest.TestCase):
             histogram.add_count(word)
         assert histogram.types == 5
 
+    def test_most_common(self):
+        histogram = Listogram(self.fish_words)
+        # Most frequent entries should come first, limited to k entries
+        assert histogram.most_common(1) == [('fish', 4)]
+        top_three = histogram.most_common(3)
+        assert len(top_three) == 3
+        assert top_three[0] == ('fish', 4)
+        assert all(count == 1 for _, count in top_three[1:])
+        # Without k, all entries should be returned in order of frequency
+        all_entries = histogram.most_common()
+        assert len(all_entries) == 5
+        assert all_entries[0] == ('fish', 4)
+        self.assertCountEqual(all_entries, self.fish_list)
+        # Asking for more entries than exist should return all of them
+        assert len(histogram.most_common(10)) == 5
+
+    def test_bulk_build_matches_add_count(self):
+        histogram = Listogram(iter(self.fish_words))
+        # Entries should be in the order each word was first seen
+        assert histogram == self.fish_list
+        assert histogram.types == 5
+        assert histogram.tokens == 8
+        histogram.add_count('fish')
+        assert histogram.frequency('fish') == 5
+
+    def test_from_counts(self):
+        histogram = Listogram.from_counts(self.fish_list)
+        assert histogram == self.fish_list
+        assert histogram.types == 5
+        assert histogram.tokens == 8
+        # Counts of repeated words should be combined
+        histogram = Listogram.from_counts([('fish', 2), ('one', 1), ('fish', 3)])
+        assert histogram == [('fish', 5), ('one', 1)]
+        assert histogram.types == 2
+        assert histogram.tokens == 6
+        assert Listogram.from_counts([]).tokens == 0
+
+    def test_index_of(self):
+        histogram = Listogram.from_counts(self.fish_list)
+        assert histogram.index_of('fish') == 1
+        assert histogram.index_of('blue') == 4
+        assert histogram.index_of('green') is None
+        # Words added later are found at their new positions, and updating
+        # a word's count leaves its position alone
+        histogram.add_count('green', 2)
+        histogram.add_count('one')
+        assert histogram.index_of('green') == 5
+        assert histogram[histogram.index_of('one')] == ('one', 2)
+        assert histogram.frequency('green') == 2
+        assert 'green' in histogram
+
+    def test_direct_list_changes(self):
+        histogram = Listogram(self.fish_words)
+        histogram.sort(key=lambda entry: entry[1], reverse=True)
+        assert histogram.index_of('fish') == 0
+        histogram.append(('green', 2))
+        histogram.insert(0, ('eggs', 3))
+        assert histogram.frequency('green') == 2
+        assert histogram.frequency('fish') == 4
+        del histogram[0]
+        assert 'eggs' not in histogram
+        histogram[0] = ('fish', 6)
+        histogram.add_count('fish')
+        assert histogram.frequency('fish') == 7
+        histogram += [('ham', 1)]
+        assert histogram.index_of('ham') == len(histogram) - 1
+        histogram.clear()
+        assert histogram.frequency('fish') == 0
+
+    def test_footprint(self):
+        histogram = Listogram(self.fish_words)
+        footprint = histogram.footprint()
+        # Every part should be measured and add up to the total
+        assert footprint['container'] > 0
+        assert footprint['keys'] > 0
+        assert footprint['nodes'] > 0
+        assert footprint['total'] == sum(footprint[part] for part in
+                                         ('container', 'keys', 'values', 'nodes'))
+
     def test_sample(self):
         histogram = Listogram(self.fish_words)
         # Create a list of 10,000 word samples from histogram
@@ -0,0 +1,304 @@
+"""Load generator for the web app, using only the standard library.
+
+Starts the app in this process (or as a subprocess, or uses a server that is
+already running), sends requests to one or more paths either from a fixed
+number of concurrent clients or at a fixed rate, and reports throughput,
+latency percentiles and error rate. Results can be saved as JSON to compare
+releases:
+
+    python -m cli loadtest --concurrency 8 --duration 10 -o before.json
+    python -m cli loadtest --rate 200 --duration 10 --path / --path "/word?length=5"
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import itertools
+import threading
+import subprocess
+import http.client
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_PATHS = ["/", "/autocomplete?prefix=th&k=5", "/word?first_letter=a"]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    """
+    Return the value at the given fraction (0 to 1) of an ascending list, by nearest rank.
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * fraction // 1))  # ceil(n * fraction), at least 1
+    return sorted_values[min(int(rank), len(sorted_values)) - 1]
+
+
+def start_in_process(host: str = "127.0.0.1", port: int = 0):
+    """
+    Serve the Flask app on a background thread of this process.
+    :return: Tuple of (base URL, function that stops the server).
+    """
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    from app import app
+
+    class RequestHandler(WSGIRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep connections alive between requests, like production servers
+
+        def log_request(self, *args, **kwargs):
+            pass  # One log line per request would slow the server being measured
+
+    server = make_server(host, port, app, threaded=True, request_handler=RequestHandler)
+    thread = threading.Thread(target=server.serve_forever, name="loadtest-server", daemon=True)
+    thread.start()
+
+    def stop():
+        server.shutdown()
+        thread.join()
+
+    return f"http://{host}:{server.server_port}", stop
+
+
+def start_subprocess(host: str = "127.0.0.1", port: Optional[int] = None, timeout: float = 30):
+    """
+    Serve the app from a separate `cli serve` process, waiting until it accepts connections.
+    :return: Tuple of (base URL, function that stops the server).
+    """
+    if port is None:
+        with socket.socket() as probe:
+            probe.bind((host, 0))
+            port = probe.getsockname()[1]
+    process = subprocess.Popen([sys.executable, "-m", "cli", "serve", "--host", host, "--port", str(port)],
+                               cwd=os.path.dirname(os.path.abspath(__file__)),
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def stop():
+        process.terminate()
+        process.wait()
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            break
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                stop()
+                raise RuntimeError(f"Server did not start on {host}:{port}")
+            time.sleep(0.1)
+    return f"http://{host}:{port}", stop
+
+
+class LoadTest(object):
+    """
+    Sends requests to a server and records the outcome of each one. Each
+    client thread keeps its own HTTP connection, reconnecting when the server
+    closes it.
+    """
+
+    def __init__(self, base_url: str, paths: List[str], timeout: float = 10):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.paths = paths
+        self.timeout = timeout
+        # One (path, status or None for a failed connection, latency in seconds) per request
+        self.results: List[Tuple[str, Optional[int], float]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(
+                self.host, self.port, timeout=self.timeout)
+        return connection
+
+    def request(self, path: str, started: Optional[float] = None) -> None:
+        """
+        Send one GET request and record its status and latency. Latency is
+        measured from started, if given, such as the time the request was due
+        to be sent, so a slow server cannot hide queueing delay.
+        """
+        if started is None:
+            started = time.perf_counter()
+        try:
+            connection = self._connection()
+            connection.request("GET", self.prefix + path)
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            self._local.connection.close()
+            self._local.connection = None
+            status = None
+        latency = time.perf_counter() - started
+        with self._lock:
+            self.results.append((path, status, latency))
+
+    def run_concurrency(self, concurrency: int, duration: float, max_requests: Optional[int] = None) -> float:
+        """
+        Run concurrency clients that each send the next request as soon as the
+        last one finishes, for duration seconds or until max_requests are sent.
+        :return: Elapsed time in seconds.
+        """
+        counter = iter(range(max_requests)) if max_requests is not None else itertools.count()
+        counter_lock = threading.Lock()
+        start = time.perf_counter()
+        deadline = start + duration
+
+        def client():
+            while time.perf_counter() < deadline:
+                with counter_lock:
+                    number = next(counter, None)
+                if number is None:
+                    return
+                self.request(self.paths[number % len(self.paths)])
+
+        threads = [threading.Thread(target=client) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start
+
+    def run_rate(self, rate: float, duration: float, concurrency: int = 64) -> float:
+        """
+        Send rate requests per second on a fixed schedule for duration
+        seconds, whether or not earlier requests have finished, using up to
+        concurrency threads.
+        :return: Elapsed time in seconds.
+        """
+        start = time.perf_counter()
+        total = int(rate * duration)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for number in range(total):
+                due = start + number / rate
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(self.request, self.paths[number % len(self.paths)], due)
+        return time.perf_counter() - start
+
+    def summary(self, elapsed: float) -> Dict:
+        """
+        Return a dict of request count, throughput, error rate and latency
+        percentiles (in milliseconds), overall and for each path. Responses
+        with status 500 or above and failed connections count as errors.
+        """
+        def describe(results):
+            latencies = sorted(latency * 1000 for _, _, latency in results)
+            errors = sum(1 for _, status, _ in results if status is None or status >= 500)
+            statuses: Dict[str, int] = {}
+            for _, status, _ in results:
+                key = str(status) if status is not None else "failed"
+                statuses[key] = statuses.get(key, 0) + 1
+            return {
+                "requests": len(results),
+                "errors": errors,
+                "error_rate": errors / len(results) if results else 0.0,
+                "statuses": statuses,
+                "latency_ms": {
+                    "p50": percentile(latencies, 0.50),
+                    "p95": percentile(latencies, 0.95),
+                    "p99": percentile(latencies, 0.99),
+                    "max": latencies[-1] if latencies else None,
+                },
+            }
+
+        with self._lock:
+            results = list(self.results)
+        report = describe(results)
+        report["elapsed_seconds"] = elapsed
+        report["throughput_rps"] = len(results) / elapsed if elapsed > 0 else 0.0
+        report["paths"] = {path: describe([result for result in results if result[0] == path])
+                           for path in self.paths}
+        return report
+
+
+def format_report(report: Dict) -> str:
+    """Return a short human-readable summary of a load test report."""
+    latency = report["latency_ms"]
+
+    def ms(value):
+        return f"{value:.1f}" if value is not None else "-"
+
+    lines = [
+        f"{report['requests']} requests in {report['elapsed_seconds']:.1f}s: "
+        f"{report['throughput_rps']:.1f} req/s, {report['error_rate']:.2%} errors",
+        f"latency ms: p50 {ms(latency['p50'])}, p95 {ms(latency['p95'])}, "
+        f"p99 {ms(latency['p99'])}, max {ms(latency['max'])}",
+    ]
+    for path, path_report in report["paths"].items():
+        lines.append(f"  {path}: {path_report['requests']} requests, "
+                     f"p50 {ms(path_report['latency_ms']['p50'])} ms, "
+                     f"p99 {ms(path_report['latency_ms']['p99'])} ms, "
+                     f"{path_report['errors']} errors")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="cli loadtest", description="Load test the web app.")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Base URL of a server that is already running.")
+    target.add_argument("--subprocess", action="store_true",
+                        help="Start the app in a separate process instead of this one.")
+    parser.add_argument("-p", "--path", action="append", dest="paths",
+                        help=f"Path to request, repeatable (default: {' '.join(DEFAULT_PATHS)}).")
+    parser.add_argument("-c", "--concurrency", type=int, default=8,
+                        help="Number of concurrent clients, or most requests in flight with --rate.")
+    parser.add_argument("-r", "--rate", type=float,
+                        help="Send this many requests per second instead of as fast as clients can.")
+    parser.add_argument("-d", "--duration", type=float, default=10, help="Seconds to run.")
+    parser.add_argument("-n", "--requests", type=int, help="Stop after this many requests (without --rate).")
+    parser.add_argument("--warmup", type=int, default=20, help="Requests to send before measuring.")
+    parser.add_argument("-o", "--output", help="Save the report as JSON to this path.")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate must be positive")
+
+    paths = args.paths or DEFAULT_PATHS
+    started = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    if args.url:
+        base_url, stop = args.url, None
+    elif args.subprocess:
+        base_url, stop = start_subprocess()
+    else:
+        base_url, stop = start_in_process()
+    try:
+        LoadTest(base_url, paths).run_concurrency(args.concurrency, 60, args.warmup)
+        load_test = LoadTest(base_url, paths)
+        if args.rate is not None:
+            elapsed = load_test.run_rate(args.rate, args.duration, args.concurrency)
+        else:
+            elapsed = load_test.run_concurrency(args.concurrency, args.duration, args.requests)
+    finally:
+        if stop is not None:
+            stop()
+
+    report = load_test.summary(elapsed)
+    report["config"] = {
+        "target": args.url or ("subprocess" if args.subprocess else "in-process"),
+        "paths": paths,
+        "mode": "rate" if args.rate is not None else "concurrency",
+        "rate": args.rate,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "python": sys.version.split()[0],
+        "started": started,
+    }
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"Saved report to {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
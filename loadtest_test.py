@@ -0,0 +1,74 @@
+#!python
+
+from loadtest import LoadTest, main, percentile, start_in_process
+import json
+import os
+import socket
+import tempfile
+import unittest
+
+
+class PercentileTest(unittest.TestCase):
+
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 0.50) == 50
+        assert percentile(values, 0.95) == 95
+        assert percentile(values, 0.99) == 99
+        assert percentile(values, 1.0) == 100
+        assert percentile([7], 0.99) == 7
+        assert percentile([], 0.5) is None
+
+
+class LoadTestTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.base_url, cls.stop = start_in_process()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stop()
+
+    def test_concurrency_mode(self):
+        load_test = LoadTest(self.base_url, ['/', '/autocomplete?prefix=a', '/missing'])
+        elapsed = load_test.run_concurrency(4, duration=30, max_requests=30)
+        report = load_test.summary(elapsed)
+        assert report['requests'] == 30
+        assert report['errors'] == 0  # 404 is a client error, not a server error
+        assert report['statuses'] == {'200': 20, '404': 10}
+        assert report['paths']['/']['requests'] == 10
+        latency = report['latency_ms']
+        assert 0 < latency['p50'] <= latency['p95'] <= latency['p99'] <= latency['max']
+        assert report['throughput_rps'] > 0
+
+    def test_rate_mode(self):
+        load_test = LoadTest(self.base_url, ['/'])
+        elapsed = load_test.run_rate(50, duration=0.2)
+        report = load_test.summary(elapsed)
+        assert report['requests'] == 10
+        assert report['error_rate'] == 0.0
+
+    def test_connection_errors(self):
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]  # Nothing listens here once closed
+        load_test = LoadTest('http://127.0.0.1:{}'.format(port), ['/'], timeout=1)
+        report = load_test.summary(load_test.run_concurrency(2, duration=30, max_requests=4))
+        assert report['requests'] == 4
+        assert report['error_rate'] == 1.0
+        assert report['statuses'] == {'failed': 4}
+
+    def test_main_saves_json(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'report.json')
+            main(['--url', self.base_url, '-c', '2', '-n', '6', '--warmup', '0', '-p', '/', '-o', path])
+            with open(path) as file:
+                report = json.load(file)
+        assert report['requests'] == 6
+        assert report['config']['mode'] == 'concurrency'
+        assert report['config']['paths'] == ['/']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+#!python
+
+import threading
+import time
+from functools import wraps
+from footprint import breakdown, deep_sizeof, shallow_sizeof
+from hashtable import HashTable
+from linkedlist import DoublyLinkedList
+
+
+class LRUCache(object):
+    """Bounded cache that evicts the least recently used entry when full.
+
+    A HashTable maps each key to its node in a DoublyLinkedList ordered from
+    most recently used (head) to least recently used (tail), so get, put and
+    evict each take O(1) time on average. Entries older than ttl seconds, if
+    given, are treated as missing."""
+
+    def __init__(self, capacity=128, ttl=None, clock=time.monotonic):
+        """Initialize this cache to hold at most capacity entries, each of
+        which expires ttl seconds after it was put (never if ttl is None)."""
+        if capacity < 1:
+            raise ValueError('Capacity must be positive: {}'.format(capacity))
+        self.capacity = capacity
+        self.ttl = ttl
+        self.clock = clock
+        self.nodes = HashTable()  # Map of key to node holding (key, value, expires)
+        self.order = DoublyLinkedList()  # Most recently used entry at head
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0  # Entries removed to make room for new entries
+        self.expirations = 0  # Entries removed because their ttl passed
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        """Return a string representation of this cache."""
+        return 'LRUCache(capacity={!r}, ttl={!r}, {!r})'.format(
+            self.capacity, self.ttl, self.order.items())
+
+    def __len__(self):
+        """Return the number of entries in this cache."""
+        return self.length()
+
+    def __contains__(self, key):
+        """Return True if this cache holds an unexpired entry for given key."""
+        return self.contains(key)
+
+    def length(self):
+        """Return the number of entries in this cache, including any expired
+        entries that have not been looked up since. Running time: O(1)."""
+        return self.nodes.length()
+
+    def _expired(self, node):
+        """Return True if the entry in the given node has expired."""
+        expires = node.data[2]
+        return expires is not None and self.clock() >= expires
+
+    def _remove(self, node):
+        """Remove the entry in the given node from this cache."""
+        self.order.unlink(node)
+        self.nodes.delete(node.data[0])
+
+    def contains(self, key):
+        """Return True if this cache holds an unexpired entry for given key,
+        without counting as a use of the entry. Running time: O(1)."""
+        with self._lock:
+            if not self.nodes.contains(key):
+                return False
+            return not self._expired(self.nodes.get(key))
+
+    def get(self, key):
+        """Return the value cached for given key and mark it most recently
+        used, or raise KeyError if it is missing or expired.
+        Running time: O(1) on average."""
+        with self._lock:
+            try:
+                node = self.nodes.get(key)
+            except KeyError:
+                self.misses += 1
+                raise
+            if self._expired(node):
+                self._remove(node)
+                self.expirations += 1
+                self.misses += 1
+                raise KeyError('Key expired: {}'.format(key))
+            self.order.move_to_head(node)
+            self.hits += 1
+            return node.data[1]
+
+    def put(self, key, value):
+        """Cache the given value for given key as the most recently used entry,
+        evicting the least recently used entry if this cache is full.
+        Running time: O(1) on average."""
+        with self._lock:
+            expires = None if self.ttl is None else self.clock() + self.ttl
+            if self.nodes.contains(key):
+                node = self.nodes.get(key)
+                node.data = (key, value, expires)
+                self.order.move_to_head(node)
+                return
+            if self.nodes.length() >= self.capacity:
+                self.evict()
+            self.nodes.set(key, self.order.prepend((key, value, expires)))
+
+    def evict(self):
+        """Remove the least recently used entry and return its (key, value),
+        or raise KeyError if this cache is empty. Running time: O(1)."""
+        with self._lock:
+            if self.order.is_empty():
+                raise KeyError('Cache is empty')
+            key, value, _ = self.order.pop_tail()
+            self.nodes.delete(key)
+            self.evictions += 1
+            return key, value
+
+    def delete(self, key):
+        """Remove the entry for given key, or raise KeyError if not found."""
+        with self._lock:
+            self._remove(self.nodes.get(key))
+
+    def clear(self):
+        """Remove every entry from this cache, keeping its counters."""
+        with self._lock:
+            self.nodes = HashTable()
+            self.order = DoublyLinkedList()
+
+    def footprint(self, seen=None):
+        """Return a dict of this cache's deep size in bytes, broken down into
+        the cache and its hash table (container), cached keys and values, and
+        the per-entry overhead of hash table entries, list nodes and entry
+        tuples (nodes), with their total. Objects already in seen, if given,
+        are not counted again. Running time: O(n + b) for n entries, b buckets."""
+        seen = set() if seen is None else seen
+        with self._lock:
+            # The hash table's values are list nodes, counted once below, so
+            # its buckets and entries are only sized shallowly here
+            container = shallow_sizeof(self, seen) + shallow_sizeof(self.nodes, seen)
+            container += shallow_sizeof(self.nodes.buckets, seen)
+            keys = values = 0
+            nodes = shallow_sizeof(self.order, seen)
+            for bucket in self.nodes.buckets:
+                nodes += shallow_sizeof(bucket, seen)
+                node = bucket.head
+                while node is not None:
+                    nodes += shallow_sizeof(node, seen) + shallow_sizeof(node.data, seen)
+                    node = node.next
+            node = self.order.head
+            while node is not None:
+                nodes += shallow_sizeof(node, seen) + shallow_sizeof(node.data, seen)
+                key, value, expires = node.data
+                keys += deep_sizeof(key, seen)
+                values += deep_sizeof(value, seen) + deep_sizeof(expires, seen)
+                node = node.next
+        return breakdown(container, keys, values, nodes)
+
+    def stats(self):
+        """Return a dict of this cache's size and hit, miss and eviction counts."""
+        with self._lock:
+            return {
+                'size': self.nodes.length(),
+                'capacity': self.capacity,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+def memoize(capacity=128, ttl=None):
+    """Decorator that caches a function's results in an LRUCache keyed by its
+    positional arguments, which must be hashable. The cache is available as
+    the wrapper's `cache` attribute."""
+    def decorator(function):
+        cache = LRUCache(capacity, ttl)
+
+        @wraps(function)
+        def wrapper(*args):
+            try:
+                return cache.get(args)
+            except KeyError:
+                result = function(*args)
+                cache.put(args, result)
+                return result
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
@@ -0,0 +1,120 @@
+#!python
+
+from lrucache import LRUCache, memoize
+import sys
+import unittest
+
+
+class FakeClock(object):
+    """Clock whose time only moves when advanced by a test."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class LRUCacheTest(unittest.TestCase):
+
+    def test_put_and_get(self):
+        cache = LRUCache(3)
+        cache.put('I', 1)
+        cache.put('V', 5)
+        assert cache.get('I') == 1
+        assert cache.get('V') == 5
+        assert len(cache) == 2
+        with self.assertRaises(KeyError):
+            cache.get('X')  # Key does not exist
+        cache.put('V', 4)  # Update value
+        assert cache.get('V') == 4
+        assert len(cache) == 2  # Check length is not overcounting
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.put('I', 1)
+        cache.put('V', 5)
+        cache.get('I')  # Now 'V' is least recently used
+        cache.put('X', 10)
+        assert 'V' not in cache
+        assert 'I' in cache and 'X' in cache
+        assert len(cache) == 2
+        assert cache.evict() == ('I', 1)
+        assert cache.evictions == 2
+
+    def test_ttl(self):
+        clock = FakeClock()
+        cache = LRUCache(2, ttl=10, clock=clock)
+        cache.put('I', 1)
+        clock.now = 5
+        assert cache.get('I') == 1
+        clock.now = 10
+        with self.assertRaises(KeyError):
+            cache.get('I')  # Entry has expired
+        assert len(cache) == 0
+        assert cache.expirations == 1
+
+    def test_stats(self):
+        cache = LRUCache(1)
+        cache.put('I', 1)
+        cache.get('I')
+        with self.assertRaises(KeyError):
+            cache.get('V')
+        cache.put('V', 5)
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['evictions'] == 1
+        assert stats['size'] == 1
+
+    def test_footprint(self):
+        cache = LRUCache(4)
+        empty = cache.footprint()
+        assert empty['keys'] == empty['values'] == 0
+        for i in range(4):
+            cache.put('key{}'.format(i), ['value'] * 10)
+        footprint = cache.footprint()
+        assert footprint['keys'] > 0
+        assert footprint['values'] > 0
+        assert footprint['nodes'] > empty['nodes']
+        assert footprint['total'] == sum(footprint[part] for part in
+                                         ('container', 'keys', 'values', 'nodes'))
+
+    def test_footprint_of_large_cache(self):
+        cache = LRUCache(4096)
+        for i in range(3000):
+            cache.put(i, 'value{}'.format(i))
+        footprint = cache.footprint()
+        # Each entry's list node and tuple are counted once, not once per
+        # entry that can reach it through the list's links
+        per_entry = footprint['nodes'] / 3000
+        assert per_entry < 1000
+        assert footprint['values'] >= 3000 * sys.getsizeof('value0')
+
+    def test_delete_and_clear(self):
+        cache = LRUCache(3)
+        cache.put('I', 1)
+        cache.put('V', 5)
+        cache.delete('I')
+        assert 'I' not in cache
+        with self.assertRaises(KeyError):
+            cache.delete('I')
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_memoize(self):
+        calls = []
+
+        @memoize(capacity=2)
+        def square(n):
+            calls.append(n)
+            return n * n
+
+        assert square(3) == 9
+        assert square(3) == 9
+        assert calls == [3]
+        assert square.cache.hits == 1
+
+
+if __name__ == '__main__':
+    unittest.main()
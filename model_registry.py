@@ -0,0 +1,201 @@
+"""Registry of corpus models served by one deployment, keyed by corpus name.
+
+Each corpus is a text file or histogram snapshot named <name>.txt or
+<name>.hist in the corpora directory. Its model is loaded the first time it is
+asked for, and only the most recently used models are kept while their total
+size fits the memory budget. A model's size is measured again whenever it has
+built a lazy structure (autocomplete index, constrained tables, more cached
+completions) since it was last measured, so those count against the budget too.
+"""
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+from corpus_model import CorpusModel
+
+# Corpus names are used in file names, so only allow plain names
+NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]*$")
+# File extensions tried, in order, for each corpus name
+EXTENSIONS = (".hist", ".txt")
+
+
+def model_size(model) -> int:
+    """
+    Return an estimate of the memory held by a model, in bytes.
+    """
+    return model.footprint()["total"]
+
+
+def model_revision(model) -> Hashable:
+    """
+    Return a value that changes whenever a model's size may have grown.
+    """
+    return model.revision()
+
+
+class _Load(object):
+    """A model load in progress, which concurrent callers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.model = None
+        self.error = None
+
+
+class ModelRegistry(object):
+    """
+    Corpus models by name, loaded lazily and evicted least recently used first
+    once their total size exceeds the memory budget.
+
+    Loading happens outside the registry lock, so requests for models that are
+    already loaded are never blocked by a slow load. Concurrent requests for a
+    model that is still loading wait for that one load instead of each
+    starting their own.
+    """
+
+    def __init__(self, corpora_dir: str, memory_budget: int,
+                 loader: Callable[[str], CorpusModel] = CorpusModel.from_file,
+                 sizer: Callable[[CorpusModel], int] = model_size,
+                 reviser: Callable[[CorpusModel], Hashable] = model_revision):
+        """
+        :param corpora_dir: Directory holding <name>.hist or <name>.txt corpus files.
+        :param memory_budget: Total size in bytes that loaded models may use. The
+            most recently used model is always kept, even if it alone is larger.
+        :param loader: Function building a model from a corpus file path.
+        :param sizer: Function estimating a model's size in bytes, called after
+            loading and again whenever the model's revision changes.
+        :param reviser: Function returning a value that changes whenever a model's size may have grown.
+        """
+        self.corpora_dir = corpora_dir
+        self.memory_budget = memory_budget
+        self.loader = loader
+        self.sizer = sizer
+        self.reviser = reviser
+        self.models = OrderedDict()  # Map of name to (model, size, revision), most recently used last
+        self.loading = {}  # Map of name to the _Load in progress
+        self.memory_used = 0
+        self.loads = 0
+        self.evictions = 0
+        self.remeasures = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        """Return True if the model for given corpus name is loaded."""
+        return name in self.models
+
+    def path(self, name: str) -> Optional[str]:
+        """
+        Return the path of the corpus file for given name, or None if there is
+        no such corpus. Raises ValueError if the name is not a plain name, so
+        names like "../app" cannot reach files outside the corpora directory.
+        """
+        if not NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid corpus name: {name!r}")
+        for extension in EXTENSIONS:
+            path = os.path.join(self.corpora_dir, name + extension)
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def names(self):
+        """Return a sorted list of the names of every available corpus."""
+        if not os.path.isdir(self.corpora_dir):
+            return []
+        names = set()
+        for filename in os.listdir(self.corpora_dir):
+            name, extension = os.path.splitext(filename)
+            if extension in EXTENSIONS and NAME_PATTERN.match(name):
+                names.add(name)
+        return sorted(names)
+
+    def get(self, name: str) -> CorpusModel:
+        """
+        Return the model for given corpus name, loading it if needed.
+        Raises KeyError if there is no such corpus, or ValueError for an invalid name.
+        """
+        with self._lock:
+            entry = self.models.get(name)
+            if entry is not None:
+                self.models.move_to_end(name)
+            else:
+                load = self.loading.get(name)
+                owner = load is None
+                if owner:
+                    load = self.loading[name] = _Load()
+        if entry is not None:
+            model, _, revision = entry
+            if self.reviser(model) != revision:
+                # The model built something lazily since it was last measured
+                self._remeasure(name, model)
+            return model
+        if not owner:
+            load.done.wait()
+            if load.error is not None:
+                raise load.error
+            return load.model
+
+        try:
+            path = self.path(name)
+            if path is None:
+                raise KeyError(f"Corpus not found: {name}")
+            model = self.loader(path)
+            revision = self.reviser(model)
+            size = self.sizer(model)
+        except BaseException as error:
+            load.error = error
+            with self._lock:
+                del self.loading[name]
+            load.done.set()
+            raise
+        load.model = model
+        with self._lock:
+            self.models[name] = (model, size, revision)
+            self.memory_used += size
+            self.loads += 1
+            self._evict_over_budget()
+            del self.loading[name]
+        load.done.set()
+        return model
+
+    def _remeasure(self, name: str, model: CorpusModel) -> None:
+        """Measure a loaded model's size again, outside the lock, and charge the
+        change to the budget if the model is still loaded."""
+        revision = self.reviser(model)
+        size = self.sizer(model)
+        with self._lock:
+            entry = self.models.get(name)
+            if entry is None or entry[0] is not model:
+                return  # Evicted or replaced while it was being measured
+            self.models[name] = (model, size, revision)
+            self.memory_used += size - entry[1]
+            self.remeasures += 1
+            self._evict_over_budget()
+
+    def _evict_over_budget(self):
+        """Evict least recently used models until the rest fit the budget,
+        always keeping the most recently used one. Call with the lock held."""
+        while self.memory_used > self.memory_budget and len(self.models) > 1:
+            _, (_, size, _) = self.models.popitem(last=False)
+            self.memory_used -= size
+            self.evictions += 1
+
+    def evict(self, name: str) -> None:
+        """Forget the loaded model for given corpus name, or raise KeyError if not loaded."""
+        with self._lock:
+            _, size, _ = self.models.pop(name)
+            self.memory_used -= size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """Return a dict of the loaded models, memory used and load and eviction counts."""
+        with self._lock:
+            return {
+                "loaded": list(self.models),
+                "memory_used": self.memory_used,
+                "memory_budget": self.memory_budget,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "remeasures": self.remeasures,
+            }
@@ -0,0 +1,136 @@
+#!python
+
+from model_registry import ModelRegistry
+from corpus_model import CorpusModel
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+
+class ModelRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.corpora_dir = tempfile.mkdtemp()
+        for name, text in [('one', 'one fish two fish'), ('red', 'red fish blue fish'),
+                           ('blue', 'blue fish blue sky')]:
+            with open(os.path.join(self.corpora_dir, name + '.txt'), 'w') as file:
+                file.write(text)
+        self.loaded = []
+
+    def tearDown(self):
+        shutil.rmtree(self.corpora_dir)
+
+    def loader(self, path):
+        self.loaded.append(os.path.basename(path))
+        return CorpusModel.from_file(path)
+
+    def test_loads_lazily_once(self):
+        registry = ModelRegistry(self.corpora_dir, 10 ** 9, loader=self.loader)
+        assert registry.names() == ['blue', 'one', 'red']
+        assert self.loaded == []
+        model = registry.get('red')
+        assert model.tokens == 4
+        assert registry.get('red') is model
+        assert self.loaded == ['red.txt']
+
+    def test_unknown_and_invalid_names(self):
+        registry = ModelRegistry(self.corpora_dir, 10 ** 9)
+        with self.assertRaises(KeyError):
+            registry.get('green')
+        for name in ['../one', 'one.txt', '', '.hidden']:
+            with self.assertRaises(ValueError):
+                registry.get(name)
+        assert registry.stats()['loaded'] == []
+
+    def test_evicts_least_recently_used_over_budget(self):
+        # Every model counts as 100 bytes, so a 250 byte budget holds two
+        registry = ModelRegistry(self.corpora_dir, 250, sizer=lambda model: 100)
+        registry.get('one')
+        registry.get('red')
+        registry.get('one')  # Now 'red' is least recently used
+        registry.get('blue')
+        assert 'red' not in registry
+        assert 'one' in registry and 'blue' in registry
+        stats = registry.stats()
+        assert stats['memory_used'] == 200
+        assert stats['evictions'] == 1
+
+    def test_charges_lazily_built_structures(self):
+        registry = ModelRegistry(self.corpora_dir, 10 ** 9)
+        model = registry.get('one')
+        loaded_size = registry.stats()['memory_used']
+        model.complete('f')  # Builds the autocomplete index and caches a completion
+        model.constrained.sample(first_letter='f')
+        assert registry.get('one') is model
+        stats = registry.stats()
+        assert stats['memory_used'] > loaded_size
+        assert stats['memory_used'] == model.footprint()['total']
+        assert stats['remeasures'] == 1
+        registry.get('one')  # Nothing new was built, so no need to measure again
+        assert registry.stats()['remeasures'] == 1
+
+    def test_measures_many_cached_completions(self):
+        registry = ModelRegistry(self.corpora_dir, 10 ** 9)
+        model = registry.get('one')
+        for k in range(1, 1101):
+            model.complete('', k)
+        assert registry.get('one') is model
+        assert registry.stats()['memory_used'] == model.footprint()['total']
+
+    def test_evicts_when_lazy_structures_grow_over_budget(self):
+        # Models count as 100 bytes, or 200 once their autocomplete index is built
+        registry = ModelRegistry(self.corpora_dir, 250,
+                                 sizer=lambda model: 200 if model._autocomplete is not None else 100)
+        registry.get('one')
+        registry.get('red').complete('r')
+        assert 'one' in registry
+        registry.get('red')
+        assert 'one' not in registry and 'red' in registry
+        assert registry.stats()['memory_used'] == 200
+
+    def test_keeps_most_recent_model_over_budget(self):
+        registry = ModelRegistry(self.corpora_dir, 0)
+        model = registry.get('one')
+        assert 'one' in registry
+        registry.get('red')
+        assert 'one' not in registry and 'red' in registry
+        assert model.sentence(3)  # Evicted models still work for requests using them
+
+    def test_concurrent_requests_share_one_load(self):
+        def slow_loader(path):
+            time.sleep(0.05)
+            return self.loader(path)
+
+        registry = ModelRegistry(self.corpora_dir, 10 ** 9, loader=slow_loader)
+        models = []
+        threads = [threading.Thread(target=lambda: models.append(registry.get('blue')))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert self.loaded == ['blue.txt']
+        assert len(models) == 8
+        assert all(model is models[0] for model in models)
+
+    def test_failed_load_is_retried(self):
+        calls = []
+
+        def failing_loader(path):
+            calls.append(path)
+            if len(calls) == 1:
+                raise IOError('disk error')
+            return CorpusModel.from_file(path)
+
+        registry = ModelRegistry(self.corpora_dir, 10 ** 9, loader=failing_loader)
+        with self.assertRaises(IOError):
+            registry.get('one')
+        assert registry.get('one').types == 3
+        assert len(calls) == 2
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+"""Hot reload of the served corpus model.
+
+The corpus file is polled for changes to its modification time and size (or
+reloaded on demand, such as on SIGHUP), and the new model is built on a
+background thread while requests keep using the old one. The new model is
+swapped in with a single reference assignment, so each request sees either the
+old model or the new one, never one that is half built.
+
+To update a corpus, write the new file next to the old one and rename it into
+place, so a reload never reads a partly written file.
+"""
+import os
+import signal
+import threading
+import time
+from typing import Callable, Iterable, Optional, Tuple
+
+from corpus_model import CorpusModel
+
+
+class ModelReloader(object):
+    """
+    Holds the current model for the first existing file of a list of
+    candidate paths, and rebuilds it when that file changes or another
+    candidate appears ahead of it, like a snapshot replacing a text corpus.
+    """
+
+    def __init__(self, paths: Iterable[str], loader: Callable[[str], CorpusModel] = CorpusModel.from_file,
+                 interval: float = 5.0):
+        """
+        Load the model from the first existing path right away.
+        :param paths: Candidate corpus paths in order of preference.
+        :param loader: Function building a model from a corpus file path.
+        :param interval: Seconds between checks for changes once started, or 0 to
+            rebuild only when asked to, such as on SIGHUP.
+        """
+        self.paths = list(paths)
+        self.loader = loader
+        self.interval = interval
+        self.model: Optional[CorpusModel] = None
+        self.signature = None  # (path, mtime in ns, size) of the file the model was built from
+        self.rebuild_seconds: Optional[float] = None  # Duration of the last successful build
+        self.last_swap: Optional[float] = None  # Wall clock time the current model was swapped in
+        self.swaps = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self._reload_lock = threading.Lock()  # Only one rebuild at a time
+        self._wake = threading.Event()
+        self._forced = False
+        self._stop = threading.Event()
+        self._thread = None
+        if not self.reload():
+            raise FileNotFoundError(f"No corpus found at any of: {', '.join(self.paths)}")
+
+    def _source(self) -> Optional[Tuple[str, int, int]]:
+        """Return (path, mtime in ns, size) of the first existing candidate, or None."""
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            return (path, stat.st_mtime_ns, stat.st_size)
+        return None
+
+    def changed(self) -> bool:
+        """Return True if the corpus file differs from the one the model was built from."""
+        source = self._source()
+        return source is not None and source != self.signature
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Rebuild the model if the corpus file changed (or always if force) and
+        swap it in. Runs in the calling thread and returns True if a new model
+        was swapped in. A failed build keeps the old model and is counted in
+        failures, but is raised if there is no model yet.
+        """
+        with self._reload_lock:
+            source = self._source()
+            if source is None or (source == self.signature and not force):
+                return False
+            start = time.perf_counter()
+            try:
+                model = self.loader(source[0])
+            except Exception as error:
+                self.failures += 1
+                self.last_error = repr(error)
+                if self.model is None:
+                    raise
+                return False
+            duration = time.perf_counter() - start
+            if self._source() != source:
+                # The file changed while it was read; build again on the next check
+                return False
+            self.model = model  # Single reference assignment: the atomic swap
+            self.signature = source
+            self.rebuild_seconds = duration
+            self.last_swap = time.time()
+            self.swaps += 1
+            return True
+
+    def request_reload(self) -> None:
+        """Ask the background thread to rebuild the model now, even if the file looks unchanged."""
+        self._forced = True
+        self._wake.set()
+
+    def _poll(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval if self.interval > 0 else None)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            force, self._forced = self._forced, False
+            try:
+                self.reload(force)
+            except Exception:
+                pass  # Already counted in failures; keep polling
+
+    def start(self) -> None:
+        """Start checking for changes every interval seconds on a daemon thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._poll, name="model-reloader", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread, waiting for any rebuild in progress."""
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+
+    def install_signal_handler(self, signum: int = getattr(signal, "SIGHUP", None)) -> bool:
+        """
+        Rebuild the model when the process receives signum (SIGHUP by default).
+        Returns False where signal handlers cannot be installed: off the main
+        thread or on platforms without the signal.
+        """
+        if signum is None or threading.current_thread() is not threading.main_thread():
+            return False
+        signal.signal(signum, lambda received, frame: self.request_reload())
+        self.start()
+        return True
+
+    def status(self) -> dict:
+        """Return a dict describing the current model and reload history."""
+        model = self.model
+        return {
+            "source": model.source,
+            "tokens": model.tokens,
+            "types": model.types,
+            "rebuild_seconds": self.rebuild_seconds,
+            "last_swap": self.last_swap,
+            "swaps": self.swaps,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,100 @@
+#!python
+
+from model_reloader import ModelReloader
+from corpus_model import CorpusModel
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+
+class ModelReloaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.text_path = os.path.join(self.data_dir, 'corpus.txt')
+        self.hist_path = os.path.join(self.data_dir, 'corpus.hist')
+        self.write(self.text_path, 'one fish two fish')
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def write(self, path, text):
+        """Write a file and rename it into place, as a corpus update should."""
+        with open(path + '.tmp', 'w') as file:
+            file.write(text)
+        os.replace(path + '.tmp', path)
+
+    def test_initial_load(self):
+        reloader = ModelReloader([self.hist_path, self.text_path])
+        assert reloader.model.tokens == 4
+        assert reloader.swaps == 1
+        assert reloader.rebuild_seconds is not None
+        assert not reloader.changed()
+        with self.assertRaises(FileNotFoundError):
+            ModelReloader([os.path.join(self.data_dir, 'missing.txt')])
+
+    def test_reload_when_file_changes(self):
+        reloader = ModelReloader([self.text_path])
+        old_model = reloader.model
+        assert reloader.reload() is False  # Nothing changed
+        self.write(self.text_path, 'red fish blue fish green fish')
+        os.utime(self.text_path, ns=(0, 10 ** 9))  # Make sure the mtime differs
+        assert reloader.changed()
+        assert reloader.reload() is True
+        assert reloader.model is not old_model
+        assert reloader.model.tokens == 6
+        assert old_model.tokens == 4  # Requests holding the old model are unaffected
+        assert reloader.swaps == 2
+
+    def test_snapshot_takes_precedence(self):
+        reloader = ModelReloader([self.hist_path, self.text_path])
+        from histogram_io import save_histogram
+        save_histogram(self.hist_path + '.tmp', [('snapshot', 3)])
+        os.replace(self.hist_path + '.tmp', self.hist_path)
+        assert reloader.reload() is True
+        assert reloader.model.source == self.hist_path
+        assert reloader.model.histogram == [('snapshot', 3)]
+
+    def test_failed_rebuild_keeps_old_model(self):
+        calls = []
+
+        def loader(path):
+            calls.append(path)
+            if len(calls) > 1:
+                raise ValueError('bad corpus')
+            return CorpusModel.from_file(path)
+
+        reloader = ModelReloader([self.text_path], loader=loader)
+        model = reloader.model
+        assert reloader.reload(force=True) is False
+        assert reloader.model is model
+        assert reloader.failures == 1
+        assert 'bad corpus' in reloader.status()['last_error']
+
+    def test_background_reload_on_request(self):
+        swapped = threading.Event()
+
+        def loader(path):
+            model = CorpusModel.from_file(path)
+            swapped.set()
+            return model
+
+        reloader = ModelReloader([self.text_path], loader=loader, interval=60)
+        swapped.clear()
+        reloader.start()
+        try:
+            reloader.request_reload()
+            assert swapped.wait(5)
+            deadline = time.time() + 5
+            while reloader.swaps < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            assert reloader.swaps == 2
+        finally:
+            reloader.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+#!python
+
+from __future__ import division, print_function  # Python 2 and 3 compatibility
+import random
+from array import array
+from bisect import bisect, bisect_left
+from itertools import accumulate
+
+
+class Vocabulary(object):
+    """Vocabulary assigns each distinct word a small integer id, so n-grams
+    can be stored as compact arrays of ids instead of tuples of strings."""
+
+    def __init__(self, words=None):
+        """Initialize this vocabulary and add given words, if any."""
+        self.ids = {}  # Map of word to its id
+        self.words = []  # List of words, indexed by id
+        if words is not None:
+            for word in words:
+                self.add(word)
+
+    def __len__(self):
+        """Return the number of distinct words in this vocabulary."""
+        return len(self.words)
+
+    def __contains__(self, word):
+        """Return boolean indicating if given word is in this vocabulary."""
+        return word in self.ids
+
+    def add(self, word):
+        """Return the id of given word, assigning it a new id if needed."""
+        word_id = self.ids.get(word)
+        if word_id is None:
+            word_id = len(self.words)
+            self.ids[word] = word_id
+            self.words.append(word)
+        return word_id
+
+    def id_of(self, word):
+        """Return the id of given word, or None if it is not in this vocabulary."""
+        return self.ids.get(word)
+
+    def word(self, word_id):
+        """Return the word with given id."""
+        return self.words[word_id]
+
+
+class NgramNode(object):
+    """Node in an n-gram trie. Its children are stored in parallel arrays
+    sorted by word id: the ids, how often each one followed this node's
+    prefix, and each child's own node (None until it has children)."""
+
+    __slots__ = ('ids', 'counts', 'children')
+
+    def __init__(self):
+        """Initialize this node with no children."""
+        self.ids = array('I')
+        self.counts = array('I')
+        self.children = []
+
+    def index(self, word_id):
+        """Return the index of given word id among this node's children, or
+        None if not found. Running time: O(log f) for f children."""
+        i = bisect_left(self.ids, word_id)
+        if i < len(self.ids) and self.ids[i] == word_id:
+            return i
+        return None
+
+    def add(self, word_id, count=1):
+        """Increase the count of given child word id, adding it in sorted
+        position if needed, and return its index."""
+        i = bisect_left(self.ids, word_id)
+        if i == len(self.ids) or self.ids[i] != word_id:
+            self.ids.insert(i, word_id)
+            self.counts.insert(i, 0)
+            self.children.insert(i, None)
+        self.counts[i] += count
+        return i
+
+
+class NgramStore(object):
+    """NgramStore counts which words follow each context of up to `order`
+    words, for a Markov chain of that order with backoff to lower orders.
+
+    N-grams are stored in a prefix trie keyed by word ids, so contexts that
+    share a prefix share its nodes. Every window of up to order + 1 words is
+    inserted, so the counts at depth d are the counts of all d-grams and
+    lower-order contexts are always available for backoff."""
+
+    def __init__(self, order=2, words=None):
+        """Initialize this store for contexts of up to order words and add the
+        given sequence of words, if any."""
+        if order < 1:
+            raise ValueError('Order must be positive: {}'.format(order))
+        self.order = order
+        self.vocabulary = Vocabulary()
+        self.root = NgramNode()  # Children of the root count unigrams
+        self.tokens = 0  # Total count of all word tokens added
+        if words is not None:
+            self.add_words(words)
+
+    def add_words(self, words):
+        """Count every n-gram of up to order + 1 words in given word sequence.
+        Running time: O(t * n) for t tokens and n = order + 1, plus the cost
+        of inserting new ids in sorted order the first time they are seen."""
+        ids = [self.vocabulary.add(word) for word in words]
+        self.tokens += len(ids)
+        size = self.order + 1
+        for start in range(len(ids)):
+            self._insert(ids[start:start + size])
+
+    def _insert(self, ids):
+        """Increase the count of the given n-gram of ids and all its prefixes."""
+        node = self.root
+        last = len(ids) - 1
+        for depth, word_id in enumerate(ids):
+            i = node.add(word_id)
+            if depth < last:
+                child = node.children[i]
+                if child is None:
+                    child = node.children[i] = NgramNode()
+                node = child
+
+    def _ids(self, words):
+        """Return the list of ids of given words, or None if any is unknown."""
+        ids = []
+        for word in words:
+            word_id = self.vocabulary.id_of(word)
+            if word_id is None:
+                return None
+            ids.append(word_id)
+        return ids
+
+    def _find(self, ids):
+        """Return the trie node reached by following given ids from the root,
+        or None if that context was never seen."""
+        node = self.root
+        for word_id in ids:
+            i = node.index(word_id)
+            if i is None or node.children[i] is None:
+                return None
+            node = node.children[i]
+        return node
+
+    def count(self, ngram):
+        """Return how many times the given sequence of words was seen."""
+        ids = self._ids(ngram)
+        if ids is None:
+            return 0
+        if not ids:
+            return self.tokens
+        node = self._find(ids[:-1])
+        if node is None:
+            return 0
+        i = node.index(ids[-1])
+        return 0 if i is None else node.counts[i]
+
+    def _context_node(self, context, backoff=True):
+        """Return (node, context length used) for the longest suffix of given
+        context (at most order words) that has been followed by a word, or
+        (None, 0) if none has and backoff is off or the store is empty."""
+        context = list(context)[-self.order:]
+        while True:
+            ids = self._ids(context)
+            node = None if ids is None else self._find(ids)
+            if node is not None and len(node.ids) > 0:
+                return node, len(context)
+            if not backoff or not context:
+                return None, 0
+            context = context[1:]  # Back off to a shorter context
+
+    def next_counts(self, context, backoff=True):
+        """Return a list of (word, count) entries for the words seen after the
+        given context, backing off to shorter contexts if it was never seen.
+        Running time: O(n log f) to find the context for n words and fanout f."""
+        node, _ = self._context_node(context, backoff)
+        if node is None:
+            return []
+        words = self.vocabulary.words
+        return [(words[word_id], count) for word_id, count in zip(node.ids, node.counts)]
+
+    def sample_next(self, context, rng=None):
+        """Return a word randomly sampled from the words seen after the given
+        context, weighted by count, or None if the store is empty."""
+        node, _ = self._context_node(context)
+        if node is None:
+            return None
+        cumulative = list(accumulate(node.counts))
+        dart = (rng or random).random() * cumulative[-1]
+        return self.vocabulary.word(node.ids[bisect(cumulative, dart)])
+
+    def generate(self, num_words, start=(), rng=None):
+        """Return a list of num_words words generated by walking the chain,
+        starting from the given context words."""
+        words = list(start)
+        generated = []
+        for _ in range(num_words):
+            word = self.sample_next(words[-self.order:], rng)
+            if word is None:
+                break
+            words.append(word)
+            generated.append(word)
+        return generated
+
+
+def main():
+    import sys
+    arguments = sys.argv[1:]  # Exclude script name in first argument
+    if len(arguments) < 1:
+        print('Usage: python ngram_store.py <file_path> [order] [num_words]')
+        sys.exit(1)
+    order = int(arguments[1]) if len(arguments) > 1 else 2
+    num_words = int(arguments[2]) if len(arguments) > 2 else 20
+    with open(arguments[0], 'r', encoding='utf-8') as file:
+        store = NgramStore(order, file.read().lower().split())
+    print(' '.join(store.generate(num_words)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!python
+
+from ngram_store import NgramStore, Vocabulary
+import random
+import unittest
+
+
+class VocabularyTest(unittest.TestCase):
+
+    def test_ids(self):
+        vocabulary = Vocabulary(['one', 'fish', 'two', 'fish'])
+        assert len(vocabulary) == 3
+        assert vocabulary.id_of('one') == 0
+        assert vocabulary.id_of('fish') == 1
+        assert vocabulary.id_of('red') is None
+        assert vocabulary.word(2) == 'two'
+        assert 'fish' in vocabulary
+
+
+class NgramStoreTest(unittest.TestCase):
+
+    fish_words = 'one fish two fish red fish blue fish'.split()
+
+    def test_counts(self):
+        store = NgramStore(2, self.fish_words)
+        assert store.tokens == 8
+        assert store.count(['fish']) == 4
+        assert store.count(['fish', 'two']) == 1
+        assert store.count(['one', 'fish', 'two']) == 1
+        assert store.count(['fish', 'fish']) == 0
+        assert store.count(['food']) == 0
+
+    def test_children_sorted_by_id(self):
+        store = NgramStore(1, self.fish_words)
+        fish = store._find([store.vocabulary.id_of('fish')])
+        assert list(fish.ids) == sorted(fish.ids)
+        assert len(fish.ids) == len(fish.counts) == len(fish.children)
+
+    def test_next_counts(self):
+        store = NgramStore(2, self.fish_words)
+        self.assertCountEqual(store.next_counts(['fish']),
+                              [('two', 1), ('red', 1), ('blue', 1)])
+        assert store.next_counts(['one', 'fish']) == [('two', 1)]
+        # Only the last order words of a longer context should be used
+        assert store.next_counts(['blue', 'one', 'fish']) == [('two', 1)]
+
+    def test_backoff(self):
+        store = NgramStore(2, self.fish_words)
+        # Context never followed by a word backs off to its last word
+        self.assertCountEqual(store.next_counts(['blue', 'fish']),
+                              [('two', 1), ('red', 1), ('blue', 1)])
+        assert store.next_counts(['blue', 'fish'], backoff=False) == []
+        self.assertCountEqual(store.next_counts(['two', 'fish', 'fish']),
+                              [('two', 1), ('red', 1), ('blue', 1)])
+        # Unknown words back off all the way to unigram counts
+        unigrams = store.next_counts(['food'])
+        self.assertCountEqual(unigrams, [('one', 1), ('fish', 4), ('two', 1), ('red', 1), ('blue', 1)])
+        assert store.next_counts(['food'], backoff=False) == []
+
+    def test_sample_and_generate(self):
+        store = NgramStore(2, self.fish_words)
+        assert store.sample_next(['one', 'fish'], random.Random(1)) == 'two'
+        words = store.generate(10, start=['one'], rng=random.Random(1))
+        assert len(words) == 10
+        assert words[0] == 'fish'
+        assert store.generate(5, rng=random.Random(2)) == store.generate(5, rng=random.Random(2))
+        assert NgramStore(2).sample_next(['fish']) is None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+#!python
+
+from profiling import ProfilerMiddleware, Spans, pop_profile_argument, profiled
+import os
+import pstats
+import shutil
+import cProfile
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+
+def busy(seconds):
+    """Keep the CPU busy for the given number of seconds."""
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += 1
+    return total
+
+
+def hello_app(environ, start_response):
+    busy(0.02)
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [b'hello']
+
+
+class ProfilingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_spans(self):
+        timings = Spans()
+        with timings.span('tokenize'):
+            busy(0.01)
+        for _ in range(3):
+            with timings.span('sample'):
+                pass
+        assert list(timings.totals) == ['tokenize', 'sample']
+        assert timings.totals['tokenize'] >= 0.01
+        assert timings.calls == {'tokenize': 1, 'sample': 3}
+        report = timings.report()
+        assert report.startswith('Timings: tokenize ')
+        assert 'sample' in report and '(3 calls)' in report
+
+    def test_pop_profile_argument(self):
+        assert pop_profile_argument(['a.txt', '--profile', 'p.pstats', 'b']) == ('p.pstats', ['a.txt', 'b'])
+        assert pop_profile_argument(['--profile=p.folded', 'a.txt']) == ('p.folded', ['a.txt'])
+        assert pop_profile_argument(['a.txt']) == (None, ['a.txt'])
+        with self.assertRaises(SystemExit):
+            pop_profile_argument(['a.txt', '--profile'])
+
+    def test_cprofile_output(self):
+        path = os.path.join(self.temp_dir, 'run.pstats')
+        with profiled(path):
+            busy(0.01)
+        stats = pstats.Stats(path)
+        assert any(function == 'busy' for _, _, function in stats.stats)
+
+    def test_collapsed_output(self):
+        path = os.path.join(self.temp_dir, 'run.folded')
+        with profiled(path):
+            busy(0.1)
+        with open(path) as file:
+            lines = file.read().splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(' ', 1)
+        assert int(count) > 0
+        assert 'busy (profiling_test.py' in stack.split(';')[-1]
+
+    def test_no_profile(self):
+        with profiled(None):
+            busy(0.001)
+        assert os.listdir(self.temp_dir) == []
+
+    def test_middleware(self):
+        app = ProfilerMiddleware(hello_app, self.temp_dir)
+        responses = []
+
+        def start_response(status, headers, exc_info=None):
+            responses.append((status, dict(headers)))
+
+        # Requests without the header are not profiled
+        assert app({'PATH_INFO': '/'}, start_response) == [b'hello']
+        assert 'X-Profile-File' not in responses[-1][1]
+        assert os.listdir(self.temp_dir) == []
+        assert app({'PATH_INFO': '/word', 'HTTP_X_PROFILE': '1'}, start_response) == [b'hello']
+        pstats_file = responses[-1][1]['X-Profile-File']
+        assert pstats_file.endswith('-word.pstats')
+        assert app({'PATH_INFO': '/', 'HTTP_X_PROFILE': 'collapsed'}, start_response) == [b'hello']
+        folded_file = responses[-1][1]['X-Profile-File']
+        assert folded_file.endswith('-root.folded')
+        assert sorted(os.listdir(self.temp_dir)) == sorted([pstats_file, folded_file])
+
+
+    def test_concurrent_requests(self):
+        app = ProfilerMiddleware(hello_app, self.temp_dir)
+        active = []
+        most_active = []
+        lock = threading.Lock()
+
+        class TrackingProfile(cProfile.Profile):
+            def enable(self):
+                with lock:
+                    active.append(self)
+                    most_active.append(len(active))
+                super(TrackingProfile, self).enable()
+
+            def disable(self):
+                super(TrackingProfile, self).disable()
+                with lock:
+                    if self in active:  # dump_stats disables the profiler again
+                        active.remove(self)
+
+        files = []
+
+        def send():
+            def start_response(status, headers, exc_info=None):
+                files.append(dict(headers)['X-Profile-File'])
+            assert app({'PATH_INFO': '/', 'HTTP_X_PROFILE': '1'}, start_response) == [b'hello']
+
+        with mock.patch('cProfile.Profile', TrackingProfile):
+            threads = [threading.Thread(target=send) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        # Profiled requests took turns, and each wrote a readable profile
+        assert max(most_active) == 1
+        assert sorted(files) == sorted(os.listdir(self.temp_dir))
+        assert len(files) == 4
+        for name in files:
+            stats = pstats.Stats(os.path.join(self.temp_dir, name))
+            assert any(function[2] == 'hello_app' for function in stats.stats)
+
+
+if __name__ == '__main__':
+    unittest.main()
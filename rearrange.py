@@ -1,19 +1,163 @@
+import os
 import sys
 import random
+import argparse
+import tempfile
 
+# Number of temporary bucket files input is scattered across in one pass
+NUM_BUCKETS = 64
+# Largest bucket file that is shuffled in memory instead of split again
+MAX_BUCKET_BYTES = 64 * 1024 * 1024
+# Bytes of input read at a time when shuffling words
+CHUNK_SIZE = 1024 * 1024
 
-def rearrange_words():
+
+def rearrange_words(words=None, seed=None, rng=None):
     # Extract words from command-line arguments (excluding the script name)
-    words = sys.argv[1:]
+    if words is None:
+        words = sys.argv[1:]
     # Check if any words are provided
     if not words:
         print("Usage: python3 rearrange.py <word1> <word2> ... <wordN>")
         return None
     # Shuffle the list of words
-    random.shuffle(words)
+    (rng or random.Random(seed)).shuffle(words)
     # Join and print the rearranged words
     print(" ".join(words))
 
 
+def _iter_words(input_file, chunk_size=CHUNK_SIZE):
+    """
+    Generate the whitespace-separated words of a binary stream, reading it in
+    chunks of chunk_size bytes so input without newlines is never read whole.
+    A word cut off at the end of a chunk is carried over to the next one.
+    """
+    tail = b""
+    while True:
+        chunk = input_file.read(chunk_size)
+        if not chunk:
+            break
+        block = tail + chunk
+        words = block.split()
+        # Keep a word that may continue in the next chunk
+        tail = words.pop() if words and not block[-1:].isspace() else b""
+        yield from words
+    if tail:
+        yield tail
+
+
+def _scatter(items, bucket_dir, rng, num_buckets):
+    """
+    Write each item to one of num_buckets temporary files chosen uniformly at random.
+    :return: List of (bucket path, number of items) tuples, in bucket order.
+    """
+    paths = [os.path.join(bucket_dir, f"bucket{i}") for i in range(num_buckets)]
+    counts = [0] * num_buckets
+    files = [open(path, "wb") for path in paths]
+    try:
+        for item in items:
+            index = rng.randrange(num_buckets)
+            files[index].write(item + b"\n")
+            counts[index] += 1
+    finally:
+        for file in files:
+            file.close()
+    return list(zip(paths, counts))
+
+
+def _shuffle_items(items, write, rng, num_buckets, max_bucket_bytes, temp_dir):
+    """
+    Write items in uniformly random order, shuffling buckets that fit in memory
+    and splitting larger buckets again with the same procedure.
+    """
+    with tempfile.TemporaryDirectory(dir=temp_dir) as bucket_dir:
+        for path, count in _scatter(items, bucket_dir, rng, num_buckets):
+            if count == 0:
+                continue
+            if count > 1 and os.path.getsize(path) > max_bucket_bytes:
+                with open(path, "rb") as bucket:
+                    _shuffle_items((line[:-1] for line in bucket), write, rng,
+                                   num_buckets, max_bucket_bytes, bucket_dir)
+            else:
+                with open(path, "rb") as bucket:
+                    bucket_items = bucket.read().split(b"\n")[:-1]
+                rng.shuffle(bucket_items)
+                write(bucket_items)
+            os.remove(path)
+
+
+def external_shuffle(input_file, output_file, seed=None, words=False,
+                     num_buckets=NUM_BUCKETS, max_bucket_bytes=MAX_BUCKET_BYTES, temp_dir=None, rng=None,
+                     chunk_size=CHUNK_SIZE):
+    """
+    Randomly reorder the lines (or words) of a binary input stream that may be
+    much larger than memory, and write them to a binary output stream.
+    Every item is scattered to a random temporary bucket file, then each bucket
+    is shuffled in memory and appended to the output. Since every item picks its
+    bucket independently and each bucket is uniformly shuffled, the result is a
+    uniform random permutation, using only sequential reads and writes.
+    :param input_file: Binary file object to read lines from.
+    :param output_file: Binary file object to write shuffled items to.
+    :param seed: Optional seed so the same input always gives the same output.
+    :param words: Shuffle whitespace-separated words instead of whole lines,
+        writing them on one line separated by spaces.
+    :param max_bucket_bytes: Largest bucket shuffled in memory, which bounds memory use.
+    :param rng: Optional random.Random instance to use instead of one seeded with seed.
+    :param chunk_size: Bytes read at a time when shuffling words.
+    """
+    rng = rng or random.Random(seed)
+    if words:
+        items = _iter_words(input_file, chunk_size)
+        separator = b" "
+    else:
+        items = (line.rstrip(b"\r\n") for line in input_file)
+        separator = b"\n"
+    started = []
+
+    def write(bucket_items):
+        if not bucket_items:
+            return
+        if started:
+            output_file.write(separator)
+        output_file.write(separator.join(bucket_items))
+        started.append(True)
+
+    _shuffle_items(items, write, rng, num_buckets, max_bucket_bytes, temp_dir)
+    if started:
+        output_file.write(b"\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Randomly rearrange words or the lines of a file.")
+    parser.add_argument("words", nargs="*", help="Words to rearrange.")
+    parser.add_argument("-f", "--file", help="Shuffle the lines of this file ('-' for stdin) "
+                                             "without loading it into memory.")
+    parser.add_argument("-o", "--output", help="Write shuffled output to this file instead of stdout.")
+    parser.add_argument("--words", dest="split_words", action="store_true",
+                        help="With --file, shuffle individual words instead of lines.")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible output.")
+    parser.add_argument("--max-memory", type=int, default=MAX_BUCKET_BYTES // (1024 * 1024),
+                        help="Largest bucket (in MB) to shuffle in memory.")
+    args = parser.parse_args(argv)
+    if args.max_memory < 1:
+        parser.error("--max-memory must be at least 1 MB")
+
+    if args.file is None:
+        return rearrange_words(args.words, args.seed)
+
+    input_file = sys.stdin.buffer if args.file == "-" else open(args.file, "rb")
+    output_file = sys.stdout.buffer if args.output is None else open(args.output, "wb")
+    try:
+        external_shuffle(input_file, output_file, seed=args.seed, words=args.split_words,
+                         max_bucket_bytes=args.max_memory * 1024 * 1024)
+    finally:
+        if input_file is not sys.stdin.buffer:
+            input_file.close()
+        if output_file is not sys.stdout.buffer:
+            output_file.close()
+        else:
+            output_file.flush()
+
+
 if __name__ == "__main__":
-    rearrange_words()
\ No newline at end of file
+    main()
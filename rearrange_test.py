@@ -0,0 +1,101 @@
+#!python
+
+from rearrange import external_shuffle, main
+import rearrange
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+
+def shuffle_bytes(data, **kwargs):
+    """Shuffle the given input bytes and return the output bytes."""
+    output = io.BytesIO()
+    external_shuffle(io.BytesIO(data), output, **kwargs)
+    return output.getvalue()
+
+
+class ExternalShuffleTest(unittest.TestCase):
+
+    lines = [b'line %d' % i for i in range(200)]
+
+    def test_permutation(self):
+        output = shuffle_bytes(b'\n'.join(self.lines) + b'\n', seed=1)
+        shuffled = output.split(b'\n')[:-1]
+        assert output.endswith(b'\n')
+        assert sorted(shuffled) == sorted(self.lines)
+        assert shuffled != self.lines
+
+    def test_seed_is_reproducible(self):
+        data = b'\n'.join(self.lines) + b'\n'
+        assert shuffle_bytes(data, seed=7) == shuffle_bytes(data, seed=7)
+        assert shuffle_bytes(data, seed=7) != shuffle_bytes(data, seed=8)
+
+    def test_words(self):
+        data = b'one fish two fish\nred fish\n\nblue  fish\n'
+        output = shuffle_bytes(data, seed=3, words=True)
+        assert output.endswith(b'\n') and output.count(b'\n') == 1
+        assert sorted(output.split()) == sorted(data.split())
+
+    def test_words_without_newlines_read_in_chunks(self):
+        words = [b'word%d' % i for i in range(20000)]
+        data = b' '.join(words)
+        input_file = io.BytesIO(data)
+        reads = []
+        read = input_file.read
+
+        def chunked_read(size=-1):
+            reads.append(size)
+            return read(size)
+
+        input_file.read = chunked_read
+        output = io.BytesIO()
+        external_shuffle(input_file, output, seed=4, words=True, chunk_size=1000)
+        # Words cut at chunk boundaries should be joined back together
+        assert sorted(output.getvalue().split()) == sorted(words)
+        assert all(size == 1000 for size in reads)
+        assert len(reads) > len(data) // 1000
+
+    def test_empty_lines_kept(self):
+        data = b'a\n\nb\n\n\nc\n'
+        output = shuffle_bytes(data, seed=2)
+        assert sorted(output.split(b'\n')[:-1]) == sorted(data.split(b'\n')[:-1])
+        assert output.count(b'\n') == data.count(b'\n')
+
+    def test_empty_input(self):
+        assert shuffle_bytes(b'', seed=1) == b''
+
+    def test_recursive_split(self):
+        data = b'\n'.join(self.lines) + b'\n'
+        with mock.patch('rearrange._shuffle_items', wraps=rearrange._shuffle_items) as shuffle_items:
+            output = shuffle_bytes(data, seed=5, num_buckets=4, max_bucket_bytes=64)
+        # Buckets over 64 bytes should have been split again, recursively
+        assert shuffle_items.call_count > 4
+        assert sorted(output.split(b'\n')[:-1]) == sorted(self.lines)
+        # Output should still be reproducible for a seed
+        assert output == shuffle_bytes(data, seed=5, num_buckets=4, max_bucket_bytes=64)
+
+    def test_main_file(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            input_path = os.path.join(temp_dir, 'input.txt')
+            output_path = os.path.join(temp_dir, 'output.txt')
+            with open(input_path, 'wb') as file:
+                file.write(b'\n'.join(self.lines) + b'\n')
+            main(['-f', input_path, '-o', output_path, '--seed', '4'])
+            with open(output_path, 'rb') as file:
+                first = file.read()
+            main(['-f', input_path, '-o', output_path, '--seed', '4'])
+            with open(output_path, 'rb') as file:
+                assert file.read() == first
+            assert sorted(first.split(b'\n')[:-1]) == sorted(self.lines)
+            with self.assertRaises(SystemExit), mock.patch('sys.stderr', io.StringIO()):
+                main(['-f', input_path, '--max-memory', '0'])
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
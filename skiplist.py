@@ -0,0 +1,198 @@
+#!python
+
+from __future__ import division, print_function  # Python 2 and 3 compatibility
+import random
+
+# Largest code point: prefix + MAX_CHAR sorts after every key starting with prefix
+MAX_CHAR = '\U0010ffff'
+# Most levels a node can have, enough for about 4 ** 16 keys
+MAX_LEVEL = 16
+# Chance that a node at one level also appears at the next level up
+PROMOTE_PROBABILITY = 0.25
+
+
+class SkipNode(object):
+    """Node whose next pointers reach ahead at several levels: forward[0] is
+    the next node, and each level above skips over more nodes."""
+
+    __slots__ = ('data', 'value', 'forward')  # No per-node attribute dict, to save memory
+
+    def __init__(self, data, value=None, level=1):
+        """Initialize this node with the given key (data), value and number
+        of levels, none of which link to another node yet."""
+        self.data = data
+        self.value = value
+        self.forward = [None] * level
+
+    def __repr__(self):
+        """Return a string representation of this node."""
+        return f'SkipNode({self.data!r}: {self.value!r})'
+
+
+class SkipList(object):
+    """SkipList is an ordered map of keys to values, kept sorted as it
+    changes. Each node is in the bottom linked list, and a random fraction of
+    nodes are also in sparser lists above it, so a search can skip most nodes.
+    Search, insert and delete take O(log n) expected time, and iterating over
+    a range of keys takes O(log n + m) for m keys in the range."""
+
+    def __init__(self, items=None, rng=None):
+        """Initialize this skip list and insert the given (key, value) items,
+        if any. Node levels are drawn from the given random.Random instance,
+        if any, instead of the random module's shared global generator."""
+        self.head = SkipNode(None, level=MAX_LEVEL)  # Sentinel before every key
+        self.level = 1  # Number of levels in use
+        self.size = 0
+        self.rng = rng or random
+        if items is not None:
+            for key, value in items:
+                self.set(key, value)
+
+    def __repr__(self):
+        """Return a string representation of this skip list."""
+        return 'SkipList({!r})'.format(self.items())
+
+    def __len__(self):
+        """Return the number of keys in this skip list."""
+        return self.size
+
+    def __iter__(self):
+        """Iterate over the keys in this skip list in sorted order."""
+        node = self.head.forward[0]
+        while node is not None:
+            yield node.data
+            node = node.forward[0]
+
+    def __contains__(self, key):
+        """Return True if this skip list contains the given key, or False."""
+        return self.contains(key)
+
+    def __getitem__(self, key):
+        return self.get(key)
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        self.delete(key)
+
+    def _random_level(self):
+        """Return a number of levels for a new node: 1, promoted to each next
+        level with probability PROMOTE_PROBABILITY, up to MAX_LEVEL."""
+        level = 1
+        while level < MAX_LEVEL and self.rng.random() < PROMOTE_PROBABILITY:
+            level += 1
+        return level
+
+    def _predecessors(self, key):
+        """Return a list of the last node before given key at each level.
+        Running time: O(log n) expected."""
+        update = [self.head] * MAX_LEVEL
+        node = self.head
+        for level in range(self.level - 1, -1, -1):
+            following = node.forward[level]
+            while following is not None and following.data < key:
+                node = following
+                following = node.forward[level]
+            update[level] = node
+        return update
+
+    def _find_node(self, key):
+        """Return the node with the given key, or None if not found."""
+        node = self.head
+        for level in range(self.level - 1, -1, -1):
+            following = node.forward[level]
+            while following is not None and following.data < key:
+                node = following
+                following = node.forward[level]
+        node = node.forward[0]
+        if node is not None and node.data == key:
+            return node
+        return None
+
+    def length(self):
+        """Return the number of keys in this skip list. Running time: O(1)."""
+        return self.size
+
+    def is_empty(self):
+        """Return a boolean indicating whether this skip list is empty."""
+        return self.size == 0
+
+    def contains(self, key):
+        """Return True if this skip list contains the given key, or False.
+        Running time: O(log n) expected."""
+        return self._find_node(key) is not None
+
+    def get(self, key):
+        """Return the value associated with the given key, or raise KeyError.
+        Running time: O(log n) expected."""
+        node = self._find_node(key)
+        if node is None:
+            raise KeyError('Key not found: {}'.format(key))
+        return node.value
+
+    def set(self, key, value=None):
+        """Insert the given key with its value in sorted position, or update
+        its value if already present. Running time: O(log n) expected."""
+        update = self._predecessors(key)
+        node = update[0].forward[0]
+        if node is not None and node.data == key:
+            node.value = value
+            return
+        level = self._random_level()
+        self.level = max(self.level, level)
+        node = SkipNode(key, value, level)
+        for i in range(level):
+            node.forward[i] = update[i].forward[i]
+            update[i].forward[i] = node
+        self.size += 1
+
+    def delete(self, key):
+        """Delete the given key from this skip list, or raise KeyError.
+        Running time: O(log n) expected."""
+        update = self._predecessors(key)
+        node = update[0].forward[0]
+        if node is None or node.data != key:
+            raise KeyError('Key not found: {}'.format(key))
+        for i in range(len(node.forward)):
+            update[i].forward[i] = node.forward[i]
+        while self.level > 1 and self.head.forward[self.level - 1] is None:
+            self.level -= 1
+        self.size -= 1
+
+    def items(self):
+        """Return a list of all (key, value) pairs in sorted key order.
+        Running time: O(n)."""
+        return list(self.range())
+
+    def range(self, start=None, stop=None):
+        """Generate (key, value) pairs for keys from start (inclusive) up to
+        stop (exclusive) in sorted order; None leaves that end open.
+        Running time: O(log n + m) expected for m keys in the range."""
+        if start is None:
+            node = self.head.forward[0]
+        else:
+            node = self._predecessors(start)[0].forward[0]
+        while node is not None and (stop is None or node.data < stop):
+            yield node.data, node.value
+            node = node.forward[0]
+
+    def prefix(self, prefix):
+        """Generate (key, value) pairs for string keys that start with given
+        prefix, in sorted order. Running time: O(log n + m) expected."""
+        return self.range(prefix, prefix + MAX_CHAR)
+
+
+def test_skip_list():
+    sl = SkipList(rng=random.Random(0))
+    for word in 'one fish two fish red fish blue fish'.split():
+        sl.set(word, sl.get(word) + 1 if word in sl else 1)
+        print('set({!r}): {}'.format(word, sl))
+    print('range(f, s): {}'.format(list(sl.range('f', 's'))))
+    print('prefix(t): {}'.format(list(sl.prefix('t'))))
+    sl.delete('fish')
+    print('delete(fish): {}'.format(sl))
+
+
+if __name__ == '__main__':
+    test_skip_list()
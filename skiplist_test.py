@@ -0,0 +1,70 @@
+#!python
+
+from skiplist import SkipList, SkipNode
+import random
+import unittest
+
+
+class SkipListTest(unittest.TestCase):
+
+    def test_set_get_and_delete(self):
+        sl = SkipList(rng=random.Random(1))
+        sl.set('I', 1)
+        sl.set('X', 10)
+        sl.set('V', 5)
+        assert sl.get('V') == 5
+        assert sl.contains('X') is True
+        assert 'L' not in sl
+        assert len(sl) == 3
+        assert list(sl) == ['I', 'V', 'X']  # Kept in sorted order
+        sl.set('V', 4)  # Update value
+        assert sl['V'] == 4
+        assert len(sl) == 3
+        sl.delete('I')
+        assert 'I' not in sl
+        assert sl.items() == [('V', 4), ('X', 10)]
+        with self.assertRaises(KeyError):
+            sl.get('I')
+        with self.assertRaises(KeyError):
+            sl.delete('I')
+
+    def test_matches_sorted_dict(self):
+        rng = random.Random(7)
+        sl = SkipList(rng=rng)
+        expected = {}
+        for _ in range(2000):
+            key = rng.randint(0, 300)
+            if rng.random() < 0.3 and key in expected:
+                del expected[key]
+                sl.delete(key)
+            else:
+                expected[key] = key * 2
+                sl.set(key, key * 2)
+        assert sl.items() == sorted(expected.items())
+        assert len(sl) == len(expected)
+        # Levels should shrink back as keys are deleted
+        for key in list(expected):
+            sl.delete(key)
+        assert sl.is_empty()
+        assert sl.level == 1
+
+    def test_range_and_prefix(self):
+        words = ['fish', 'fishes', 'fist', 'one', 'red', 'fig', 'blue', 'two']
+        sl = SkipList(((word, len(word)) for word in words), rng=random.Random(2))
+        assert [key for key, _ in sl.range('fig', 'one')] == ['fig', 'fish', 'fishes', 'fist']
+        assert [key for key, _ in sl.range('p')] == ['red', 'two']
+        assert [key for key, _ in sl.range(stop='c')] == ['blue']
+        assert list(sl.prefix('fis')) == [('fish', 4), ('fishes', 6), ('fist', 4)]
+        assert list(sl.prefix('z')) == []
+
+    def test_node_links(self):
+        node = SkipNode('a', 1, level=3)
+        assert node.forward == [None, None, None]
+        node.forward[0] = SkipNode('b')
+        assert node.forward[0].data == 'b'
+        assert len(node.forward[0].forward) == 1
+        assert not hasattr(node, '__dict__')
+
+
+if __name__ == '__main__':
+    unittest.main()
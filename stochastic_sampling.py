@@ -1,7 +1,16 @@
+import re
+import sys
 import random
 from bisect import bisect
 import string
-from bs4 import BeautifulSoup
+from corpus_io import iter_text_blocks
+from histogram_io import is_histogram_file, load_histogram, save_histogram
+from profiling import Spans, pop_profile_argument, profiled
+from weighting import SamplingTableCache, vowel_boost
+
+
+# Matches the start of an HTML tag, comment or doctype
+HTML_TAG = re.compile(r'<[a-zA-Z!/]')
 
 
 def clean_text(raw_content):
@@ -9,17 +18,23 @@ def clean_text(raw_content):
     Preprocess raw HTML content to extract text:
     - Remove punctuation, numbers, and convert to lowercase.
     """
-    soup = BeautifulSoup(raw_content, 'html.parser')
-    text = soup.get_text()
+    text = raw_content
+    if HTML_TAG.search(raw_content):
+        # Only pay for importing and running the HTML parser when needed
+        from bs4 import BeautifulSoup
+        text = BeautifulSoup(raw_content, 'html.parser').get_text()
     text = text.translate(str.maketrans("", "", string.punctuation + string.digits)).lower()
     return text.split()
 
 
-def count_words(words):
+def count_words(words, word_counts=None):
     """
     Count word occurrences using only lists and tuples (no dictionaries).
+    Adds to the counts in word_counts, if given, so text can be counted a
+    block at a time.
     """
-    word_counts = []
+    if word_counts is None:
+        word_counts = []
     for word in words:
         for i, (existing_word, count) in enumerate(word_counts):
             if existing_word == word:
@@ -30,16 +45,29 @@ def count_words(words):
     return word_counts
 
 
+def read_text_blocks(file_path):
+    """
+    Generate the text of a plain or compressed file in blocks that end at
+    whitespace. HTML is generated as one block instead, because tags can
+    contain whitespace and must be parsed whole.
+    """
+    blocks = iter_text_blocks(file_path)
+    first = next(blocks, "")
+    if HTML_TAG.search(first):
+        yield first + "".join(blocks)
+        return
+    yield first
+    yield from blocks
+
+
 def apply_vowel_weighting(histogram):
     """
     Apply additional weighting to words starting with vowels.
+    Returns a weighted copy; to sample, prefer passing vowel_boost() to
+    SamplingTableCache.table, which applies it without copying the histogram.
     """
-    vowels = set("aeiou")
-    weighted_histogram = []
-    for word, count in histogram:
-        weight = 1.5 if word[0] in vowels else 1.0
-        weighted_histogram.append((word, count * weight))
-    return weighted_histogram
+    boost = vowel_boost()
+    return [(word, boost(word, count * 1.0)) for word, count in histogram]
 
 
 def build_cumulative_distribution(histogram):
@@ -55,30 +83,48 @@ def build_cumulative_distribution(histogram):
     return cumulative
 
 
-def random_sample(histogram):
+def random_sample(histogram, rng=None):
     """
     Perform pure random sampling (ignores weights).
+    :param rng: Optional random.Random instance to draw from instead of the global generator.
     """
     words = [word for word, _ in histogram]
-    return random.choice(words)
+    return (rng or random).choice(words)
 
 
-def cumulative_weighted_sample(cumulative_distribution):
+def cumulative_weighted_sample(cumulative_distribution, rng=None):
     """
     Perform weighted sampling using the cumulative distribution.
+    :param rng: Optional random.Random instance to draw from instead of the global generator.
     """
-    dart = random.random()
+    dart = (rng or random).random()
     idx = bisect([prob for prob, _ in cumulative_distribution], dart)
     return cumulative_distribution[idx][1]
 
 
-def validate_weighted_sampling(histogram, cumulative_distribution, iterations=10000):
+def validate_sampling_table(table, iterations=10000, rng=None):
+    """
+    Validate a weighted sampling table by comparing observed frequencies with expected probabilities.
+    """
+    observed = {}
+    for _ in range(iterations):
+        word = table.sample(rng)
+        observed[word] = observed.get(word, 0) + 1
+
+    print("\nValidation Results (Weighted Sampling):")
+    for word, weight in table.weights():
+        expected = weight / table.total
+        obs = observed.get(word, 0) / iterations
+        print(f"Word: {word}, Expected: {expected:.2%}, Observed: {obs:.2%}")
+
+
+def validate_weighted_sampling(histogram, cumulative_distribution, iterations=10000, rng=None):
     """
     Validate weighted sampling by comparing observed frequencies with expected probabilities.
     """
     results = []
     for _ in range(iterations):
-        results.append(cumulative_weighted_sample(cumulative_distribution))
+        results.append(cumulative_weighted_sample(cumulative_distribution, rng))
 
     total = len(results)
     observed = [(word, results.count(word) / total) for word, _ in histogram]
@@ -89,36 +135,56 @@ def validate_weighted_sampling(histogram, cumulative_distribution, iterations=10
         print(f"Word: {word}, Expected: {expected:.2%}, Observed: {obs:.2%}")
 
 
-if __name__ == "__main__":
-    import sys
-
-    if len(sys.argv) < 2:
-        print("Usage: python stochastic_sampling.py <file_path>")
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    profile_path, argv = pop_profile_argument(argv)
+    if len(argv) < 1:
+        print("Usage: python stochastic_sampling.py <file_path> [<save_path>] [--profile <profile_path>]")
         sys.exit(1)
 
-    # Read and preprocess input text
-    file_path = sys.argv[1]
-    with open(file_path, 'r', encoding='utf-8') as file:
-        words = clean_text(file.read())
-
-    # Count words and build histogram
-    histogram = count_words(words)
-
-    # Apply vowel weighting
-    weighted_histogram = apply_vowel_weighting(histogram)
-
-    # Build cumulative probability distribution
-    cumulative_distribution = build_cumulative_distribution(weighted_histogram)
-
-    # Display pure random sampling results
-    print("Random Sampling (ignoring weights):")
-    for _ in range(5):
-        print(random_sample(histogram))
+    timings = Spans()
+    with profiled(profile_path):
+        file_path = argv[0]
+        if is_histogram_file(file_path):
+            # Load a previously saved histogram instead of recounting text
+            with timings.span("load"):
+                histogram = load_histogram(file_path)
+        else:
+            # Read, preprocess and count input text a block at a time,
+            # decompressing it if needed
+            histogram = []
+            for block in read_text_blocks(file_path):
+                with timings.span("tokenize"):
+                    words = clean_text(block)
+                with timings.span("count"):
+                    count_words(words, histogram)
+
+        # Save histogram for faster reloading, if a save path is given
+        if len(argv) > 1:
+            with timings.span("save"):
+                save_histogram(argv[1], histogram)
+
+        # Build cumulative distribution with vowel weighting applied on the fly
+        with timings.span("build-distribution"):
+            tables = SamplingTableCache(histogram)
+            weighted_table = tables.table(vowel_boost())
+
+        with timings.span("sample"):
+            # Display pure random sampling results
+            print("Random Sampling (ignoring weights):")
+            for _ in range(5):
+                print(random_sample(histogram))
+
+            # Display cumulative weighted sampling results
+            print("\nCumulative Weighted Sampling:")
+            for _ in range(5):
+                print(weighted_table.sample())
+
+            # Validate weighted sampling
+            validate_sampling_table(weighted_table)
+    print(timings.report(), file=sys.stderr)
 
-    # Display cumulative weighted sampling results
-    print("\nCumulative Weighted Sampling:")
-    for _ in range(5):
-        print(cumulative_weighted_sample(cumulative_distribution))
 
-    # Validate weighted sampling
-    validate_weighted_sampling(histogram, cumulative_distribution)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
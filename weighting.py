@@ -0,0 +1,155 @@
+import random
+from bisect import bisect
+from typing import Callable, Dict, Hashable, Iterable, List, Tuple
+
+
+class WeightTransform(object):
+    """
+    A named adjustment to the sampling weight of each word, like boosting
+    vowels or suppressing stopwords. Transforms are applied one after another
+    while a sampling table is built, so no weighted copy of the histogram is
+    ever stored in between.
+    """
+
+    def __init__(self, name: str, params: Hashable, function: Callable[[str, float], float]):
+        """
+        :param name: Name of this kind of transform.
+        :param params: Hashable parameters that, with the name, identify its effect.
+        :param function: Function of (word, weight) returning the new weight.
+        """
+        self.name = name
+        self.params = params
+        self.function = function
+
+    @property
+    def signature(self) -> Tuple[str, Hashable]:
+        """Key that is equal for transforms with the same effect."""
+        return (self.name, self.params)
+
+    def __call__(self, word: str, weight: float) -> float:
+        return self.function(word, weight)
+
+    def __repr__(self):
+        return f"WeightTransform({self.name!r}, {self.params!r})"
+
+
+def vowel_boost(factor: float = 1.5) -> WeightTransform:
+    """
+    Multiply the weight of words starting with a vowel by factor.
+    """
+    vowels = frozenset("aeiou")
+    return WeightTransform("vowel_boost", factor,
+                           lambda word, weight: weight * factor if word[:1] in vowels else weight)
+
+
+def length_penalty(alpha: float = 0.5) -> WeightTransform:
+    """
+    Divide the weight of each word by its length raised to alpha, favoring short words.
+    """
+    return WeightTransform("length_penalty", alpha,
+                           lambda word, weight: weight / max(len(word), 1) ** alpha)
+
+
+def stopword_suppression(stopwords: Iterable[str], factor: float = 0.0) -> WeightTransform:
+    """
+    Multiply the weight of each stopword by factor (0 removes stopwords entirely).
+    """
+    stopwords = frozenset(stopwords)
+    return WeightTransform("stopword_suppression", (stopwords, factor),
+                           lambda word, weight: weight * factor if word in stopwords else weight)
+
+
+def temperature(value: float) -> WeightTransform:
+    """
+    Raise each weight to the power 1 / value: values below 1 sharpen the
+    distribution toward frequent words, values above 1 flatten it.
+    """
+    if value <= 0:
+        raise ValueError(f"Temperature must be positive: {value}")
+    exponent = 1 / value
+    return WeightTransform("temperature", value, lambda word, weight: weight ** exponent)
+
+
+class SamplingTable(object):
+    """
+    Words with the running totals of their weights, for O(log n) weighted sampling.
+    """
+
+    def __init__(self, words: List[str], cumulative: List[float]):
+        self.words = words
+        self.cumulative = cumulative
+        self.total = cumulative[-1] if cumulative else 0
+
+    def __len__(self):
+        return len(self.words)
+
+    def weights(self) -> List[Tuple[str, float]]:
+        """Return a list of (word, weight) tuples in this table."""
+        previous = [0] + self.cumulative[:-1]
+        return [(word, total - prev) for word, total, prev in zip(self.words, self.cumulative, previous)]
+
+    def sample(self, rng=None) -> str:
+        """
+        Return a word sampled in proportion to its weight, by binary search.
+        :param rng: Optional random.Random instance to draw from instead of the global generator.
+        """
+        if not self.words:
+            raise ValueError("Cannot sample from an empty table")
+        dart = (rng or random).random() * self.total
+        return self.words[bisect(self.cumulative, dart)]
+
+
+def histogram_entries(histogram):
+    """Return (word, count) entries of a dict-like histogram or a list of tuples."""
+    return histogram.items() if hasattr(histogram, "items") else histogram
+
+
+def build_sampling_table(histogram, transforms: Iterable[WeightTransform] = ()) -> SamplingTable:
+    """
+    Build a sampling table in one pass over the histogram, applying every transform
+    to each word's count as it goes. Words whose weight ends up zero are left out.
+    :param histogram: Dictogram, or list of (word, count) tuples.
+    :param transforms: Transforms to apply in order.
+    """
+    transforms = tuple(transforms)
+    words = []
+    cumulative = []
+    running_total = 0
+    for word, count in histogram_entries(histogram):
+        weight = count
+        for transform in transforms:
+            weight = transform(word, weight)
+        if weight > 0:
+            running_total += weight
+            words.append(word)
+            cumulative.append(running_total)
+    return SamplingTable(words, cumulative)
+
+
+class SamplingTableCache(object):
+    """
+    Sampling tables for one histogram, built on first use and cached by the
+    signature of their transforms, so toggling a weighting back on reuses the
+    table that was already built.
+    """
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.tables: Dict[tuple, SamplingTable] = {}
+
+    def __len__(self):
+        return len(self.tables)
+
+    def table(self, *transforms: WeightTransform) -> SamplingTable:
+        """
+        Return the sampling table for the histogram with the given transforms applied in order.
+        """
+        key = tuple(transform.signature for transform in transforms)
+        table = self.tables.get(key)
+        if table is None:
+            table = self.tables[key] = build_sampling_table(self.histogram, transforms)
+        return table
+
+    def clear(self):
+        """Forget every cached table, such as after the histogram changes."""
+        self.tables.clear()
@@ -0,0 +1,60 @@
+#!python
+
+from weighting import (SamplingTableCache, build_sampling_table, length_penalty,
+                       stopword_suppression, temperature, vowel_boost)
+from corpus_model import CorpusModel
+from dictogram import Dictogram
+import random
+import unittest
+
+
+class WeightingTest(unittest.TestCase):
+
+    fish_list = [('one', 1), ('fish', 4), ('two', 1), ('red', 1), ('blue', 1)]
+
+    def test_no_transforms(self):
+        table = build_sampling_table(self.fish_list)
+        assert table.words == ['one', 'fish', 'two', 'red', 'blue']
+        assert table.cumulative == [1, 5, 6, 7, 8]
+        assert table.total == 8
+
+    def test_transforms(self):
+        assert vowel_boost(2)('one', 3) == 6
+        assert vowel_boost(2)('two', 3) == 3
+        assert length_penalty(1)('fish', 8) == 2
+        assert stopword_suppression(['the'])('the', 5) == 0
+        assert temperature(0.5)('fish', 3) == 9
+        with self.assertRaises(ValueError):
+            temperature(0)
+
+    def test_composed_transforms(self):
+        table = build_sampling_table(self.fish_list, [stopword_suppression(['fish']), vowel_boost(2)])
+        # Suppressed words are left out and the rest are weighted in order
+        assert dict(table.weights()) == {'one': 2, 'two': 1, 'red': 1, 'blue': 1}
+
+    def test_sample(self):
+        table = build_sampling_table(Dictogram(['fish'] * 3 + ['one']))
+        samples = [table.sample(random.Random(seed)) for seed in range(1000)]
+        assert 650 <= samples.count('fish') <= 850
+
+    def test_cache_by_signature(self):
+        tables = SamplingTableCache(self.fish_list)
+        boosted = tables.table(vowel_boost())
+        # Equal transforms should reuse the same table
+        assert tables.table(vowel_boost()) is boosted
+        assert tables.table(vowel_boost(3)) is not boosted
+        assert tables.table() is tables.table()
+        assert len(tables) == 3
+
+    def test_corpus_model_transforms(self):
+        model = CorpusModel(self.fish_list)
+        suppress = (stopword_suppression(['fish', 'one', 'two']),)
+        assert model.sample_word(random.Random(0), transforms=suppress) in ('red', 'blue')
+        words = model.sentence(20, random.Random(0), transforms=suppress).rstrip('.').lower().split()
+        assert set(words) <= {'red', 'blue'}
+        # Sampling without transforms keeps using the unweighted table
+        assert model.sample_word(random.Random(0)) in dict(self.fish_list)
+
+
+if __name__ == '__main__':
+    unittest.main()
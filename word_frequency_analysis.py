@@ -1,8 +1,47 @@
 import re
+import sys
+import json
+import heapq
 import argparse
 from collections import Counter
-from typing import List, Tuple
+from operator import itemgetter
+from typing import BinaryIO, Iterable, List, Optional, Tuple
 from bisect import bisect_left
+from corpus_io import iter_text_blocks
+from histogram_io import is_histogram_file, load_histogram, save_histogram, write_histogram
+from profiling import Spans, add_profile_argument, profiled
+
+# Number of entries formatted and written together in one write call
+BATCH_SIZE = 8192
+# Size of the write buffer for output files
+BUFFER_SIZE = 1 << 20
+
+# Functions that format one (word, count) entry as a line of each text format
+FORMATTERS = {
+    "text": lambda word, count: f"{word}: {count}\n",
+    "tsv": lambda word, count: f"{word}\t{count}\n",
+    "jsonl": lambda word, count: json.dumps({"word": word, "count": count}, ensure_ascii=False) + "\n",
+}
+
+
+def tokenize(source_text: str) -> List[str]:
+    """
+    Split source text into lowercase words, dropping punctuation.
+    :param source_text: The content of the text file.
+    :return: List of words in the order they appear.
+    """
+    return re.findall(r'\b\w+\b', source_text.lower())
+
+
+def count_tokens(words: Iterable[str]) -> List[Tuple[str, int]]:
+    """
+    Count words into a histogram sorted by word.
+    :param words: Words to count.
+    :return: A sorted list of (word, count) tuples.
+    """
+    # Count word frequencies using Counter and return them sorted by word
+    # for optimized read operations
+    return sorted(Counter(words).items())
 
 
 def list_based_histogram(source_text: str) -> List[Tuple[str, int]]:
@@ -11,14 +50,7 @@ def list_based_histogram(source_text: str) -> List[Tuple[str, int]]:
     :param source_text: The content of the text file.
     :return: A sorted list of tuples representing word frequencies.
     """
-    # Normalize text: lowercase, remove punctuation
-    words = re.findall(r'\b\w+\b', source_text.lower())
-
-    # Count word frequencies using Counter and convert to list of tuples
-    hist = Counter(words).items()
-
-    # Return sorted list of tuples for optimized read operations
-    return sorted(hist)
+    return count_tokens(tokenize(source_text))
 
 
 def tuple_frequency(word: str, histogram: List[Tuple[str, int]]) -> int:
@@ -30,38 +62,129 @@ def tuple_frequency(word: str, histogram: List[Tuple[str, int]]) -> int:
     """
 
     word = word.lower()
-    words = [item[0] for item in histogram]
-    idx = bisect_left(words, word)
-    if idx < len(words) and words[idx] == word:
+    # (word,) sorts just before (word, count), so this finds the entry in
+    # O(log n) without first copying every word out of the histogram
+    idx = bisect_left(histogram, (word,))
+    if idx < len(histogram) and histogram[idx][0] == word:
         return histogram[idx][1]
     return 0
 
 
-def main():
+def most_common(histogram: List[Tuple[str, int]], k: Optional[int] = None) -> List[Tuple[str, int]]:
+    """
+    Retrieve the k most frequent entries from the tuple-based histogram.
+    Uses a heap of at most k entries, so it runs in O(n log k) instead of
+    sorting the whole histogram by count.
+    :param histogram: The histogram as a list of tuples.
+    :param k: Number of entries to return, or None for all of them.
+    :return: List of (word, count) tuples from most to least frequent.
+    """
+    if k is None:
+        return sorted(histogram, key=itemgetter(1), reverse=True)
+    return heapq.nlargest(k, histogram, key=itemgetter(1))
+
+
+def select_entries(histogram: Iterable[Tuple[str, int]], top: Optional[int] = None,
+                   min_count: int = 0) -> Iterable[Tuple[str, int]]:
+    """
+    Lazily filter histogram entries for output.
+    :param histogram: Iterable of (word, count) tuples.
+    :param top: Keep only this many of the most frequent entries, most frequent first.
+    :param min_count: Skip entries with a count below this.
+    :return: Iterable of the selected (word, count) tuples.
+    """
+    if min_count > 0:
+        histogram = (entry for entry in histogram if entry[1] >= min_count)
+    if top is not None:
+        return heapq.nlargest(top, histogram, key=itemgetter(1))
+    return histogram
+
+
+def write_entries(entries: Iterable[Tuple[str, int]], output: BinaryIO, fmt: str = "text",
+                  batch_size: int = BATCH_SIZE) -> None:
+    """
+    Write histogram entries to a binary stream in large batches, so the full
+    formatted output is never held in memory and there is one write per batch
+    instead of one per entry.
+    :param entries: Iterable of (word, count) tuples.
+    :param output: Binary file object, such as sys.stdout.buffer or an open file.
+    :param fmt: One of "text", "tsv", "jsonl" or "binary".
+    """
+    if fmt == "binary":
+        write_histogram(output, entries)
+        return
+    format_entry = FORMATTERS[fmt]
+    batch = []
+    for word, count in entries:
+        batch.append(format_entry(word, count))
+        if len(batch) >= batch_size:
+            output.write("".join(batch).encode("utf-8"))
+            batch = []
+    if batch:
+        output.write("".join(batch).encode("utf-8"))
+
+
+def main(argv=None):
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="Generate and analyze word frequency histograms from text files.")
-    parser.add_argument("file", help="Path to the input text file.")
+    parser.add_argument("file", help="Path to the input text file (optionally gzip, bz2 or xz compressed) "
+                                     "or saved histogram.")
     parser.add_argument("-w", "--word", help="Word to check frequency for.")
-    args = parser.parse_args()
-
-    # Read text file
-    try:
-        with open(args.file, 'r', encoding='utf-8') as file:
-            content = file.read()
-    except FileNotFoundError:
-        print(f"Error: File '{args.file}' not found.")
-        return
+    parser.add_argument("-s", "--save", help="Save the histogram to this binary file for faster reloading.")
+    parser.add_argument("-f", "--format", choices=["text", "tsv", "jsonl", "binary"],
+                        default="text", help="Output format for the histogram.")
+    parser.add_argument("-o", "--output", help="Write the histogram to this file instead of stdout.")
+    parser.add_argument("-n", "--top", type=int, help="Only output the N most frequent words.")
+    parser.add_argument("-m", "--min-count", type=int, default=0, help="Only output words seen at least this often.")
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+
+    timings = Spans()
+    with profiled(args.profile):
+        try:
+            if is_histogram_file(args.file):
+                # Load a histogram saved by --save instead of recounting text
+                with timings.span("load"):
+                    hist = load_histogram(args.file)
+            else:
+                # Stream the text file, decompressing it if needed, and count
+                # it block by block so memory use does not grow with its size
+                counts = Counter()
+                for block in iter_text_blocks(args.file):
+                    with timings.span("tokenize"):
+                        words = tokenize(block)
+                    with timings.span("count"):
+                        counts.update(words)
+                with timings.span("count"):
+                    hist = sorted(counts.items())
+        except FileNotFoundError:
+            print(f"Error: File '{args.file}' not found.")
+            return
+
+        if args.save:
+            with timings.span("save"):
+                save_histogram(args.save, hist)
 
-    # Generate histogram
-    hist = list_based_histogram(content)
-    print("Generated Histogram:")
-    for word, count in hist:
-        print(f"{word}: {count}")
+        # Write selected entries in batches, to stdout or a buffered file
+        with timings.span("write"):
+            entries = select_entries(hist, args.top, args.min_count)
+            if args.output:
+                with open(args.output, "wb", buffering=BUFFER_SIZE) as output:
+                    write_entries(entries, output, args.format)
+            else:
+                if args.format == "text":
+                    print("Generated Histogram:")
+                sys.stdout.flush()
+                write_entries(entries, sys.stdout.buffer, args.format)
+                sys.stdout.buffer.flush()
+    print(timings.report(), file=sys.stderr)
 
     # Check frequency of a word if provided
     if args.word:
         freq = tuple_frequency(args.word, hist)
-        print(f"\nFrequency of '{args.word}': {freq}")
+        # Keep machine-readable output on stdout free of other text
+        stream = sys.stdout if args.format == "text" or args.output else sys.stderr
+        print(f"\nFrequency of '{args.word}': {freq}", file=stream)
 
 
 if __name__ == "__main__":
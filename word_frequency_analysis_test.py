@@ -0,0 +1,77 @@
+#!python
+
+from word_frequency_analysis import main, select_entries, write_entries
+from histogram_io import load_histogram
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+# Parse each text format's output back into (word, count) entries
+PARSERS = {
+    'text': lambda line: (line.rsplit(': ', 1)[0], int(line.rsplit(': ', 1)[1])),
+    'tsv': lambda line: (line.split('\t')[0], int(line.split('\t')[1])),
+    'jsonl': lambda line: (json.loads(line)['word'], json.loads(line)['count']),
+}
+
+
+class OutputTest(unittest.TestCase):
+
+    entries = [('café', 3), ('fish', 4), ('one', 1), ('tab: "quoted"', 2), ('two', 1)]
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_text_formats_round_trip(self):
+        for fmt, parse in PARSERS.items():
+            output = io.BytesIO()
+            # A small batch size exercises writing several batches
+            write_entries(iter(self.entries), output, fmt, batch_size=2)
+            lines = output.getvalue().decode('utf-8').splitlines()
+            assert [parse(line) for line in lines] == self.entries, fmt
+
+    def test_binary_format_round_trip(self):
+        path = os.path.join(self.temp_dir, 'histogram.hist')
+        with open(path, 'wb') as output:
+            write_entries(iter(self.entries), output, 'binary')
+        assert load_histogram(path) == self.entries
+
+    def test_select_entries(self):
+        assert list(select_entries(self.entries)) == self.entries
+        assert list(select_entries(self.entries, min_count=2)) == [
+            ('café', 3), ('fish', 4), ('tab: "quoted"', 2)]
+        assert list(select_entries(self.entries, top=2)) == [('fish', 4), ('café', 3)]
+        # min_count filters first, so top never returns entries under it
+        assert list(select_entries(self.entries, top=10, min_count=3)) == [('fish', 4), ('café', 3)]
+        assert list(select_entries(self.entries, top=0)) == []
+
+    def run_main(self, argv):
+        """Run main and return what it wrote to stdout, as bytes."""
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        with mock.patch('sys.stdout', stdout), mock.patch('sys.stderr', io.StringIO()):
+            main(argv)
+            stdout.flush()
+            return stdout.buffer.getvalue()
+
+    def test_output_file_matches_stdout(self):
+        corpus = os.path.join(self.temp_dir, 'corpus.txt')
+        with open(corpus, 'w', encoding='utf-8') as file:
+            file.write('one fish two fish red fish blue fish café café')
+        output = os.path.join(self.temp_dir, 'output')
+        for fmt in ['tsv', 'jsonl', 'binary']:
+            argv = [corpus, '-f', fmt, '-n', '3', '-m', '2']
+            stdout = self.run_main(argv)
+            self.run_main(argv + ['-o', output])
+            with open(output, 'rb') as file:
+                assert file.read() == stdout, fmt
+        assert self.run_main([corpus, '-f', 'tsv', '-n', '3', '-m', '2']) == b'fish\t4\ncaf\xc3\xa9\t2\n'
+
+
+if __name__ == '__main__':
+    unittest.main()